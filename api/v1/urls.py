@@ -3,8 +3,8 @@
 from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
-from furniture.views import (FurnitureViewSet, RoomCopyView, RoomViewSet,
-                             SendPDFView)
+from furniture.views import (FurnitureViewSet, LayoutJobView, RoomCopyView,
+                             RoomViewSet, SendPDFView)
 from tariff.views import APIChangeTariff, APITariff
 from users.views import UserViewSet
 
@@ -19,6 +19,7 @@ users.register("users", UserViewSet, basename="customuser")
 urlpatterns = [
     path(r"rooms/send_email/", SendPDFView.as_view()),
     path(r"rooms/copy/<int:pk>/", RoomCopyView.as_view()),
+    path(r"rooms/jobs/<int:pk>/", LayoutJobView.as_view()),
     path("tariffs/", APITariff.as_view()),
     path("tariffs/<slug:name_english>/", APIChangeTariff.as_view()),
     path("auth/", include(users.urls)),
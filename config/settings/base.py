@@ -105,6 +105,19 @@ DATABASES = {
     },
 }
 
+# Кэш "layout" общий для всех процессов и хранится в базе данных, таблица
+# создается командой createcachetable
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "layout": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "layout_cache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -221,3 +234,75 @@ MAX_LENGTH_PROJECT_NAME = 128
 MAX_LENGTH_ROOM_NAME = 128
 MAX_LENGTH_FURNITURE_NAME = 128
 PROJECT_NAME_BY_DEFAULT = "Проект"
+
+# Генерация вариантов планировки: сколько вариантов считать параллельно,
+# сколько секунд их ждать и сколько процессов выделить под расчет
+LAYOUT_VARIANTS_COUNT = int(os.getenv("LAYOUT_VARIANTS_COUNT", 1))
+LAYOUT_VARIANTS_DEADLINE = float(os.getenv("LAYOUT_VARIANTS_DEADLINE", 10))
+LAYOUT_POOL_WORKERS = int(os.getenv("LAYOUT_POOL_WORKERS", 2))
+# Сбор и запись в лог длительностей этапов и счетчиков алгоритма расстановки
+LAYOUT_STATS = os.getenv("LAYOUT_STATS", False) in ("True", "true", "TRUE", "1")
+# Порядок расстановки мебели ("given", "area", "width") и на сколько
+# размещенных единиц мебели можно вернуться, если очередная не помещается
+LAYOUT_ORDERING = os.getenv("LAYOUT_ORDERING", "area")
+LAYOUT_BACKTRACK_DEPTH = int(os.getenv("LAYOUT_BACKTRACK_DEPTH", 2))
+# Процессорное время в секундах на поиск лучшей расстановки оптимизатором,
+# 0 - оптимизатор выключен
+LAYOUT_OPTIMIZER_TIME_BUDGET = float(os.getenv("LAYOUT_OPTIMIZER_TIME_BUDGET", 0))
+# Движки расстановки: путь к функции движка и ее параметры. Ответ строит
+# движок LAYOUT_ENGINE, а доля LAYOUT_SHADOW_SAMPLE_RATE расчетов
+# повторяется движком LAYOUT_SHADOW_ENGINE в фоне для сравнения.
+# "single" - один расчет алгоритма без вариантов и оптимизатора, с теми же
+# порядком мебели и возвратами, что и у "core": его можно запускать теневым,
+# чтобы оценить, что дают варианты и оптимизатор
+LAYOUT_ENGINES = {
+    "core": {
+        "ENGINE": "furniture.services.room_layout_service.arrange_furniture",
+    },
+    "single": {
+        "ENGINE": "layout_algorithm.engine.compute_layout",
+        "OPTIONS": {
+            "ordering": LAYOUT_ORDERING,
+            "backtrack_depth": LAYOUT_BACKTRACK_DEPTH,
+            "collect_stats": LAYOUT_STATS,
+        },
+    },
+}
+LAYOUT_ENGINE = os.getenv("LAYOUT_ENGINE", "core")
+LAYOUT_SHADOW_ENGINE = os.getenv("LAYOUT_SHADOW_ENGINE", "")
+LAYOUT_SHADOW_SAMPLE_RATE = float(os.getenv("LAYOUT_SHADOW_SAMPLE_RATE", 0))
+# Наибольшая сторона изображения планировки в пикселях
+LAYOUT_IMAGE_MAX_SIDE = int(os.getenv("LAYOUT_IMAGE_MAX_SIDE", 2048))
+# Кэш изображений планировок: директория, наибольший размер на диске в байтах
+# и количество изображений в памяти процесса
+LAYOUT_IMAGE_CACHE_DIR = os.getenv(
+    "LAYOUT_IMAGE_CACHE_DIR", os.path.join(MEDIA_ROOT, "layout_images"),
+)
+LAYOUT_IMAGE_CACHE_MAX_BYTES = int(os.getenv("LAYOUT_IMAGE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+LAYOUT_IMAGE_MEMORY_CACHE_SIZE = int(os.getenv("LAYOUT_IMAGE_MEMORY_CACHE_SIZE", 64))
+# Кэш результатов алгоритма: количество результатов в памяти процесса
+# (0 - кэш выключен), кэш Django для общего уровня и время хранения в секундах.
+# Общий уровень должен быть доступен всем процессам, иначе сброс поколения
+# при изменении мебели не дойдет до других процессов
+LAYOUT_RESULT_CACHE_SIZE = int(os.getenv("LAYOUT_RESULT_CACHE_SIZE", 256))
+LAYOUT_RESULT_CACHE_ALIAS = os.getenv("LAYOUT_RESULT_CACHE_ALIAS", "layout")
+LAYOUT_RESULT_CACHE_TIMEOUT = int(os.getenv("LAYOUT_RESULT_CACHE_TIMEOUT", 24 * 60 * 60))
+# Сколько секунд процесс использует запомненное поколение результатов, не
+# обращаясь к общему кэшу. Столько же другие процессы могут отдавать
+# результаты, сброшенные изменением мебели
+LAYOUT_RESULT_CACHE_GENERATION_TTL = float(os.getenv("LAYOUT_RESULT_CACHE_GENERATION_TTL", 5))
+# Очередь задач расстановки: если включена, POST на создание комнаты сразу
+# возвращает 202 и номер задачи, а расчет выполняют процессы команды
+# run_layout_workers. Количество процессов, пауза при пустой очереди, время
+# без сигнала от процесса, после которого задача берется повторно, и период
+# этих сигналов, в секундах. Брошенная задача, у которой уже
+# LAYOUT_JOB_MAX_ATTEMPTS попыток, завершается с ошибкой
+LAYOUT_ASYNC_JOBS = os.getenv("LAYOUT_ASYNC_JOBS", False) in ("True", "true", "TRUE", "1")
+LAYOUT_JOB_WORKERS = int(os.getenv("LAYOUT_JOB_WORKERS", 2))
+LAYOUT_JOB_POLL_INTERVAL = float(os.getenv("LAYOUT_JOB_POLL_INTERVAL", 1))
+LAYOUT_JOB_TIMEOUT = int(os.getenv("LAYOUT_JOB_TIMEOUT", 300))
+LAYOUT_JOB_HEARTBEAT_INTERVAL = float(os.getenv("LAYOUT_JOB_HEARTBEAT_INTERVAL", 30))
+LAYOUT_JOB_MAX_ATTEMPTS = int(os.getenv("LAYOUT_JOB_MAX_ATTEMPTS", 3))
+# Наибольшее количество кандидатов в одном запросе проверки пересечений
+# rooms/<id>/collisions/
+LAYOUT_COLLISION_MAX_CANDIDATES = int(os.getenv("LAYOUT_COLLISION_MAX_CANDIDATES", 500))
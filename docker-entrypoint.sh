@@ -2,6 +2,7 @@
 
 echo "----------Apply database migrations----------"
 python manage.py migrate --noinput
+python manage.py createcachetable
 
 echo "----------Starting Gunicorn----------"
 exec gunicorn config.wsgi:application --bind 0:8000 --workers 3
@@ -92,6 +92,21 @@ class RoomLayoutAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(models.LayoutJob)
+class LayoutJobAdmin(admin.ModelAdmin):
+    """Админка задач расстановки."""
+
+    list_display = (
+        "id",
+        "room",
+        "status",
+        "created",
+        "started",
+        "finished",
+    )
+    list_filter = ("status",)
+
+
 @admin.register(models.RoomType)
 class RoomTypeAdmin(ImportExportActionModelAdmin):
     list_display = ("pk", "name", "slug")
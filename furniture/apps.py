@@ -21,3 +21,4 @@ class FurnitureConfig(AppConfig):
         """
         import furniture.schema.schema_furniture  # noqa
         import furniture.schema.schema_room  # noqa
+        import furniture.signals  # noqa
@@ -0,0 +1,74 @@
+import logging
+import multiprocessing
+import signal
+import sys
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import connections
+
+from furniture.services.layout_jobs import run_worker
+from layout_algorithm.variants import shutdown_pool
+
+logger = logging.getLogger(__name__)
+
+
+def stop(signum, frame):
+    """Завершает процесс через SystemExit, чтобы сработали блоки finally."""
+    sys.exit(0)
+
+
+def worker(poll_interval):
+    # соединения с базой нельзя делить между процессами
+    connections.close_all()
+    # по SIGTERM воркер штатно завершается и дожидается остановки своего
+    # пула вариантов расстановки, иначе процесс зависнет при выходе
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        run_worker(poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_pool(wait=True)
+
+
+class Command(BaseCommand):
+    help = "Запуск процессов, рассчитывающих расстановку мебели из очереди"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.LAYOUT_JOB_WORKERS,
+            help="Количество процессов",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.LAYOUT_JOB_POLL_INTERVAL,
+            help="Пауза в секундах, если очередь пуста",
+        )
+
+    def handle(self, *args, **options):
+        connections.close_all()
+        # воркеры не демоны: при LAYOUT_VARIANTS_COUNT > 1 они запускают
+        # собственный пул процессов, а демонам нельзя иметь дочерние
+        # процессы. Поэтому при остановке команда завершает их сама.
+        processes = [
+            multiprocessing.Process(
+                target=worker, args=(options["poll_interval"],),
+            )
+            for _ in range(options["workers"])
+        ]
+        signal.signal(signal.SIGTERM, stop)
+        for process in processes:
+            process.start()
+        logger.info("Запущено процессов расстановки: %s", len(processes))
+        try:
+            for process in processes:
+                process.join()
+        except (KeyboardInterrupt, SystemExit):
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.7 on 2026-10-18 16:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('furniture', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LayoutJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Выполнена'), ('failed', 'Ошибка')], default='pending', max_length=16, verbose_name='Статус')),
+                ('furniture_ids', models.JSONField(help_text='Идентификаторы мебели в порядке расстановки', verbose_name='Мебель для расстановки')),
+                ('error', models.JSONField(blank=True, null=True, verbose_name='Ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата и время создания')),
+                ('started', models.DateTimeField(blank=True, null=True, verbose_name='Дата и время начала')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='Дата и время завершения')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='layout_jobs', to='furniture.roomlayout', verbose_name='Планировка')),
+            ],
+            options={
+                'verbose_name': 'Задача расстановки',
+                'verbose_name_plural': 'Задачи расстановки',
+                'indexes': [models.Index(fields=['status', 'created'], name='furniture_l_status_30b701_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 17:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('furniture', '0002_layout_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='roomlayout',
+            name='layout_state',
+            field=models.BinaryField(blank=True, help_text='Снимок комнаты с дверями и окнами для алгоритма расстановки, см. layout_algorithm.snapshot', null=True, verbose_name='Подготовленное состояние расстановки'),
+        ),
+    ]
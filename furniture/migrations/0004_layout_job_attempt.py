@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-18 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('furniture', '0003_room_layout_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='layoutjob',
+            name='attempt',
+            field=models.PositiveIntegerField(default=0, help_text='Увеличивается каждый раз, когда процесс берет задачу', verbose_name='Номер попытки'),
+        ),
+        migrations.AddField(
+            model_name='layoutjob',
+            name='heartbeat',
+            field=models.DateTimeField(blank=True, help_text='Процесс, выполняющий задачу, периодически обновляет время', null=True, verbose_name='Последний сигнал процесса'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from .base import Coordinate, PlacementCoordinates
+from .layout_job import LayoutJob
 from .placements import (DoorPlacement, FurniturePlacement,
                          PowerSocketPlacement, WindowPlacement)
 from .room_items import Furniture, RoomType
@@ -0,0 +1,78 @@
+from django.db import models
+
+
+class LayoutJob(models.Model):
+    """Задача на расчет расстановки мебели в комнате.
+
+    Задачи выполняются процессами команды `run_layout_workers`, которые
+    забирают их из этой таблицы. Процесс сохраняет результат, только если
+    номер попытки не изменился, то есть задачу не взял другой процесс.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    room = models.ForeignKey(
+        'RoomLayout',
+        on_delete=models.CASCADE,
+        related_name='layout_jobs',
+        verbose_name='Планировка',
+    )
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=STATUSES,
+        default=PENDING,
+    )
+    furniture_ids = models.JSONField(
+        'Мебель для расстановки',
+        help_text='Идентификаторы мебели в порядке расстановки',
+    )
+    error = models.JSONField(
+        'Ошибка',
+        null=True,
+        blank=True,
+    )
+    created = models.DateTimeField(
+        'Дата и время создания',
+        auto_now_add=True,
+    )
+    started = models.DateTimeField(
+        'Дата и время начала',
+        null=True,
+        blank=True,
+    )
+    finished = models.DateTimeField(
+        'Дата и время завершения',
+        null=True,
+        blank=True,
+    )
+    attempt = models.PositiveIntegerField(
+        'Номер попытки',
+        help_text='Увеличивается каждый раз, когда процесс берет задачу',
+        default=0,
+    )
+    heartbeat = models.DateTimeField(
+        'Последний сигнал процесса',
+        help_text='Процесс, выполняющий задачу, периодически обновляет время',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'Задача расстановки'
+        verbose_name_plural = 'Задачи расстановки'
+        indexes = (
+            models.Index(fields=('status', 'created')),
+        )
+
+    def __str__(self) -> str:
+        return f"Задача {self.pk} ({self.status}) для {self.room_id}"
@@ -50,6 +50,14 @@ class RoomLayout(models.Model):
         'Furniture',
         through='FurniturePlacement',
     )
+    layout_state = models.BinaryField(
+        'Подготовленное состояние расстановки',
+        help_text='Снимок комнаты с дверями и окнами для алгоритма '
+                  'расстановки, см. layout_algorithm.snapshot',
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'Планировка'
@@ -63,7 +71,9 @@ class RoomLayout(models.Model):
 
         С новым первичным ключом, но теми же значениями атрибутов.
 
-        M2M отношения не копируются.
+        M2M отношения не копируются. Снимок `layout_state` переносится в
+        копию после ее дверей и окон, см. `RoomCopyView`: сохранение каждой
+        двери и окна сбрасывает снимок комнаты.
         """
         return RoomLayout.objects.create(
             user=self.user,
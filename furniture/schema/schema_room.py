@@ -1,3 +1,4 @@
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import status
 
@@ -30,6 +31,10 @@ class GenerateSwaggerDocForRoomViewSet(BaseExtension):
                     response=serializer,
                     description="Данные комнаты",
                 ),
+                status.HTTP_202_ACCEPTED: OpenApiResponse(
+                    response=serializers.LayoutJobSerializer,
+                    description="Расстановка мебели поставлена в очередь",
+                ),
                 status.HTTP_400_BAD_REQUEST: OpenApiResponse(description="Error: Bad Request"),
                 status.HTTP_401_UNAUTHORIZED: OpenApiResponse(description="Error: Unauthorized"),
             }
@@ -77,4 +82,82 @@ class GenerateSwaggerDocForRoomViewSet(BaseExtension):
                 status.HTTP_403_FORBIDDEN: OpenApiResponse(description="Error: Forbidden"),
             }
         ),
+        # GET /url/{id}/image/
+        "image": extend_schema(
+            summary="Изображение комнаты",
+            description=(
+                "Изображение планировки в формате PNG или WebP (параметр image_format). "
+                "Строится по запросу."
+            ),
+            responses={
+                (status.HTTP_200_OK, "image/png"): OpenApiResponse(description="Изображение планировки"),
+                status.HTTP_304_NOT_MODIFIED: OpenApiResponse(description="Изображение не изменилось"),
+                status.HTTP_400_BAD_REQUEST: OpenApiResponse(description="Error: Bad Request"),
+                status.HTTP_404_NOT_FOUND: OpenApiResponse(description="Error: Not Found"),
+            }
+        ),
+        # POST /url/{id}/collisions/
+        "collisions": extend_schema(
+            summary="Проверка пересечений кандидатов",
+            description=(
+                "Проверка пачки кандидатов при перетаскивании мебели: матрица пересечений "
+                "кандидатов с мебелью, дверями и окнами комнаты (столбцы в порядке objects), "
+                "матрица пересечений кандидатов между собой, признаки inside_room и free. "
+                "Размещения мебели из exclude не учитываются. Комната не изменяется."
+            ),
+            request=serializers.RoomCollisionsSerializer,
+            responses={
+                status.HTTP_200_OK: OpenApiResponse(
+                    response=OpenApiTypes.OBJECT,
+                    description="Результат проверки кандидатов",
+                ),
+                status.HTTP_400_BAD_REQUEST: OpenApiResponse(description="Error: Bad Request"),
+                status.HTTP_401_UNAUTHORIZED: OpenApiResponse(description="Error: Unauthorized"),
+                status.HTTP_403_FORBIDDEN: OpenApiResponse(description="Error: Forbidden"),
+                status.HTTP_404_NOT_FOUND: OpenApiResponse(description="Error: Not Found"),
+            }
+        ),
+        # POST /url/{id}/relayout/
+        "relayout": extend_schema(
+            summary="Добавление и удаление мебели",
+            description=(
+                "Размещения мебели из remove удаляются, мебель из add расставляется вокруг "
+                "оставшейся без ее перестановки. В ответе все размещения мебели комнаты."
+            ),
+            request=serializers.RoomRelayoutSerializer,
+            responses={
+                status.HTTP_200_OK: OpenApiResponse(
+                    response=serializers.PlacedFurnitureSerializer(many=True),
+                    description="Размещения мебели комнаты в поле furniture_placement",
+                ),
+                status.HTTP_400_BAD_REQUEST: OpenApiResponse(description="Error: Bad Request"),
+                status.HTTP_401_UNAUTHORIZED: OpenApiResponse(description="Error: Unauthorized"),
+                status.HTTP_403_FORBIDDEN: OpenApiResponse(description="Error: Forbidden"),
+                status.HTTP_404_NOT_FOUND: OpenApiResponse(description="Error: Not Found"),
+            }
+        ),
+    }
+
+
+class GenerateSwaggerDocForLayoutJobView(BaseExtension):
+    """Этот класс предназначен для генерации документации Swagger для эндпоинта LayoutJobView."""
+    serializer = serializers.LayoutJobSerializer
+    target_class = views.LayoutJobView
+    endpoints_doc = {
+        # GET /url/jobs/{id}/
+        "get": extend_schema(
+            summary="Состояние задачи расстановки",
+            description=(
+                "Состояние задачи расстановки мебели, поставленной в очередь при создании "
+                "комнаты. Доступно владельцу комнаты."
+            ),
+            responses={
+                status.HTTP_200_OK: OpenApiResponse(
+                    response=serializer,
+                    description="Данные задачи",
+                ),
+                status.HTTP_401_UNAUTHORIZED: OpenApiResponse(description="Error: Unauthorized"),
+                status.HTTP_404_NOT_FOUND: OpenApiResponse(description="Error: Not Found"),
+            }
+        ),
     }
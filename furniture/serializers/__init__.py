@@ -1,6 +1,9 @@
 from .base import AbstractCoordinates, CoordinateSerializer
+from .collisions import RoomCollisionsSerializer
+from .layout_job import LayoutJobSerializer
 from .placements import (DoorPlacementSerializer, FurniturePlacementSerializer,
                          PowerSocketPlacementSerializer,
                          WindowPlacementSerializer)
+from .relayout import PlacedFurnitureSerializer, RoomRelayoutSerializer
 from .room_items import FurnitureSerializer, RoomTypeSerializer
 from .room_layout import RoomLayoutCopySerializer, RoomLayoutSerializer
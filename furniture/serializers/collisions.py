@@ -0,0 +1,42 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+class PointSerializer(serializers.Serializer):
+    """Сериализатор для точки кандидата.
+
+    В отличие от `CoordinateSerializer` координаты могут быть
+    отрицательными: перетаскиваемая мебель может выходить за стены.
+    """
+
+    x = serializers.FloatField()
+    y = serializers.FloatField()
+
+
+class CandidateSerializer(serializers.Serializer):
+    """Сериализатор для углов прямоугольника-кандидата."""
+
+    north_west = PointSerializer()
+    north_east = PointSerializer()
+    south_west = PointSerializer()
+    south_east = PointSerializer()
+
+
+class RoomCollisionsSerializer(serializers.Serializer):
+    """Сериализатор для пачки кандидатов проверки пересечений.
+
+    exclude - размещения мебели, с которыми кандидаты не сравниваются,
+    together - кандидаты ставятся одновременно и не должны пересекать
+    друг друга.
+    """
+
+    candidates = CandidateSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=settings.LAYOUT_COLLISION_MAX_CANDIDATES,
+    )
+    exclude = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+    )
+    together = serializers.BooleanField(default=False)
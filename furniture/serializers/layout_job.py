@@ -0,0 +1,20 @@
+from rest_framework import serializers
+
+from furniture.models import LayoutJob
+
+
+class LayoutJobSerializer(serializers.ModelSerializer):
+    """Сериализатор для задачи расстановки мебели."""
+
+    class Meta:
+        fields = (
+            "id",
+            "room",
+            "status",
+            "error",
+            "created",
+            "started",
+            "finished",
+        )
+        model = LayoutJob
+        read_only_fields = fields
@@ -0,0 +1,32 @@
+from rest_framework import serializers
+
+from furniture.models import Furniture
+from furniture.serializers.placements import FurniturePlacementSerializer
+
+
+class RoomRelayoutSerializer(serializers.Serializer):
+    """Сериализатор для изменения набора мебели расставленной комнаты."""
+
+    add = serializers.PrimaryKeyRelatedField(
+        many=True,
+        queryset=Furniture.objects.all(),
+        required=False,
+    )
+    remove = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+    )
+
+    def validate(self, attrs):
+        if not attrs.get("add") and not attrs.get("remove"):
+            raise serializers.ValidationError(
+                "Нужно добавить или убрать хотя бы одну мебель",
+            )
+        return attrs
+
+
+class PlacedFurnitureSerializer(FurniturePlacementSerializer):
+    """Сериализатор для размещения мебели вместе с его идентификатором."""
+
+    class Meta(FurniturePlacementSerializer.Meta):
+        fields = ("id",) + FurniturePlacementSerializer.Meta.fields
@@ -60,7 +60,9 @@ class RoomLayoutSerializer(serializers.ModelSerializer):
 
 
 class RoomLayoutCopySerializer(serializers.ModelSerializer):
-    furniture_placement = FurniturePlacementSerializer(many=True, read_only=True)
+    furniture_placement = FurniturePlacementSerializer(
+        many=True, read_only=True, source="furnitureplacements",
+    )
 
     class Meta:
         model = RoomLayout
@@ -0,0 +1,162 @@
+import copy
+import dataclasses
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+CORNERS = ("north_west", "north_east", "south_west", "south_east")
+# ключ общего кэша с поколением результатов: при изменении мебели поколение
+# увеличивается, и все ранее сохраненные результаты перестают находиться
+GENERATION_KEY = "layout_result:generation"
+
+
+def opening_rectangle(opening):
+    """Углы двери, окна или мебели в виде кортежа координат."""
+    return tuple(
+        (opening[corner]["x"], opening[corner]["y"]) for corner in CORNERS
+    )
+
+
+def layout_cache_key(
+    doors_and_windows, furniture, room_size, furniture_ids, strategy,
+):
+    """Хэш входных данных алгоритма.
+
+    Двери и окна сортируются, так как их порядок не влияет на результат.
+    Порядок мебели сохраняется: от него зависит расстановка.
+
+    Args:
+        doors_and_windows: координаты углов дверей, окон и мебели
+        furniture: размеры мебели и расположение ее розеток
+        room_size: длины стен комнаты
+        furniture_ids: идентификаторы мебели в порядке furniture
+        strategy: параметры поиска расстановки (перестановки, зерно, ...)
+    """
+    canonical = json.dumps(
+        {
+            "room_size": room_size,
+            "openings": sorted(
+                opening_rectangle(opening) for opening in doors_and_windows
+            ),
+            "furniture": list(zip(furniture_ids, furniture)),
+            "strategy": strategy,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class LayoutResultCache:
+    """Двухуровневый кэш результатов алгоритма.
+
+    Первый уровень - LRU в памяти процесса на size результатов, второй -
+    кэш Django alias. Он должен быть общим для всех процессов (по умолчанию
+    кэш в базе данных): в нем же хранится поколение результатов, и кэш в
+    памяти процесса не передал бы его сброс другим процессам. Результат
+    хранится без дверей и окон, они подставляются из текущего запроса.
+
+    Поколение запоминается в процессе на generation_ttl секунд, чтобы
+    попадание в LRU не обращалось к общему кэшу. Сброс, сделанный другим
+    процессом, становится виден здесь не позже чем через generation_ttl.
+    """
+
+    def __init__(self, size, alias, timeout, generation_ttl=0):
+        self.size = size
+        self.alias = alias
+        self.timeout = timeout
+        self.generation_ttl = generation_ttl
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self._generation_expires = 0.0
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def generation(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._generation is not None and now < self._generation_expires:
+                return self._generation
+        generation = self.shared.get_or_set(GENERATION_KEY, 0, timeout=None)
+        with self._lock:
+            self._generation = generation
+            self._generation_expires = now + self.generation_ttl
+        return generation
+
+    def invalidate(self):
+        """Делает недействительными все сохраненные результаты."""
+        try:
+            generation = self.shared.incr(GENERATION_KEY)
+        except ValueError:
+            generation = 1
+            self.shared.set(GENERATION_KEY, generation, timeout=None)
+        with self._lock:
+            self._local.clear()
+            self._generation = generation
+            self._generation_expires = (
+                time.monotonic() + self.generation_ttl
+            )
+
+    def _full_key(self, key):
+        return f"layout_result:{self.generation()}:{key}"
+
+    def get(self, key, doors_and_windows):
+        """Результат из кэша или None."""
+        full_key = self._full_key(key)
+        with self._lock:
+            result = self._local.get(full_key)
+            if result is not None:
+                self._local.move_to_end(full_key)
+        if result is None:
+            result = self.shared.get(full_key)
+            if result is None:
+                return None
+            self._remember(full_key, result)
+        return dataclasses.replace(
+            copy.deepcopy(result), openings=list(doors_and_windows),
+        )
+
+    def set(self, key, result):
+        """Сохраняет результат в обоих уровнях кэша."""
+        full_key = self._full_key(key)
+        result = dataclasses.replace(copy.deepcopy(result), openings=[])
+        self._remember(full_key, result)
+        self.shared.set(full_key, result, timeout=self.timeout)
+
+    def _remember(self, full_key, result):
+        with self._lock:
+            self._local[full_key] = result
+            self._local.move_to_end(full_key)
+            while len(self._local) > self.size:
+                self._local.popitem(last=False)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _create_layout_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LayoutResultCache(
+                settings.LAYOUT_RESULT_CACHE_SIZE,
+                settings.LAYOUT_RESULT_CACHE_ALIAS,
+                settings.LAYOUT_RESULT_CACHE_TIMEOUT,
+                settings.LAYOUT_RESULT_CACHE_GENERATION_TTL,
+            )
+
+
+def get_layout_cache() -> LayoutResultCache:
+    """Общий для процесса кэш результатов с параметрами из настроек."""
+    if _cache is None:
+        _create_layout_cache()
+    return _cache
@@ -0,0 +1,212 @@
+"""Реестр движков расстановки и теневой запуск движка-кандидата.
+
+Движок - это функция `engine(doors_and_windows, furniture, room_size,
+state=None, **options)`, возвращающая `LayoutResult`; state - снимок
+подготовленной комнаты `layout_algorithm.snapshot.prepare_state`, с ним
+движок не разбирает двери и окна заново. Движки перечислены в настройке
+LAYOUT_ENGINES, ответ строит движок LAYOUT_ENGINE. Если задан
+LAYOUT_SHADOW_ENGINE, доля LAYOUT_SHADOW_SAMPLE_RATE расчетов повторяется
+этим движком в фоновом потоке: время и отличия результатов пишутся в лог и
+на ответ не влияют.
+"""
+
+import copy
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+
+from furniture.services.layout_cache import CORNERS
+from layout_algorithm.exceptions import LayoutInfeasibleError, PlacementError
+
+logger = logging.getLogger(__name__)
+
+_shadow_pool = None
+_shadow_lock = threading.Lock()
+# одновременно выполняется не больше одного теневого расчета, остальные
+# выбранные расчеты пропускаются
+_shadow_slot = threading.Semaphore(1)
+
+
+def get_engine(name):
+    """Функция движка name и ее параметры из LAYOUT_ENGINES."""
+    config = settings.LAYOUT_ENGINES.get(name)
+    if config is None:
+        raise ImproperlyConfigured(f"Неизвестный движок расстановки: {name}")
+    return import_string(config["ENGINE"]), config.get("OPTIONS", {})
+
+
+def run_engine(name, doors_and_windows, furniture, room_size, state=None):
+    """Расстановка движком name.
+
+    Ошибки алгоритма и расстановка, остановленная по бюджету, переводятся
+    в ошибки валидации поля selected_furniture.
+    """
+    engine, options = get_engine(name)
+    try:
+        result = engine(
+            doors_and_windows, furniture, room_size, state=state, **options,
+        )
+    except LayoutInfeasibleError as error:
+        raise serializers.ValidationError(
+            {
+                "selected_furniture": [
+                    reason["message"] for reason in error.reasons
+                ],
+            },
+        )
+    except PlacementError as error:
+        raise serializers.ValidationError({"selected_furniture": [str(error)]})
+    if result.unplaced:
+        raise serializers.ValidationError(
+            {"selected_furniture": ["Превышено время расчета планировки"]},
+        )
+    return result
+
+
+def arrange(doors_and_windows, furniture, room_size, state=None):
+    """Расстановка основным движком с выборочным теневым запуском.
+
+    Снимок комнаты state передается только основному движку, теневой
+    готовит комнату сам.
+    """
+    started = time.perf_counter()
+    result = error = None
+    try:
+        result = run_engine(
+            settings.LAYOUT_ENGINE,
+            doors_and_windows,
+            furniture,
+            room_size,
+            state,
+        )
+        return result
+    except serializers.ValidationError as validation_error:
+        error = validation_error
+        raise
+    finally:
+        submit_shadow(
+            doors_and_windows,
+            furniture,
+            room_size,
+            {
+                "result": result,
+                "error": error,
+                "time": time.perf_counter() - started,
+            },
+        )
+
+
+def placement_boxes(result):
+    """Углы мебели расстановки по индексам мебели, округленные до мм."""
+    return {
+        placement["index"]: tuple(
+            (round(placement[corner]["x"]), round(placement[corner]["y"]))
+            for corner in CORNERS
+        )
+        for placement in result.placements
+    }
+
+
+def compare_outcomes(primary, shadow):
+    """Сравнение результатов основного и теневого движков.
+
+    Args:
+        primary: {"result": ..., "error": ..., "time": ...} основного движка
+        shadow: то же для теневого движка
+
+    Returns:
+        dict: время, количество размещенной мебели, ошибки и количество
+        мебели, которая размещена по-разному
+    """
+    boxes = [
+        {} if outcome["result"] is None else placement_boxes(outcome["result"])
+        for outcome in (primary, shadow)
+    ]
+    return {
+        "primary_time": primary["time"],
+        "shadow_time": shadow["time"],
+        "primary_placed": len(boxes[0]),
+        "shadow_placed": len(boxes[1]),
+        "primary_error": None if primary["error"] is None else str(primary["error"]),
+        "shadow_error": None if shadow["error"] is None else str(shadow["error"]),
+        "moved": sum(
+            boxes[0].get(index) != boxes[1].get(index)
+            for index in boxes[0].keys() | boxes[1].keys()
+        ),
+    }
+
+
+def run_shadow(name, doors_and_windows, furniture, room_size, primary):
+    """Теневой расчет движком name и запись сравнения в лог."""
+    started = time.perf_counter()
+    result = error = None
+    try:
+        result = run_engine(name, doors_and_windows, furniture, room_size)
+    except serializers.ValidationError as validation_error:
+        error = validation_error
+    except Exception as engine_error:
+        logger.warning("Ошибка теневого движка %s", name, exc_info=True)
+        error = engine_error
+    comparison = compare_outcomes(
+        primary,
+        {"result": result, "error": error, "time": time.perf_counter() - started},
+    )
+    comparison["primary"] = settings.LAYOUT_ENGINE
+    comparison["shadow"] = name
+    logger.info(
+        "Теневой движок %s: %.3f с против %.3f с, отличается мебели: %s",
+        name,
+        comparison["shadow_time"],
+        comparison["primary_time"],
+        comparison["moved"],
+        extra={"layout_shadow": comparison},
+    )
+    return comparison
+
+
+def _create_shadow_pool():
+    global _shadow_pool
+    with _shadow_lock:
+        if _shadow_pool is None:
+            _shadow_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="layout-shadow",
+            )
+
+
+def get_shadow_pool() -> ThreadPoolExecutor:
+    """Общий для процесса поток теневых расчетов."""
+    if _shadow_pool is None:
+        _create_shadow_pool()
+    return _shadow_pool
+
+
+def submit_shadow(doors_and_windows, furniture, room_size, primary):
+    """Запускает теневой расчет для выбранной доли запросов.
+
+    Returns:
+        Future | None: теневой расчет или None, если расчет не выбран или
+        предыдущий теневой расчет еще выполняется
+    """
+    name = settings.LAYOUT_SHADOW_ENGINE
+    if not name or random.random() >= settings.LAYOUT_SHADOW_SAMPLE_RATE:
+        return None
+    if not _shadow_slot.acquire(blocking=False):
+        logger.debug("Теневой расчет пропущен: предыдущий еще выполняется")
+        return None
+    future = get_shadow_pool().submit(
+        run_shadow,
+        name,
+        copy.deepcopy(doors_and_windows),
+        copy.deepcopy(furniture),
+        copy.deepcopy(room_size),
+        primary,
+    )
+    future.add_done_callback(lambda _: _shadow_slot.release())
+    return future
@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from furniture.models import Furniture, LayoutJob
+from furniture.services.room_layout_service import arrange_room, room_corners
+
+logger = logging.getLogger(__name__)
+
+
+class JobReclaimedError(Exception):
+    """Задачу взял другой процесс, результат этого процесса не сохраняется."""
+
+
+class Heartbeat(threading.Thread):
+    """Периодически отмечает в задаче, что процесс еще выполняет ее.
+
+    Поток работает со своим соединением с базой, поэтому отметки видны
+    другим процессам, пока основной поток держит открытую транзакцию.
+    """
+
+    def __init__(self, job, interval):
+        super().__init__(daemon=True)
+        self.job = job
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                LayoutJob.objects.filter(
+                    pk=self.job.pk,
+                    attempt=self.job.attempt,
+                    status=LayoutJob.RUNNING,
+                ).update(heartbeat=timezone.now())
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def owns_job(job):
+    """Блокирует строку задачи и проверяет, что ее не взял другой процесс."""
+    return (
+        LayoutJob.objects.select_for_update()
+        .filter(pk=job.pk, attempt=job.attempt, status=LayoutJob.RUNNING)
+        .exists()
+    )
+
+
+def claim_job():
+    """Забирает самую старую задачу из очереди.
+
+    Строка задачи блокируется с `skip_locked`, поэтому несколько процессов
+    не возьмут одну задачу. Выполняемая задача, от процесса которой
+    LAYOUT_JOB_TIMEOUT секунд не было сигнала (см. `Heartbeat`), считается
+    брошенной упавшим процессом и берется повторно с новым номером попытки.
+    Брошенная задача, у которой уже LAYOUT_JOB_MAX_ATTEMPTS попыток,
+    вероятно, сама роняет процесс, поэтому она завершается с ошибкой, а
+    берется следующая задача.
+
+    Returns:
+        LayoutJob | None: задача или None, если очередь пуста
+    """
+    stale = timezone.now() - timedelta(seconds=settings.LAYOUT_JOB_TIMEOUT)
+    with transaction.atomic():
+        while True:
+            job = (
+                LayoutJob.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=LayoutJob.PENDING)
+                    | Q(status=LayoutJob.RUNNING, heartbeat__lt=stale),
+                )
+                .order_by("created")
+                .first()
+            )
+            if job is None:
+                return None
+            if job.attempt < settings.LAYOUT_JOB_MAX_ATTEMPTS:
+                break
+            logger.error(
+                "Задача расстановки %s брошена после %s попыток",
+                job.pk,
+                job.attempt,
+            )
+            job.status = LayoutJob.FAILED
+            job.error = {
+                "detail": ["Расчет расстановки прерывался слишком много раз"],
+            }
+            job.finished = timezone.now()
+            job.save(update_fields=("status", "error", "finished"))
+        job.status = LayoutJob.RUNNING
+        job.started = job.heartbeat = timezone.now()
+        job.attempt += 1
+        job.save(update_fields=("status", "started", "heartbeat", "attempt"))
+    return job
+
+
+def run_job(job):
+    """Рассчитывает расстановку задачи и сохраняет результат.
+
+    Пока идет расчет, процесс отправляет сигналы `Heartbeat`. Если за это
+    время задачу взял другой процесс, расстановка откатывается, а
+    состояние задачи не меняется.
+    """
+    room = job.room
+    furniture = Furniture.objects.in_bulk(job.furniture_ids)
+    selected_furniture = [
+        furniture[pk] for pk in job.furniture_ids if pk in furniture
+    ]
+    heartbeat = Heartbeat(job, settings.LAYOUT_JOB_HEARTBEAT_INTERVAL)
+    heartbeat.start()
+    try:
+        with transaction.atomic():
+            arrange_room(
+                room,
+                room_corners(room.doorplacements, room.windowplacements),
+                selected_furniture,
+                room_corners(room.furnitureplacements),
+            )
+            if not owns_job(job):
+                raise JobReclaimedError
+    except JobReclaimedError:
+        logger.warning(
+            "Задачу расстановки %s взял другой процесс, результат попытки %s "
+            "не сохранен",
+            job.pk,
+            job.attempt,
+        )
+        return job
+    except serializers.ValidationError as error:
+        job.status = LayoutJob.FAILED
+        job.error = error.detail
+    except Exception as error:
+        logger.exception("Ошибка задачи расстановки %s", job.pk)
+        job.status = LayoutJob.FAILED
+        job.error = {"detail": [str(error)]}
+    else:
+        job.status = LayoutJob.DONE
+    finally:
+        # поток останавливается после завершения транзакции, иначе он мог
+        # бы ждать блокировку строки задачи, которую держит owns_job
+        heartbeat.stop()
+    job.finished = timezone.now()
+    LayoutJob.objects.filter(pk=job.pk, attempt=job.attempt).update(
+        status=job.status, error=job.error, finished=job.finished,
+    )
+    return job
+
+
+def run_worker(poll_interval=None, max_jobs=None):
+    """Выполняет задачи из очереди, пока их количество не достигнет max_jobs.
+
+    Если очередь пуста или база недоступна, процесс ждет poll_interval
+    секунд.
+    """
+    if poll_interval is None:
+        poll_interval = settings.LAYOUT_JOB_POLL_INTERVAL
+    done = 0
+    while max_jobs is None or done < max_jobs:
+        try:
+            job = claim_job()
+        except DatabaseError:
+            logger.exception("Не удалось взять задачу расстановки из очереди")
+            # сломанное соединение открывается заново при следующем запросе
+            connection.close()
+            job = None
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        logger.info("Задача расстановки %s: %s", job.pk, job.status)
+        done += 1
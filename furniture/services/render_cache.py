@@ -0,0 +1,142 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+# доля max_bytes, после записи которой процесс заново считает размер
+# директории: так учитываются файлы, записанные другими процессами
+RESCAN_FRACTION = 0.1
+
+
+class RenderCache:
+    """Кэш изображений планировок по ключу из хэша их содержимого.
+
+    Изображения хранятся файлами в directory, общий размер которых не
+    превышает max_bytes: при переполнении удаляются файлы, к которым дольше
+    всего не обращались (время обращения хранится в mtime файла). Перед диском
+    стоит кэш в памяти процесса на memory_items последних изображений.
+
+    Директория общая для всех процессов, поэтому размер на диске считается
+    по самой директории: заново после каждых RESCAN_FRACTION * max_bytes,
+    записанных этим процессом, и перед удалением файлов. Между пересчетами
+    каждый процесс может превысить max_bytes не больше чем на эту долю.
+    """
+
+    def __init__(self, directory, max_bytes, memory_items):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # размер директории при последнем пересчете и байты, записанные
+        # этим процессом после него
+        self._disk_bytes = None
+        self._written = 0
+
+    def path(self, key, extension):
+        """Путь к файлу изображения; файлы разложены по первым символам ключа."""
+        return os.path.join(self.directory, key[:2], f"{key}.{extension}")
+
+    def _remember(self, name, content):
+        with self._lock:
+            self._memory[name] = content
+            self._memory.move_to_end(name)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def get(self, key, extension):
+        """Изображение из кэша или None."""
+        name = f"{key}.{extension}"
+        with self._lock:
+            content = self._memory.get(name)
+            if content is not None:
+                self._memory.move_to_end(name)
+                return content
+        path = self.path(key, extension)
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        self._remember(name, content)
+        return content
+
+    def set(self, key, extension, content):
+        """Сохраняет изображение в памяти и на диске."""
+        self._remember(f"{key}.{extension}", content)
+        path = self.path(key, extension)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # запись через временный файл, чтобы другие процессы не прочитали
+        # недописанное изображение
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(content)
+        os.replace(temporary, path)
+        with self._lock:
+            self._written += len(content)
+            if (
+                self._disk_bytes is None
+                or self._written >= self.max_bytes * RESCAN_FRACTION
+            ):
+                self._disk_bytes = sum(size for _, size, _ in self._files())
+                self._written = 0
+            if self._disk_bytes + self._written > self.max_bytes:
+                self._evict()
+
+    def get_or_render(self, key, extension, render):
+        """Изображение из кэша, при промахе - результат render()."""
+        content = self.get(key, extension)
+        if content is None:
+            content = render()
+            self.set(key, extension, content)
+        return content
+
+    def _files(self):
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def _evict(self):
+        """Удаляет давно не использованные файлы до 90% от max_bytes."""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._disk_bytes = total
+        self._written = 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _create_render_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RenderCache(
+                settings.LAYOUT_IMAGE_CACHE_DIR,
+                settings.LAYOUT_IMAGE_CACHE_MAX_BYTES,
+                settings.LAYOUT_IMAGE_MEMORY_CACHE_SIZE,
+            )
+
+
+def get_render_cache() -> RenderCache:
+    """Общий для процесса кэш изображений с параметрами из настроек."""
+    if _cache is None:
+        _create_render_cache()
+    return _cache
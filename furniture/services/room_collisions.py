@@ -0,0 +1,58 @@
+from furniture.services.room_image_service import CORNERS, placement_corners
+from furniture.services.room_layout_service import room_size_of
+from layout_algorithm.crossover_checks import collision_matrix
+
+# объекты комнаты, с которыми сравниваются кандидаты: тип в ответе и
+# связанный набор размещений
+ROOM_OBJECTS = (
+    ("furniture", "furnitureplacements"),
+    ("door", "doorplacements"),
+    ("window", "windowplacements"),
+)
+
+
+def room_objects(room, exclude=()):
+    """Мебель, двери и окна комнаты: описания для ответа и углы.
+
+    Args:
+        room: планировка
+        exclude: идентификаторы размещений мебели, которые не учитываются
+    """
+    descriptions, figures = [], []
+    for object_type, related_name in ROOM_OBJECTS:
+        placements = getattr(room, related_name).select_related(*CORNERS)
+        if object_type == "furniture":
+            placements = placements.exclude(pk__in=exclude)
+        for placement in placements:
+            descriptions.append({"type": object_type, "id": placement.pk})
+            figures.append(placement_corners(placement))
+    return descriptions, figures
+
+
+def room_collisions(room, candidates, exclude=(), together=False):
+    """Проверить пачку кандидатов против объектов, стен комнаты и друг друга.
+
+    Args:
+        room: планировка
+        candidates: координаты углов кандидатов
+        exclude: идентификаторы размещений мебели, с которыми кандидаты не
+            сравниваются, например перетаскиваемой мебели
+        together: кандидаты ставятся одновременно, поэтому свободным
+            считается только кандидат, не пересекающий и другие кандидаты
+
+    Returns:
+        dict: объекты комнаты в порядке столбцов, матрица пересечений
+        кандидатов с объектами, матрица пересечений кандидатов между собой,
+        признаки нахождения внутри комнаты и итоговые признаки свободного
+        места
+    """
+    descriptions, figures = room_objects(room, exclude)
+    matrix = collision_matrix(candidates, figures, room_size_of(room))
+    free = matrix.free_together if together else matrix.free
+    return {
+        "objects": descriptions,
+        "collisions": matrix.objects.tolist(),
+        "candidates": matrix.candidates.tolist(),
+        "inside_room": matrix.inside.tolist(),
+        "free": free.tolist(),
+    }
@@ -0,0 +1,111 @@
+import hashlib
+import json
+from functools import cached_property
+
+from django.conf import settings
+
+from furniture.services.render_cache import get_render_cache
+from layout_algorithm.create_picture import render_layout
+
+CORNERS = ("north_west", "north_east", "south_west", "south_east")
+# версия рисования, при изменении внешнего вида изображений ее нужно
+# увеличить, чтобы не отдавать старые изображения из кэша
+RENDER_VERSION = 1
+
+
+def placement_corners(placement):
+    """Углы размещенного объекта в виде словарей координат."""
+    corners = {}
+    for corner in CORNERS:
+        coordinate = getattr(placement, corner)
+        corners[corner] = {"x": coordinate.x, "y": coordinate.y}
+    return corners
+
+
+def layout_image_key(data, borders, power_sockets, image_format, max_side):
+    """Хэш геометрии планировки и параметров рисования.
+
+    Порядок объектов на изображение не влияет, поэтому перед хэшированием
+    объекты и розетки сортируются.
+    """
+    canonical = json.dumps(
+        {
+            "version": RENDER_VERSION,
+            "borders": borders,
+            "data": sorted(json.dumps(item, sort_keys=True) for item in data),
+            "power_sockets": sorted(
+                json.dumps(item, sort_keys=True) for item in power_sockets
+            ),
+            "image_format": image_format,
+            "max_side": max_side,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class RoomImage:
+    """Изображение сохраненной планировки.
+
+    Ключ кэша считается по объектам из базы сразу, а само изображение
+    берется из кэша или рисуется только при обращении к `content`.
+    """
+
+    def __init__(self, room, image_format="png"):
+        self.image_format = image_format
+        self.max_side = settings.LAYOUT_IMAGE_MAX_SIDE
+        self.borders = {
+            "south_west": {"x": 0, "y": 0},
+            "north_west": {"x": 0, "y": room.first_wall},
+            "north_east": {"x": room.second_wall, "y": room.first_wall},
+            "south_east": {"x": room.second_wall, "y": 0},
+        }
+        self.data = [
+            placement_corners(placement)
+            for queryset in (
+                room.furnitureplacements,
+                room.doorplacements,
+                room.windowplacements,
+            )
+            for placement in queryset.select_related(*CORNERS)
+        ]
+        self.power_sockets = [
+            placement_corners(socket)["north_west"]
+            for socket in room.powersocketplacements.select_related(*CORNERS)
+        ]
+        self.key = layout_image_key(
+            self.data,
+            self.borders,
+            self.power_sockets,
+            image_format,
+            self.max_side,
+        )
+
+    @property
+    def etag(self):
+        """Строгий ETag изображения."""
+        return f'"{self.key}"'
+
+    @cached_property
+    def content(self):
+        return get_render_cache().get_or_render(
+            self.key, self.image_format, self.render,
+        )
+
+    def render(self):
+        return render_layout(
+            self.data,
+            self.borders,
+            self.power_sockets,
+            image_format=self.image_format,
+            max_side=self.max_side,
+        )
+
+
+def render_room_image(room, image_format="png"):
+    """Изображение сохраненной планировки в виде байтов.
+
+    Изображение строится по объектам из базы только тогда, когда клиент его
+    запрашивает, и кэшируется по хэшу геометрии планировки.
+    """
+    return RoomImage(room, image_format).content
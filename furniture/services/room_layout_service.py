@@ -1,7 +1,18 @@
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
 from furniture.models import (Coordinate, DoorPlacement, FurniturePlacement,
-                              PowerSocketPlacement, RoomLayout,
+                              LayoutJob, PowerSocketPlacement, RoomLayout,
                               WindowPlacement)
-from layout_algorithm import core
+from furniture.services.layout_cache import get_layout_cache, layout_cache_key
+from furniture.services.layout_engines import arrange
+from furniture.services.room_image_service import CORNERS, placement_corners
+from layout_algorithm.exceptions import LayoutInfeasibleError, SnapshotError
+from layout_algorithm.feasibility import check_feasibility
+from layout_algorithm.optimizer import optimize_layout
+from layout_algorithm.snapshot import prepare_state
+from layout_algorithm.variants import generate_variants
 
 
 def create_room_layout(validated_data):
@@ -62,59 +73,274 @@ def create_room_layout(validated_data):
         )
     PowerSocketPlacement.objects.bulk_create(room_powersocket)
 
-    furniture_placement = []
     if selected_furniture:
-        doors_and_windows = []
-        doors_and_windows.extend(doors)
-        doors_and_windows.extend(windows)
-        doors_and_windows.extend(room_placement)
-        furniture = []
-        for one_furniture in selected_furniture:
-            furniture.append(
-                {
-                    "name": one_furniture.name,
-                    "length": one_furniture.length_access,
-                    "width": one_furniture.width_access,
-                    "power_socket_type": one_furniture.power_socket_type,
-                    "first_power_socket_height": one_furniture.first_power_socket_height,
-                    "first_power_socket_width": one_furniture.first_power_socket_width,
-                    "second_power_socket_height": one_furniture.second_power_socket_height,
-                    "second_power_socket_width": one_furniture.second_power_socket_width,
-                },
+        if settings.LAYOUT_ASYNC_JOBS:
+            room.layout_job = LayoutJob.objects.create(
+                room=room,
+                furniture_ids=[
+                    one_furniture.pk for one_furniture in selected_furniture
+                ],
             )
-        room_size = {
-            "first_wall": room.first_wall,
-            "second_wall": room.second_wall,
-            "third_wall": room.third_wall,
-            "fourth_wall": room.fourth_wall,
+        else:
+            arrange_room(
+                room, [*doors, *windows], selected_furniture, room_placement,
+            )
+
+    return room
+
+
+def furniture_input(selected_furniture):
+    """Размеры мебели и расположение ее розеток для алгоритма."""
+    return [
+        {
+            "name": one_furniture.name,
+            "length": one_furniture.length_access,
+            "width": one_furniture.width_access,
+            "power_socket_type": one_furniture.power_socket_type,
+            "first_power_socket_height": one_furniture.first_power_socket_height,
+            "first_power_socket_width": one_furniture.first_power_socket_width,
+            "second_power_socket_height": one_furniture.second_power_socket_height,
+            "second_power_socket_width": one_furniture.second_power_socket_width,
         }
-        furniture_arrangement = core.Core()
-        furniture_arrangement.algorithm_activation(
+        for one_furniture in selected_furniture
+    ]
+
+
+def room_size_of(room):
+    """Длины стен комнаты в формате алгоритма."""
+    return {
+        "first_wall": room.first_wall,
+        "second_wall": room.second_wall,
+        "third_wall": room.third_wall,
+        "fourth_wall": room.fourth_wall,
+    }
+
+
+def room_corners(*querysets):
+    """Углы объектов комнаты из querysets в формате алгоритма."""
+    return [
+        placement_corners(placement)
+        for queryset in querysets
+        for placement in queryset.select_related(*CORNERS)
+    ]
+
+
+def room_state(room, doors_and_windows, placed=()):
+    """Снимок подготовленной комнаты для расчета расстановки.
+
+    Двери и окна берутся из снимка `layout_state`, к нему добавляется
+    только уже расставленная мебель placed. Если снимка нет или он сделан
+    для комнаты другого размера, комната с дверями и окнами готовится
+    заново и снимок сохраняется. При изменении дверей и окон снимок
+    сбрасывается, см. `furniture.signals`.
+
+    Args:
+        room: планировка
+        doors_and_windows: координаты углов дверей и окон комнаты
+        placed: координаты углов уже расставленной мебели
+    """
+    room_size = room_size_of(room)
+    if room.layout_state is not None:
+        try:
+            return prepare_state(placed, room_size, bytes(room.layout_state))
+        except SnapshotError:
+            pass
+    room.layout_state = prepare_state(doors_and_windows, room_size)
+    room.save(update_fields=("layout_state",))
+    return prepare_state(placed, room_size, room.layout_state)
+
+
+def arrange_room(room, doors_and_windows, selected_furniture, placed=()):
+    """Рассчитать расстановку мебели и сохранить ее в комнате.
+
+    Двери и окна не разбираются заново, если в комнате сохранен их снимок
+    `layout_state` (см. `room_state`).
+
+    Args:
+        room: планировка
+        doors_and_windows: координаты углов дверей и окон
+        selected_furniture: объекты мебели в порядке расстановки
+        placed: координаты углов уже расставленной мебели
+    """
+    result = cached_arrange_furniture(
+        [*doors_and_windows, *placed],
+        furniture_input(selected_furniture),
+        room_size_of(room),
+        [one_furniture.pk for one_furniture in selected_furniture],
+        room_state(room, doors_and_windows, placed),
+    )
+    furniture_placement = []
+    for placement in result.placements:
+        coordinates = create_by_coordinate(placement)
+        furniture_placement.append(
+            FurniturePlacement(
+                furniture=selected_furniture[placement["index"]],
+                room=room,
+                **coordinates,
+            ),
+        )
+    FurniturePlacement.objects.bulk_create(furniture_placement)
+    return result
+
+
+@transaction.atomic
+def relayout_room(room, add=(), remove=()):
+    """Изменить набор мебели комнаты, не переставляя оставшуюся.
+
+    Размещения remove удаляются. Остальная мебель остается на местах и
+    передается алгоритму вместе с дверями и окнами как уже расставленная,
+    поэтому рассчитывается только добавленная мебель add. Если она не
+    помещается, удаление тоже отменяется.
+
+    Args:
+        room: планировка
+        add: объекты добавляемой мебели в порядке расстановки
+        remove: идентификаторы удаляемых размещений мебели комнаты
+
+    Returns:
+        LayoutResult | None: расстановка добавленной мебели или None, если
+        мебель только удалялась
+    """
+    removed = room.furnitureplacements.filter(pk__in=remove)
+    missing = set(remove) - set(removed.values_list("pk", flat=True))
+    if missing:
+        raise serializers.ValidationError(
+            {
+                "remove": [
+                    f"В комнате нет размещения мебели {pk}"
+                    for pk in sorted(missing)
+                ],
+            },
+        )
+    # координаты размещений не удаляются вместе с ними
+    corner_fields = [f"{corner}_id" for corner in CORNERS]
+    coordinates = [
+        pk
+        for corners in removed.values_list(*corner_fields)
+        for pk in corners
+    ]
+    removed.delete()
+    Coordinate.objects.filter(pk__in=coordinates).delete()
+    if not add:
+        return None
+    return arrange_room(
+        room,
+        room_corners(room.doorplacements, room.windowplacements),
+        add,
+        room_corners(room.furnitureplacements),
+    )
+
+
+def cached_arrange_furniture(
+    doors_and_windows, furniture, room_size, furniture_ids, state=None,
+):
+    """Расстановка мебели из кэша, при промахе - расчет движком
+    LAYOUT_ENGINE (см. `layout_engines.arrange`) по снимку комнаты state."""
+    if settings.LAYOUT_RESULT_CACHE_SIZE <= 0:
+        return arrange(doors_and_windows, furniture, room_size, state)
+    strategy = {
+        "engine": settings.LAYOUT_ENGINE,
+        "optimizer_time_budget": settings.LAYOUT_OPTIMIZER_TIME_BUDGET,
+        "variants_count": settings.LAYOUT_VARIANTS_COUNT,
+        "ordering": settings.LAYOUT_ORDERING,
+        "backtrack_depth": settings.LAYOUT_BACKTRACK_DEPTH,
+        "seed": 0,
+    }
+    key = layout_cache_key(
+        doors_and_windows, furniture, room_size, furniture_ids, strategy,
+    )
+    cache = get_layout_cache()
+    result = cache.get(key, doors_and_windows)
+    if result is None:
+        result = arrange(doors_and_windows, furniture, room_size, state)
+        cache.set(key, result)
+    return result
+
+
+def arrange_furniture(doors_and_windows, furniture, room_size, state=None):
+    """Рассчитать расстановку мебели, движок "core" из LAYOUT_ENGINES.
+
+    Если задано время на оптимизацию, ищется лучшая расстановка. Иначе
+    варианты с разным порядком мебели считаются параллельно, и из
+    успешно рассчитанных выбирается вариант с наименьшим номером, поэтому
+    результат не зависит от того, какой вариант досчитался раньше.
+
+    Мебель, которая заведомо не помещается в комнату, отклоняется до
+    запуска поиска.
+    """
+    try:
+        check_feasibility(doors_and_windows, furniture, room_size)
+    except LayoutInfeasibleError as error:
+        raise serializers.ValidationError(
+            {
+                "selected_furniture": [
+                    reason["message"] for reason in error.reasons
+                ],
+            },
+        )
+    if settings.LAYOUT_OPTIMIZER_TIME_BUDGET > 0:
+        result = optimize_layout(
             doors_and_windows,
             furniture,
             room_size,
+            time_budget=settings.LAYOUT_OPTIMIZER_TIME_BUDGET,
+            state=state,
         )
+        if len(result.placements) < len(furniture):
+            raise serializers.ValidationError(
+                {"selected_furniture": ["Не удалось разместить всю мебель"]},
+            )
+        return result
 
-    return room
+    count = settings.LAYOUT_VARIANTS_COUNT
+    errors, results = [], []
+    for variant in generate_variants(
+        doors_and_windows,
+        furniture,
+        room_size,
+        count=count,
+        deadline=settings.LAYOUT_VARIANTS_DEADLINE,
+        max_workers=settings.LAYOUT_POOL_WORKERS if count > 1 else 1,
+        ordering=settings.LAYOUT_ORDERING,
+        backtrack_depth=settings.LAYOUT_BACKTRACK_DEPTH,
+        state=state,
+        collect_stats=settings.LAYOUT_STATS,
+        unique=False,
+    ):
+        if variant.result is None:
+            errors.append(variant.error)
+        elif variant.result.unplaced:
+            errors.append("Превышено время расчета планировки")
+        else:
+            results.append(variant)
+    if results:
+        # зерно варианта - его номер в порядке variant_specs
+        return min(results, key=lambda variant: variant.seed).result
+    raise serializers.ValidationError(
+        {"selected_furniture": errors or ["Превышено время расчета планировки"]},
+    )
 
 
 def create_by_coordinate(placement):
-    """Создать и вернуть координаты для элемента (мебель, окно, ...)"""
+    """Создать и вернуть координаты для элемента (мебель, окно, ...)
+
+    Координаты, рассчитанные алгоритмом, округляются до целых миллиметров.
+    """
     return {
         "north_west": Coordinate.objects.create(
-            x=placement["north_west"]["x"],
-            y=placement["north_west"]["y"],
+            x=round(placement["north_west"]["x"]),
+            y=round(placement["north_west"]["y"]),
         ),
         "north_east": Coordinate.objects.create(
-            x=placement["north_east"]["x"],
-            y=placement["north_east"]["y"],
+            x=round(placement["north_east"]["x"]),
+            y=round(placement["north_east"]["y"]),
         ),
         "south_west": Coordinate.objects.create(
-            x=placement["south_west"]["x"],
-            y=placement["south_west"]["y"],
+            x=round(placement["south_west"]["x"]),
+            y=round(placement["south_west"]["y"]),
         ),
         "south_east": Coordinate.objects.create(
-            x=placement["south_east"]["x"],
-            y=placement["south_east"]["y"],
+            x=round(placement["south_east"]["x"]),
+            y=round(placement["south_east"]["y"]),
         ),
     }
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from furniture.models import (DoorPlacement, Furniture, RoomLayout,
+                              WindowPlacement)
+from furniture.services.layout_cache import get_layout_cache
+
+
+@receiver(post_save, sender=Furniture)
+@receiver(post_delete, sender=Furniture)
+def invalidate_layout_results(sender, instance, created=False, **kwargs):
+    """Сбрасывает кэш расстановок при изменении или удалении мебели.
+
+    Размеры мебели входят в ключ кэша, но сброс гарантирует, что после
+    правки каталога не останется результатов, рассчитанных для старых данных.
+    """
+    if not created:
+        get_layout_cache().invalidate()
+
+
+@receiver(post_save, sender=DoorPlacement)
+@receiver(post_delete, sender=DoorPlacement)
+@receiver(post_save, sender=WindowPlacement)
+@receiver(post_delete, sender=WindowPlacement)
+def reset_layout_state(sender, instance, **kwargs):
+    """Сбрасывает снимок комнаты при изменении ее дверей или окон.
+
+    Снимок построится заново при следующем расчете расстановки.
+    """
+    RoomLayout.objects.filter(pk=instance.room_id).update(layout_state=None)
@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from furniture import models
+from tariff.models import Tariff, UsersTariffs
+
+User = get_user_model()
+
+# углы двери у первой стены комнаты
+DOOR_CORNERS = {
+    "north_west": (0, 1000),
+    "north_east": (0, 0),
+    "south_west": (800, 1000),
+    "south_east": (800, 0),
+}
+
+
+def create_furniture(name, length, width, room_type):
+    """Мебель без розеток с зоной доступа по размерам мебели."""
+    return models.Furniture.objects.create(
+        name=name,
+        name_english=name,
+        length=length,
+        width=width,
+        length_access=length,
+        width_access=width,
+        type_of_rooms=room_type,
+        power_socket_type="Type-C",
+        first_power_socket_height=0,
+        first_power_socket_width=0,
+        second_power_socket_height=0,
+        second_power_socket_width=0,
+    )
+
+
+class BaseSetup(TestCase):
+    """Пользователь и его комната 3000x4000 с дверью у первой стены."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="user@example.com",
+            password="password",
+        )
+        cls.room = models.RoomLayout.objects.create(
+            user=cls.user,
+            name="Спальня",
+            first_wall=3000,
+            second_wall=4000,
+            third_wall=3000,
+            fourth_wall=4000,
+        )
+        corners = {
+            corner: models.Coordinate.objects.create(x=x, y=y)
+            for corner, (x, y) in DOOR_CORNERS.items()
+        }
+        cls.door = models.DoorPlacement.objects.create(
+            room=cls.room, width=1000, open_inside=True, **corners,
+        )
+
+
+class TariffSetup(BaseSetup):
+    """Те же данные и действующий тариф пользователя."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tariff = Tariff.objects.create(
+            name="Базовый",
+            name_english="basic",
+            description="Базовый тариф",
+            cost=0,
+            rooms_limit=10,
+        )
+        cls.user_tariff = UsersTariffs.objects.create(
+            user=cls.user, tariff=cls.tariff,
+        )
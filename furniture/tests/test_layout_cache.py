@@ -0,0 +1,120 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from furniture import models
+from furniture.services import layout_cache
+from furniture.services.layout_cache import LayoutResultCache, layout_cache_key
+from furniture.services.room_layout_service import cached_arrange_furniture
+from layout_algorithm.result import LayoutResult
+
+DOOR = {
+    "north_west": {"x": 0, "y": 1000},
+    "north_east": {"x": 0, "y": 0},
+    "south_west": {"x": 800, "y": 1000},
+    "south_east": {"x": 800, "y": 0},
+}
+WINDOW = {
+    "north_west": {"x": 1000, "y": 3000},
+    "north_east": {"x": 2000, "y": 3000},
+    "south_west": {"x": 1000, "y": 2900},
+    "south_east": {"x": 2000, "y": 2900},
+}
+ROOM_SIZE = {
+    "first_wall": 3000,
+    "second_wall": 4000,
+    "third_wall": 3000,
+    "fourth_wall": 4000,
+}
+FURNITURE = [{"name": "шкаф", "length": 600, "width": 1200}]
+
+
+class LayoutCacheKeyTest(TestCase):
+    def test_openings_order_does_not_matter(self):
+        """Порядок дверей и окон не влияет на ключ, порядок мебели влияет."""
+        key = layout_cache_key([DOOR, WINDOW], FURNITURE, ROOM_SIZE, [1], {})
+        self.assertEqual(
+            key, layout_cache_key([WINDOW, DOOR], FURNITURE, ROOM_SIZE, [1], {}),
+        )
+        self.assertNotEqual(
+            key,
+            layout_cache_key(
+                [DOOR, WINDOW], FURNITURE * 2, ROOM_SIZE, [1, 2], {},
+            ),
+        )
+
+
+class LayoutResultCacheTest(TestCase):
+    def setUp(self):
+        caches["layout"].clear()
+        patcher = mock.patch.object(
+            layout_cache, "_cache", LayoutResultCache(4, "layout", 60),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch("furniture.services.room_layout_service.arrange_furniture")
+    def test_hit_skips_algorithm(self, arrange_furniture):
+        """Повторный запрос той же комнаты не запускает алгоритм."""
+        arrange_furniture.return_value = LayoutResult(
+            room_size=ROOM_SIZE, openings=[DOOR], placements=[{"index": 0}],
+        )
+        first = cached_arrange_furniture([DOOR], FURNITURE, ROOM_SIZE, [1])
+        second = cached_arrange_furniture([DOOR], FURNITURE, ROOM_SIZE, [1])
+        arrange_furniture.assert_called_once()
+        self.assertEqual(first.placements, second.placements)
+        self.assertEqual(second.openings, [DOOR])
+
+    @override_settings(LAYOUT_RESULT_CACHE_SIZE=0)
+    @mock.patch("furniture.services.room_layout_service.arrange_furniture")
+    def test_disabled(self, arrange_furniture):
+        """При нулевом размере кэш не используется."""
+        arrange_furniture.return_value = LayoutResult(room_size=ROOM_SIZE)
+        cached_arrange_furniture([DOOR], FURNITURE, ROOM_SIZE, [1])
+        cached_arrange_furniture([DOOR], FURNITURE, ROOM_SIZE, [1])
+        self.assertEqual(arrange_furniture.call_count, 2)
+
+    def test_furniture_change_invalidates(self):
+        """Изменение мебели сбрасывает сохраненные результаты."""
+        room_type = models.RoomType.objects.create(name="Спальня")
+        furniture = models.Furniture.objects.create(
+            name="Шкаф",
+            name_english="Wardrobe",
+            length=1200,
+            width=600,
+            length_access=1300,
+            width_access=700,
+            type_of_rooms=room_type,
+            power_socket_type="Type-C",
+            first_power_socket_height=0,
+            first_power_socket_width=0,
+            second_power_socket_height=0,
+            second_power_socket_width=0,
+        )
+        result_cache = layout_cache.get_layout_cache()
+        result_cache.set("key", LayoutResult(room_size=ROOM_SIZE))
+        self.assertIsNotNone(result_cache.get("key", []))
+        furniture.width_access = 800
+        furniture.save()
+        self.assertIsNone(result_cache.get("key", []))
+
+    def test_invalidation_reaches_other_processes(self):
+        """Сброс поколения виден кэшу с другим уровнем в памяти процесса."""
+        result_cache = layout_cache.get_layout_cache()
+        other = LayoutResultCache(4, "layout", 60)
+        result_cache.set("key", LayoutResult(room_size=ROOM_SIZE))
+        self.assertIsNotNone(other.get("key", []))
+        result_cache.invalidate()
+        self.assertIsNone(other.get("key", []))
+
+    def test_local_hit_skips_shared_cache(self):
+        """Попадание в LRU не обращается к общему кэшу за поколением."""
+        result_cache = LayoutResultCache(4, "layout", 60, generation_ttl=60)
+        result_cache.set("key", LayoutResult(room_size=ROOM_SIZE))
+        shared = caches["layout"]
+        with (
+            mock.patch.object(shared, "get", side_effect=AssertionError),
+            mock.patch.object(shared, "get_or_set", side_effect=AssertionError),
+        ):
+            self.assertIsNotNone(result_cache.get("key", []))
@@ -0,0 +1,141 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from rest_framework import serializers
+
+from furniture.services import layout_engines
+from layout_algorithm.result import LayoutResult
+from layout_algorithm.variants import LayoutVariant
+
+ROOM_SIZE = {
+    "first_wall": 3000,
+    "second_wall": 4000,
+    "third_wall": 3000,
+    "fourth_wall": 4000,
+}
+FURNITURE = [
+    {"name": "шкаф", "length": 600, "width": 1200},
+    {"name": "тумба", "length": 400, "width": 400},
+]
+ENGINES = {
+    "core": {
+        "ENGINE": "furniture.services.room_layout_service.arrange_furniture",
+    },
+    "single": {
+        "ENGINE": "layout_algorithm.engine.compute_layout",
+        "OPTIONS": {"collect_stats": False},
+    },
+    "area": {
+        "ENGINE": "layout_algorithm.engine.compute_layout",
+        "OPTIONS": {"ordering": "area", "collect_stats": False},
+    },
+}
+
+
+@override_settings(
+    LAYOUT_ENGINES=ENGINES,
+    LAYOUT_ENGINE="single",
+    LAYOUT_SHADOW_ENGINE="",
+    LAYOUT_SHADOW_SAMPLE_RATE=0,
+)
+class LayoutEnginesTest(SimpleTestCase):
+    def test_primary_engine(self):
+        result = layout_engines.arrange([], FURNITURE, ROOM_SIZE)
+        self.assertEqual(len(result.placements), 2)
+
+    def test_unknown_engine(self):
+        with override_settings(LAYOUT_ENGINE="missing"):
+            with self.assertRaises(ImproperlyConfigured):
+                layout_engines.arrange([], FURNITURE, ROOM_SIZE)
+
+    def test_placement_error(self):
+        """Ошибки алгоритма становятся ошибками валидации."""
+        furniture = [{"name": "шкаф", "length": 5000, "width": 600}]
+        with self.assertRaises(serializers.ValidationError) as context:
+            layout_engines.arrange([], furniture, ROOM_SIZE)
+        self.assertIn("selected_furniture", context.exception.detail)
+
+    @mock.patch.object(layout_engines, "submit_shadow")
+    def test_primary_outcome_is_passed_to_shadow(self, submit_shadow):
+        result = layout_engines.arrange([], FURNITURE, ROOM_SIZE)
+        primary = submit_shadow.call_args.args[3]
+        self.assertIs(primary["result"], result)
+        self.assertIsNone(primary["error"])
+        self.assertGreater(primary["time"], 0)
+
+    @override_settings(LAYOUT_SHADOW_ENGINE="area", LAYOUT_SHADOW_SAMPLE_RATE=1)
+    def test_shadow_engine(self):
+        """Теневой движок считается в фоне, сравнение пишется в лог."""
+        primary = {
+            "result": layout_engines.run_engine("single", [], FURNITURE, ROOM_SIZE),
+            "error": None,
+            "time": 0.1,
+        }
+        with self.assertLogs(layout_engines.logger, "INFO") as logs:
+            future = layout_engines.submit_shadow(
+                [], FURNITURE, ROOM_SIZE, primary,
+            )
+            comparison = future.result(timeout=30)
+        self.assertEqual(logs.records[0].layout_shadow, comparison)
+        self.assertEqual(comparison["primary"], "single")
+        self.assertEqual(comparison["shadow"], "area")
+        self.assertEqual(comparison["shadow_placed"], 2)
+        self.assertEqual(comparison["moved"], 0)
+
+    @override_settings(LAYOUT_SHADOW_ENGINE="area", LAYOUT_SHADOW_SAMPLE_RATE=0)
+    def test_shadow_not_sampled(self):
+        self.assertIsNone(
+            layout_engines.submit_shadow([], FURNITURE, ROOM_SIZE, {}),
+        )
+
+    def test_compare_outcomes(self):
+        result = layout_engines.arrange([], FURNITURE, ROOM_SIZE)
+        moved = LayoutResult(
+            room_size=ROOM_SIZE, placements=result.placements[:1],
+        )
+        comparison = layout_engines.compare_outcomes(
+            {"result": result, "error": None, "time": 0.2},
+            {"result": moved, "error": None, "time": 0.1},
+        )
+        self.assertEqual(comparison["primary_placed"], 2)
+        self.assertEqual(comparison["shadow_placed"], 1)
+        self.assertEqual(comparison["moved"], 1)
+
+
+class ConfiguredEnginesTest(SimpleTestCase):
+    def test_single_engine(self):
+        """Движок "single" из настроек можно выбрать теневым."""
+        for name in settings.LAYOUT_ENGINES:
+            layout_engines.get_engine(name)
+        result = layout_engines.run_engine("single", [], FURNITURE, ROOM_SIZE)
+        self.assertEqual(len(result.placements), 2)
+
+    @override_settings(
+        LAYOUT_STATS=True,
+        LAYOUT_OPTIMIZER_TIME_BUDGET=0,
+        LAYOUT_VARIANTS_COUNT=1,
+    )
+    def test_core_engine_stats(self):
+        """Движок "core" собирает замеры этапов по настройке LAYOUT_STATS."""
+        result = layout_engines.run_engine("core", [], FURNITURE, ROOM_SIZE)
+        self.assertEqual(len(result.stats["items"]), 2)
+
+    @override_settings(LAYOUT_OPTIMIZER_TIME_BUDGET=0, LAYOUT_VARIANTS_COUNT=3)
+    def test_core_engine_picks_first_variant(self):
+        """Из успешных вариантов выбирается первый по номеру, а не первый
+        досчитавшийся."""
+        results = [LayoutResult(room_size=ROOM_SIZE) for _ in range(3)]
+        finished = [
+            LayoutVariant(mode="medium", seed=2, result=results[2]),
+            LayoutVariant(mode="light", seed=1, result=results[1]),
+            LayoutVariant(mode=None, seed=0, error="Не помещается"),
+        ]
+        module = "furniture.services.room_layout_service"
+        with mock.patch(
+            f"{module}.generate_variants", return_value=iter(finished),
+        ) as generate_variants:
+            result = layout_engines.run_engine("core", [], FURNITURE, ROOM_SIZE)
+        self.assertIs(result, results[1])
+        self.assertFalse(generate_variants.call_args.kwargs["unique"])
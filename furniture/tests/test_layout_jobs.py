@@ -0,0 +1,171 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.db.models import F
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from furniture import models
+from furniture.services.layout_jobs import claim_job, run_job, run_worker
+from furniture.tests.base import BaseSetup, create_furniture
+from layout_algorithm.core import Core
+from layout_algorithm.snapshot import load_state
+
+User = get_user_model()
+
+
+@override_settings(LAYOUT_RESULT_CACHE_SIZE=0, LAYOUT_VARIANTS_COUNT=1)
+class LayoutJobTest(BaseSetup):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        room_type = models.RoomType.objects.create(name="Спальня")
+        cls.furniture = create_furniture("Шкаф", 1200, 600, room_type)
+
+    def test_job_is_claimed_once(self):
+        """Задачу из очереди забирает только один процесс."""
+        job = models.LayoutJob.objects.create(
+            room=self.room, furniture_ids=[self.furniture.pk],
+        )
+        claimed = claim_job()
+        self.assertEqual(claimed, job)
+        self.assertEqual(claimed.status, models.LayoutJob.RUNNING)
+        self.assertIsNone(claim_job())
+
+    def test_run_job(self):
+        """Выполненная задача сохраняет расстановку мебели в комнате."""
+        job = models.LayoutJob.objects.create(
+            room=self.room, furniture_ids=[self.furniture.pk],
+        )
+        run_job(claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, models.LayoutJob.DONE)
+        self.assertIsNotNone(job.finished)
+        self.assertEqual(self.room.furnitureplacements.count(), 1)
+        self.room.refresh_from_db()
+        restored = Core()
+        load_state(restored, bytes(self.room.layout_state))
+        self.assertEqual(
+            restored.walls_length, (3000, 4000, 3000, 4000),
+        )
+
+    def test_slow_job_is_not_reclaimed(self):
+        """Задача с недавним сигналом процесса не берется повторно."""
+        job = models.LayoutJob.objects.create(
+            room=self.room, furniture_ids=[self.furniture.pk],
+        )
+        self.assertEqual(claim_job().attempt, 1)
+        models.LayoutJob.objects.filter(pk=job.pk).update(
+            started=timezone.now() - timedelta(days=1),
+        )
+        self.assertIsNone(claim_job())
+        models.LayoutJob.objects.filter(pk=job.pk).update(
+            heartbeat=timezone.now() - timedelta(days=1),
+        )
+        self.assertEqual(claim_job().attempt, 2)
+
+    @override_settings(LAYOUT_JOB_MAX_ATTEMPTS=2)
+    def test_crashing_job_fails_after_max_attempts(self):
+        """Задача, процесс которой все время падает, не берется вечно."""
+        job = models.LayoutJob.objects.create(
+            room=self.room, furniture_ids=[self.furniture.pk],
+        )
+        stale = {"heartbeat": timezone.now() - timedelta(days=1)}
+        self.assertEqual(claim_job().attempt, 1)
+        models.LayoutJob.objects.filter(pk=job.pk).update(**stale)
+        self.assertEqual(claim_job().attempt, 2)
+        models.LayoutJob.objects.filter(pk=job.pk).update(**stale)
+        following = models.LayoutJob.objects.create(
+            room=self.room, furniture_ids=[self.furniture.pk],
+        )
+        self.assertEqual(claim_job(), following)
+        job.refresh_from_db()
+        self.assertEqual(job.status, models.LayoutJob.FAILED)
+        self.assertEqual(job.attempt, 2)
+        self.assertIsNotNone(job.finished)
+        self.assertIn("detail", job.error)
+
+    def test_worker_survives_database_error(self):
+        """Ошибка базы при взятии задачи не останавливает процесс."""
+        job = models.LayoutJob.objects.create(
+            room=self.room, furniture_ids=[self.furniture.pk],
+        )
+        claimed = claim_job()
+        module = "furniture.services.layout_jobs"
+        with (
+            mock.patch(
+                f"{module}.claim_job",
+                side_effect=[DatabaseError("connection lost"), claimed],
+            ),
+            mock.patch(f"{module}.connection"),
+            mock.patch(f"{module}.time.sleep") as sleep,
+            self.assertLogs(module, "ERROR"),
+        ):
+            run_worker(poll_interval=5, max_jobs=1)
+        sleep.assert_called_once_with(5)
+        job.refresh_from_db()
+        self.assertEqual(job.status, models.LayoutJob.DONE)
+
+    def test_reclaimed_job_is_not_committed(self):
+        """Процесс, у которого задачу забрали, не сохраняет расстановку."""
+        job = models.LayoutJob.objects.create(
+            room=self.room, furniture_ids=[self.furniture.pk],
+        )
+        claimed = claim_job()
+        # задачу взял другой процесс
+        models.LayoutJob.objects.filter(pk=job.pk).update(attempt=F("attempt") + 1)
+        run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, models.LayoutJob.RUNNING)
+        self.assertIsNone(job.finished)
+        self.assertEqual(self.room.furnitureplacements.count(), 0)
+
+    def test_failed_job(self):
+        """Если мебель не помещается, задача завершается с ошибкой."""
+        self.furniture.length_access = 20000
+        self.furniture.save()
+        job = models.LayoutJob.objects.create(
+            room=self.room, furniture_ids=[self.furniture.pk],
+        )
+        run_job(claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, models.LayoutJob.FAILED)
+        self.assertIn("selected_furniture", job.error)
+        self.assertEqual(self.room.furnitureplacements.count(), 0)
+
+    def test_status_endpoint(self):
+        """Состояние задачи доступно только владельцу комнаты."""
+        job = models.LayoutJob.objects.create(
+            room=self.room, furniture_ids=[self.furniture.pk],
+        )
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(f"/api/v1/rooms/jobs/{job.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], models.LayoutJob.PENDING)
+
+        other = User.objects.create_user(email="other@example.com", password="password")
+        client.force_authenticate(other)
+        response = client.get(f"/api/v1/rooms/jobs/{job.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RunLayoutWorkersTest(SimpleTestCase):
+    def test_workers_are_not_daemons(self):
+        """Воркеры могут запускать пул вариантов, поэтому они не демоны."""
+        module = "furniture.management.commands.run_layout_workers"
+        with (
+            mock.patch(f"{module}.multiprocessing.Process") as process,
+            mock.patch(f"{module}.signal.signal"),
+            mock.patch(f"{module}.connections"),
+        ):
+            call_command("run_layout_workers", workers=2)
+        self.assertEqual(process.call_count, 2)
+        for call in process.call_args_list:
+            self.assertFalse(call.kwargs.get("daemon", False))
+        self.assertEqual(process.return_value.start.call_count, 2)
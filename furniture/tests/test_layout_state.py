@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from furniture import models
+from furniture.services.room_layout_service import arrange_room, room_corners
+from furniture.tests.base import BaseSetup, create_furniture
+from layout_algorithm.core import Core
+from layout_algorithm.main_functions import FurnitureArrangement
+from layout_algorithm.snapshot import load_state
+
+
+@override_settings(LAYOUT_RESULT_CACHE_SIZE=0, LAYOUT_VARIANTS_COUNT=1)
+class LayoutStateTest(BaseSetup):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        room_type = models.RoomType.objects.create(name="Спальня")
+        cls.furniture = create_furniture("Шкаф", 1200, 600, room_type)
+
+    def arrange(self):
+        self.room.refresh_from_db()
+        return arrange_room(
+            self.room,
+            room_corners(self.room.doorplacements),
+            [self.furniture],
+            room_corners(self.room.furnitureplacements),
+        )
+
+    def test_state_is_reused(self):
+        """Повторный расчет берет двери и окна из сохраненного снимка."""
+        self.arrange()
+        self.room.refresh_from_db()
+        self.assertIsNotNone(self.room.layout_state)
+        with mock.patch.object(
+            FurnitureArrangement,
+            "data_preprocessing",
+            side_effect=AssertionError("комната подготовлена заново"),
+        ):
+            result = self.arrange()
+        self.assertEqual(len(result.placements), 1)
+        self.assertEqual(self.room.furnitureplacements.count(), 2)
+
+    def test_door_change_resets_state(self):
+        """Изменение двери сбрасывает снимок комнаты."""
+        self.arrange()
+        self.door.width = 900
+        self.door.save()
+        self.room.refresh_from_db()
+        self.assertIsNone(self.room.layout_state)
+
+    def test_state_for_other_walls_is_rebuilt(self):
+        """Снимок комнаты с другими длинами стен строится заново."""
+        self.arrange()
+        models.RoomLayout.objects.filter(pk=self.room.pk).update(
+            first_wall=3500, third_wall=3500,
+        )
+        self.arrange()
+        self.room.refresh_from_db()
+        restored = Core()
+        load_state(restored, bytes(self.room.layout_state))
+        self.assertEqual(restored.walls_length, (3500, 4000, 3500, 4000))
+
+    def test_copy_keeps_state(self):
+        """Копия комнаты получает снимок вместе с дверями и окнами."""
+        self.arrange()
+        self.room.refresh_from_db()
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(f"/api/v1/rooms/copy/{self.room.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        copy = models.RoomLayout.objects.get(pk=response.data["id"])
+        self.assertEqual(copy.doorplacements.count(), 1)
+        self.assertEqual(copy.furnitureplacements.count(), 1)
+        self.assertEqual(len(response.data["furniture_placement"]), 1)
+        self.assertNotEqual(
+            copy.doorplacements.get().north_west_id, self.door.north_west_id,
+        )
+        self.assertEqual(
+            bytes(copy.layout_state), bytes(self.room.layout_state),
+        )
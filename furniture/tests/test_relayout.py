@@ -0,0 +1,119 @@
+import datetime
+
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from furniture import models
+from furniture.services.room_layout_service import arrange_room, room_corners
+from furniture.tests.base import TariffSetup, create_furniture
+from tariff.models import UsersTariffs
+
+
+@override_settings(LAYOUT_RESULT_CACHE_SIZE=0, LAYOUT_VARIANTS_COUNT=1)
+class RelayoutTest(TariffSetup):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        room_type = models.RoomType.objects.create(name="Спальня")
+        cls.wardrobe = create_furniture("Шкаф", 1200, 600, room_type)
+        cls.table = create_furniture("Стол", 800, 800, room_type)
+        cls.chair = create_furniture("Стул", 500, 500, room_type)
+        cls.huge = create_furniture("Диван", 5000, 600, room_type)
+        cls.url = f"/api/v1/rooms/{cls.room.pk}/relayout/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        arrange_room(
+            self.room,
+            room_corners(self.room.doorplacements),
+            [self.wardrobe, self.table],
+        )
+        self.placements = {
+            placement.furniture_id: placement
+            for placement in self.room.furnitureplacements.all()
+        }
+
+    @staticmethod
+    def corners(placement_id):
+        return room_corners(
+            models.FurniturePlacement.objects.filter(pk=placement_id),
+        )
+
+    def test_add_and_remove(self):
+        """Удаленная мебель убирается, оставшаяся не переставляется."""
+        table = self.placements[self.table.pk]
+        before = self.corners(table.pk)
+        response = self.client.post(
+            self.url,
+            {
+                "add": [self.chair.pk],
+                "remove": [self.placements[self.wardrobe.pk].pk],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        placements = response.data["furniture_placement"]
+        self.assertEqual(
+            sorted(placement["furniture"] for placement in placements),
+            sorted((self.table.pk, self.chair.pk)),
+        )
+        self.assertIn(table.pk, [placement["id"] for placement in placements])
+        self.assertEqual(self.corners(table.pk), before)
+
+    def test_remove_only(self):
+        response = self.client.post(
+            self.url,
+            {"remove": [self.placements[self.table.pk].pk]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [
+                placement["furniture"]
+                for placement in response.data["furniture_placement"]
+            ],
+            [self.wardrobe.pk],
+        )
+
+    def test_unknown_placement(self):
+        response = self.client.post(
+            self.url, {"remove": [10 ** 6]}, format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("remove", response.data)
+
+    def test_empty_change(self):
+        response = self.client.post(self.url, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_failed_add_keeps_removed(self):
+        """Если новая мебель не помещается, удаление отменяется."""
+        response = self.client.post(
+            self.url,
+            {
+                "add": [self.huge.pk],
+                "remove": [self.placements[self.table.pk].pk],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("selected_furniture", response.data)
+        self.assertEqual(self.room.furnitureplacements.count(), 2)
+
+    def test_outdated_tariff(self):
+        """С просроченным тарифом комнату изменить нельзя."""
+        UsersTariffs.objects.filter(pk=self.user_tariff.pk).update(
+            start_date=self.user_tariff.start_date - datetime.timedelta(
+                days=366,
+            ),
+        )
+        self.user.refresh_from_db()
+        response = self.client.post(
+            self.url,
+            {"remove": [self.placements[self.table.pk].pk]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.room.furnitureplacements.count(), 2)
@@ -0,0 +1,65 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from furniture.services.render_cache import RenderCache
+from furniture.services.room_image_service import layout_image_key
+
+
+class RenderCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = RenderCache(self.directory.name, max_bytes=25, memory_items=2)
+
+    def test_render_once(self):
+        """Повторный запрос изображения не вызывает рисование."""
+        render = mock.Mock(return_value=b"image")
+        self.assertEqual(self.cache.get_or_render("ab12", "png", render), b"image")
+        self.assertEqual(self.cache.get_or_render("ab12", "png", render), b"image")
+        render.assert_called_once()
+        self.assertTrue(os.path.exists(self.cache.path("ab12", "png")))
+
+    def test_disk_survives_memory_eviction(self):
+        """Вытесненное из памяти изображение читается с диска."""
+        for key in ("aa", "bb", "cc"):
+            self.cache.set(key, "png", key.encode())
+        self.assertNotIn("aa.png", self.cache._memory)
+        self.assertEqual(self.cache.get("aa", "png"), b"aa")
+
+    def test_disk_lru_eviction(self):
+        """При переполнении диска удаляются давно не использованные файлы."""
+        for number, key in enumerate(("aa", "bb", "cc")):
+            self.cache.set(key, "png", b"x" * 10)
+            os.utime(self.cache.path(key, "png"), (number, number))
+        self.assertFalse(os.path.exists(self.cache.path("aa", "png")))
+        self.assertTrue(os.path.exists(self.cache.path("cc", "png")))
+
+    def test_disk_limit_is_shared(self):
+        """Файлы других процессов учитываются в размере директории."""
+        other = RenderCache(self.directory.name, max_bytes=25, memory_items=2)
+        for number, (cache, key) in enumerate(
+            ((self.cache, "aa"), (other, "bb"), (self.cache, "cc")),
+        ):
+            cache.set(key, "png", b"x" * 10)
+            os.utime(cache.path(key, "png"), (number, number))
+        self.assertFalse(os.path.exists(self.cache.path("aa", "png")))
+        self.assertTrue(os.path.exists(self.cache.path("cc", "png")))
+
+
+class LayoutImageKeyTest(SimpleTestCase):
+    def test_key_ignores_object_order(self):
+        """Ключ зависит от геометрии, а не от порядка объектов."""
+        first = {"north_west": {"x": 0, "y": 1}}
+        second = {"north_west": {"x": 2, "y": 3}}
+        borders = {"north_east": {"x": 10, "y": 10}}
+        self.assertEqual(
+            layout_image_key([first, second], borders, [], "png", 100),
+            layout_image_key([second, first], borders, [], "png", 100),
+        )
+        self.assertNotEqual(
+            layout_image_key([first], borders, [], "png", 100),
+            layout_image_key([first], borders, [], "webp", 100),
+        )
@@ -0,0 +1,153 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from furniture import models
+from furniture.tests.base import TariffSetup, create_furniture
+from tariff.models import UsersTariffs
+
+User = get_user_model()
+
+
+def candidate(x0, y0, x1, y1):
+    return {
+        "north_west": {"x": x0, "y": y0},
+        "north_east": {"x": x1, "y": y0},
+        "south_west": {"x": x0, "y": y1},
+        "south_east": {"x": x1, "y": y1},
+    }
+
+
+class RoomCollisionsTest(TariffSetup):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = f"/api/v1/rooms/{cls.room.pk}/collisions/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_collision_matrix(self):
+        """Кандидаты проверяются с дверью, стенами и друг с другом."""
+        response = self.client.post(
+            self.url,
+            {
+                "candidates": [
+                    candidate(500, 500, 1500, 1500),
+                    candidate(2000, 0, 3000, 600),
+                    candidate(2500, 400, 3500, 900),
+                    candidate(-100, 2000, 500, 2600),
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["objects"], [{"type": "door", "id": self.door.pk}],
+        )
+        self.assertEqual(
+            response.data["collisions"], [[True], [False], [False], [False]],
+        )
+        self.assertEqual(
+            response.data["candidates"],
+            [
+                [False, False, False, False],
+                [False, False, True, False],
+                [False, True, False, False],
+                [False, False, False, False],
+            ],
+        )
+        self.assertEqual(
+            response.data["inside_room"], [True, True, True, False],
+        )
+        self.assertEqual(response.data["free"], [False, True, True, False])
+
+    def test_together(self):
+        """Кандидаты, которые ставятся одновременно, не должны пересекаться."""
+        response = self.client.post(
+            self.url,
+            {
+                "candidates": [
+                    candidate(2000, 0, 3000, 600),
+                    candidate(2500, 400, 3500, 900),
+                ],
+                "together": True,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["free"], [False, False])
+
+    def test_exclude_dragged_furniture(self):
+        """Перетаскиваемая мебель не пересекается со своим размещением."""
+        corners = {
+            corner: models.Coordinate.objects.create(x=x, y=y)
+            for corner, (x, y) in {
+                "north_west": (2000, 3000),
+                "north_east": (3000, 3000),
+                "south_west": (2000, 2400),
+                "south_east": (3000, 2400),
+            }.items()
+        }
+        room_type = models.RoomType.objects.create(name="Гостиная")
+        furniture = create_furniture("Шкаф", 1000, 600, room_type)
+        placement = models.FurniturePlacement.objects.create(
+            room=self.room, furniture=furniture, **corners,
+        )
+        data = {"candidates": [candidate(2100, 2300, 3100, 2900)]}
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.data["free"], [False])
+
+        response = self.client.post(
+            self.url, {**data, "exclude": [placement.pk]}, format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["objects"], [{"type": "door", "id": self.door.pk}],
+        )
+        self.assertEqual(response.data["free"], [True])
+
+    def test_invalid_candidates(self):
+        """Пустая пачка и пачка без координат отклоняются."""
+        for data in (
+            {"candidates": []},
+            {"candidates": [{"north_west": {"x": 0, "y": 0}}]},
+        ):
+            with self.subTest(data=data):
+                response = self.client.post(self.url, data, format="json")
+                self.assertEqual(
+                    response.status_code, status.HTTP_400_BAD_REQUEST,
+                )
+
+    def test_other_user_room(self):
+        """Чужую комнату проверить нельзя."""
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="password",
+        )
+        UsersTariffs.objects.create(user=other, tariff=self.tariff)
+        self.client.force_authenticate(other)
+        response = self.client.post(
+            self.url,
+            {"candidates": [candidate(0, 0, 100, 100)]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_outdated_tariff(self):
+        """С просроченным тарифом кандидаты не проверяются."""
+        UsersTariffs.objects.filter(pk=self.user_tariff.pk).update(
+            start_date=self.user_tariff.start_date - datetime.timedelta(
+                days=366,
+            ),
+        )
+        self.user.refresh_from_db()
+        response = self.client.post(
+            self.url,
+            {"candidates": [candidate(0, 0, 100, 100)]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,40 @@
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.test import override_settings
+from PIL import Image
+
+from furniture.services.render_cache import RenderCache
+from furniture.services.room_image_service import RoomImage, render_room_image
+from furniture.tests.base import BaseSetup
+
+
+@override_settings(LAYOUT_IMAGE_MAX_SIDE=500)
+class RenderRoomImageTest(BaseSetup):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch(
+            "furniture.services.room_image_service.get_render_cache",
+            return_value=RenderCache(directory.name, 10 ** 6, 4),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_render_from_database(self):
+        """Изображение строится по сохраненным объектам комнаты."""
+        with self.assertNumQueries(4):
+            content = render_room_image(self.room, "webp")
+        image = Image.open(BytesIO(content))
+        self.assertEqual(image.format, "WEBP")
+        self.assertEqual(max(image.size), 500)
+
+    def test_cached_render(self):
+        """Повторное изображение той же планировки берется из кэша."""
+        first = RoomImage(self.room)
+        second = RoomImage(self.room)
+        self.assertEqual(first.etag, second.etag)
+        with mock.patch.object(RoomImage, "render", return_value=b"") as render:
+            self.assertEqual(first.content, second.content)
+        render.assert_called_once()
@@ -1,6 +1,9 @@
+from django.http import HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404
+from django.utils.cache import parse_etags
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -9,10 +12,19 @@ from rest_framework.views import APIView
 from api.permissions import IsTariffAccepted
 from furniture.filters import FurnitureFilter
 from furniture.models import (DoorPlacement, Furniture, FurniturePlacement,
-                              PowerSocketPlacement, RoomLayout,
+                              LayoutJob, PowerSocketPlacement, RoomLayout,
                               WindowPlacement)
-from furniture.serializers import FurnitureSerializer, RoomLayoutSerializer
+from furniture.serializers import (FurnitureSerializer, LayoutJobSerializer,
+                                   PlacedFurnitureSerializer,
+                                   RoomCollisionsSerializer,
+                                   RoomLayoutCopySerializer,
+                                   RoomLayoutSerializer,
+                                   RoomRelayoutSerializer)
+from furniture.services.room_collisions import room_collisions
+from furniture.services.room_image_service import CORNERS, RoomImage
+from furniture.services.room_layout_service import relayout_room
 from furniture.utils import send_pdf_file
+from layout_algorithm.create_picture import IMAGE_FORMATS
 
 
 class FurnitureViewSet(viewsets.ReadOnlyModelViewSet):
@@ -37,11 +49,116 @@ class RoomViewSet(viewsets.ModelViewSet):
             return self.request.user.rooms.all()
         return RoomLayout.objects.none()
 
+    def create(self, request, *args, **kwargs):
+        """Создание планировки.
+
+        Если расстановка мебели поставлена в очередь, возвращается 202 и
+        задача, состояние которой можно узнать по /rooms/jobs/<id>/.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        job = getattr(serializer.instance, "layout_job", None)
+        if job is None:
+            return Response(
+                serializer.data,
+                status=status.HTTP_201_CREATED,
+                headers=self.get_success_headers(serializer.data),
+            )
+        return Response(
+            LayoutJobSerializer(job).data, status=status.HTTP_202_ACCEPTED,
+        )
+
     def perform_create(self, serializer):
         """Назначение данных для обработки запроса."""
         user = self.request.user
         serializer.save(user=user)
 
+    @action(detail=True, methods=["get"])
+    def image(self, request, pk=None):
+        """Изображение планировки в формате PNG или WebP.
+
+        Формат задается параметром `image_format`, по умолчанию PNG. ETag
+        изображения - хэш геометрии планировки, поэтому при совпадении
+        If-None-Match изображение не рисуется и не передается повторно.
+        """
+        image_format = request.query_params.get("image_format", "png")
+        if image_format not in IMAGE_FORMATS:
+            return Response(
+                {"image_format": [f"Доступные форматы: {', '.join(IMAGE_FORMATS)}"]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        image = RoomImage(self.get_object(), image_format)
+        if image.etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                image.content, content_type=f"image/{image_format}",
+            )
+        response["ETag"] = image.etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    @action(detail=True, methods=["post"])
+    def collisions(self, request, pk=None):
+        """Проверка пачки кандидатов при перетаскивании мебели.
+
+        Кандидаты сравниваются с мебелью, дверями и окнами комнаты, со
+        стенами и друг с другом за один запрос. Строки матриц соответствуют
+        кандидатам, столбцы `collisions` - объектам из `objects`.
+        Размещения мебели из `exclude` (например, перетаскиваемой) не
+        учитываются. Пересечения кандидатов между собой влияют на `free`,
+        только если передан `together`.
+        """
+        serializer = RoomCollisionsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            room_collisions(
+                self.get_object(),
+                serializer.validated_data["candidates"],
+                serializer.validated_data.get("exclude", []),
+                serializer.validated_data["together"],
+            ),
+        )
+
+    @action(detail=True, methods=["post"])
+    def relayout(self, request, pk=None):
+        """Добавление и удаление мебели без перестановки оставшейся.
+
+        Размещения мебели из `remove` удаляются, мебель из `add`
+        расставляется вокруг оставшейся. В ответе - все размещения мебели
+        комнаты с их идентификаторами.
+        """
+        room = self.get_object()
+        serializer = RoomRelayoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        relayout_room(
+            room,
+            serializer.validated_data.get("add", []),
+            serializer.validated_data.get("remove", []),
+        )
+        placements = room.furnitureplacements.select_related(*CORNERS)
+        return Response(
+            {
+                "furniture_placement": PlacedFurnitureSerializer(
+                    placements, many=True,
+                ).data,
+            },
+        )
+
+
+class LayoutJobView(APIView):
+    """Состояние задачи расстановки мебели."""
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, pk):
+        """Получаем задачу с заданным `pk` для комнаты пользователя."""
+        job = get_object_or_404(
+            LayoutJob, pk=pk, room__user=request.user,
+        )
+        return Response(LayoutJobSerializer(job).data)
+
 
 class RoomCopyView(APIView):
     """Создаем копию объекта `Room`.
@@ -51,20 +168,32 @@ class RoomCopyView(APIView):
 
     @staticmethod
     def _copy_object(
-        model: [DoorPlacement | WindowPlacement | PowerSocketPlacement],
+        model: [
+            DoorPlacement
+            | WindowPlacement
+            | PowerSocketPlacement
+            | FurniturePlacement
+        ],
         orig_room: RoomLayout,
         new_room: RoomLayout,
     ):
-        models = model.objects.filter(room=orig_room)
+        models = model.objects.filter(room=orig_room).select_related(*CORNERS)
         for model in models:
             model.pk = None
             model.room = new_room
+            # у каждого размещения свои координаты (OneToOneField)
+            for corner in CORNERS:
+                coordinate = getattr(model, corner)
+                if coordinate is not None:
+                    coordinate.pk = None
+                    coordinate.save()
+                    setattr(model, corner, coordinate)
             model.save()
 
     def get(self, request, pk):
         """Получаем планировку с заданным `pk`."""
         orig_room = get_object_or_404(RoomLayout, pk=pk)
-        serializer = RoomLayoutSerializer(orig_room)
+        serializer = RoomLayoutCopySerializer(orig_room)
         return Response(serializer.data)
 
     def post(self, request, pk):
@@ -72,32 +201,22 @@ class RoomCopyView(APIView):
         orig_room = get_object_or_404(RoomLayout, pk=pk)
         new_room = orig_room.copy(request)
         new_room.save()
-        serializer = RoomLayoutSerializer(new_room)
-        furniture = Furniture.objects.filter(room=orig_room)
-
-        for furn in furniture:
-            placement = FurniturePlacement.objects.get(
-                furniture=furn,
-                room=orig_room,
-            )
-            FurniturePlacement.objects.create(
-                room=new_room,
-                furniture=furn,
-                nw_coordinate=placement.nw_coordinate,
-                ne_coordinate=placement.ne_coordinate,
-                sw_coordinate=placement.sw_coordinate,
-                se_coordinate=placement.se_coordinate,
-            )
         [
             self._copy_object(obj, orig_room, new_room)
             for obj in [
+                FurniturePlacement,
                 DoorPlacement,
                 WindowPlacement,
                 PowerSocketPlacement,
             ]
         ]
+        # копирование дверей и окон сбрасывает снимок, а у копии они те же,
+        # что и у исходной комнаты
+        RoomLayout.objects.filter(pk=new_room.pk).update(
+            layout_state=orig_room.layout_state,
+        )
 
-        return Response(serializer.data)
+        return Response(RoomLayoutCopySerializer(new_room).data)
 
     def patch(self, request, pk):
         """Изменяем планировку с заданным `pk`."""
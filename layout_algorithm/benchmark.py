@@ -0,0 +1,317 @@
+"""Замеры скорости алгоритма расстановки на синтетических комнатах.
+
+Комнаты, двери, окна и набор мебели генерируются детерминированно по зерну,
+мебель берется из каталога `furniture/data/furniture.csv`. Для каждого
+случая замеряются время `Core.algorithm_activation`, количество проверок
+пересечений и пиковая память. Случаи, отклоненные проверкой выполнимости,
+тоже замеряются, но поиск для них не запускается и проверок пересечений
+нет. Результаты сохраняются в JSON и сравниваются с сохраненной базовой
+линией:
+
+    python -m layout_algorithm.benchmark run --output benchmark.json
+    python -m layout_algorithm.benchmark run --baseline benchmark.json
+    python -m layout_algorithm.benchmark compare base.json current.json
+"""
+
+import argparse
+import csv
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from .core import Core
+from .corner_markings import corner_markings
+from .exceptions import LayoutInfeasibleError, PlacementError
+from .perimeter import PerimeterGeometry
+
+CATALOG_PATH = (
+    Path(__file__).resolve().parent.parent / "furniture" / "data" / "furniture.csv"
+)
+# размеры комнат в мм, количество дверей и окон, количество мебели
+ROOM_SIZES = (2000, 5000, 10000, 20000, 30000)
+OPENING_COUNTS = (0, 5, 20)
+FURNITURE_COUNTS = (1, 5, 10, 20, 40)
+# допустимое ухудшение показателей относительно базовой линии
+DEFAULT_THRESHOLD = 0.25
+METRICS = ("time", "collision_checks", "sweep_comparisons", "peak_memory")
+# разница во времени меньше этой (в секундах) считается шумом измерения
+MIN_TIME_DIFFERENCE = 0.001
+
+
+def load_catalog(path=CATALOG_PATH) -> list:
+    """Мебель каталога в формате входных данных алгоритма."""
+    with open(path, encoding="utf-8") as file:
+        return [
+            {
+                "name": row["name"],
+                "length": int(row["length_access"]),
+                "width": int(row["width_access"]),
+                "first_power_socket_width": int(row["first_power_socket_width"]),
+                "second_power_socket_width": int(row["second_power_socket_width"]),
+            }
+            for row in csv.DictReader(file)
+        ]
+
+
+def generate_openings(
+    generator: random.Random, room_size: dict, count: int,
+) -> list:
+    """Двери и окна у стен, не пересекающиеся между собой и с углами.
+
+    Периметр делится на count равных участков, в каждом участке не больше
+    одного проема. Проем, который не помещается на одну стену участка с
+    отступом от углов, пропускается.
+    """
+    walls_length = tuple(room_size.values())
+    geometry = PerimeterGeometry.for_walls(walls_length)
+    depth_limit = min(walls_length) / 4
+    openings = []
+    slot = geometry.perimeter / max(count, 1)
+    for number in range(count):
+        width = generator.uniform(0.2, 0.5) * slot
+        center = number * slot + generator.uniform(width / 2, slot - width / 2)
+        wall = geometry.wall_of(center)
+        # отступ от углов не меньше глубины проема, чтобы проемы соседних
+        # стен не пересекались
+        wall_start = geometry.prefix[wall - 1] + depth_limit
+        wall_end = geometry.prefix[wall] - depth_limit
+        if center - width / 2 < wall_start or center + width / 2 > wall_end:
+            continue
+        figure = corner_markings(
+            {"length": generator.uniform(0.1, 1) * depth_limit, "width": width},
+            geometry.to_point(center),
+            wall,
+        )
+        openings.append(figure.to_dict())
+    return openings
+
+
+def generate_case(
+    seed: int, room_side: int, openings: int, items: int, catalog: list,
+) -> dict:
+    """Синтетическая комната с заданными размерами и количеством объектов."""
+    generator = random.Random(seed)
+    second_side = round(room_side * generator.uniform(0.6, 1))
+    room_size = {
+        "first_wall": second_side,
+        "second_wall": room_side,
+        "third_wall": second_side,
+        "fourth_wall": room_side,
+    }
+    return {
+        "name": f"room{room_side}_openings{openings}_items{items}",
+        "room_size": room_size,
+        "doors_and_windows": generate_openings(generator, room_size, openings),
+        "furniture": [dict(generator.choice(catalog)) for _ in range(items)],
+    }
+
+
+def generate_cases(seed: int = 0, catalog: list = None) -> list:
+    """Все случаи сетки размеров комнат, проемов и мебели."""
+    catalog = load_catalog() if catalog is None else catalog
+    cases = []
+    for room_side in ROOM_SIZES:
+        for openings in OPENING_COUNTS:
+            for items in FURNITURE_COUNTS:
+                cases.append(
+                    generate_case(
+                        seed + len(cases), room_side, openings, items, catalog,
+                    ),
+                )
+    return cases
+
+
+def run_case(
+    case: dict,
+    placement_mode: str = "sweep",
+    ordering: str = "given",
+    backtrack_depth: int = 0,
+):
+    """Один запуск алгоритма.
+
+    Returns:
+        tuple: расстановка, текст ошибки (None - без ошибки) и признак того,
+        что мебель отклонена проверкой выполнимости до поиска
+    """
+    arrangement = Core(
+        ordering=ordering,
+        backtrack_depth=backtrack_depth,
+        placement_mode=placement_mode,
+    )
+    error, infeasible = None, False
+    try:
+        arrangement.algorithm_activation(
+            case["doors_and_windows"],
+            case["furniture"],
+            case["room_size"],
+            collect_stats=False,
+        )
+    except LayoutInfeasibleError as infeasible_error:
+        error, infeasible = str(infeasible_error), True
+    except PlacementError as placement_error:
+        error = str(placement_error)
+    return arrangement, error, infeasible
+
+
+def measure_case(
+    case: dict,
+    repeats: int = 3,
+    placement_mode: str = "sweep",
+    ordering: str = "given",
+    backtrack_depth: int = 0,
+) -> dict:
+    """Замеры одного случая: лучшее время из repeats запусков.
+
+    Пиковая память замеряется отдельным запуском, так как tracemalloc
+    замедляет выполнение.
+    """
+    options = (placement_mode, ordering, backtrack_depth)
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        arrangement, error, infeasible = run_case(case, *options)
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        run_case(case, *options)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "name": case["name"],
+        "room_size": case["room_size"],
+        "openings": len(case["doors_and_windows"]),
+        "items": len(case["furniture"]),
+        "placed": len(arrangement.placed),
+        "error": error,
+        "infeasible": infeasible,
+        "time": min(timings),
+        # отклоненный случай не доходит до подготовки комнаты
+        "collision_checks": 0 if infeasible else arrangement.collision.checks,
+        # сравнения объектов при поиске свободных интервалов в режиме "sweep"
+        "sweep_comparisons": arrangement.sweep_comparisons,
+        "peak_memory": peak_memory,
+    }
+
+
+def run_benchmark(
+    seed: int = 0,
+    repeats: int = 3,
+    cases: list = None,
+    placement_mode: str = "sweep",
+    ordering: str = "given",
+    backtrack_depth: int = 0,
+) -> dict:
+    """Замеры всех случаев с описанием окружения."""
+    cases = generate_cases(seed) if cases is None else cases
+    return {
+        "meta": {
+            "seed": seed,
+            "repeats": repeats,
+            "placement_mode": placement_mode,
+            "ordering": ordering,
+            "backtrack_depth": backtrack_depth,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+        },
+        "cases": [
+            measure_case(
+                case, repeats, placement_mode, ordering, backtrack_depth,
+            )
+            for case in cases
+        ],
+    }
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD,
+) -> list:
+    """Показатели, ухудшившиеся больше чем на threshold.
+
+    Returns:
+        list: строки с описанием регрессий, пустой список - регрессий нет
+    """
+    baseline_cases = {case["name"]: case for case in baseline["cases"]}
+    regressions = []
+    for case in current["cases"]:
+        base = baseline_cases.get(case["name"])
+        if base is None:
+            continue
+        if case["placed"] < base["placed"]:
+            regressions.append(
+                f"{case['name']}: placed {base['placed']} -> {case['placed']}",
+            )
+        for metric in METRICS:
+            # базовая линия могла быть записана до появления показателя
+            if metric not in base:
+                continue
+            if (
+                metric == "time"
+                and case[metric] - base[metric] < MIN_TIME_DIFFERENCE
+            ):
+                continue
+            if base[metric] and case[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f"{case['name']}: {metric} {base[metric]} -> "
+                    f"{case[metric]} (+{case[metric] / base[metric] - 1:.0%})",
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="замерить алгоритм")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--repeats", type=int, default=3)
+    run.add_argument("--output", help="файл для результатов в JSON")
+    run.add_argument("--baseline", help="сравнить с базовой линией")
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    run.add_argument(
+        "--placement-mode",
+        choices=Core.PLACEMENT_MODES,
+        default="sweep",
+    )
+    run.add_argument("--ordering", choices=Core.ORDERINGS, default="given")
+    run.add_argument("--backtrack-depth", type=int, default=0)
+    check = commands.add_parser("compare", help="сравнить два файла замеров")
+    check.add_argument("baseline")
+    check.add_argument("current")
+    check.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    options = parser.parse_args(argv)
+
+    baseline = None
+    if options.baseline:
+        baseline = json.loads(Path(options.baseline).read_text(encoding="utf-8"))
+    if options.command == "run":
+        current = run_benchmark(
+            options.seed,
+            options.repeats,
+            placement_mode=options.placement_mode,
+            ordering=options.ordering,
+            backtrack_depth=options.backtrack_depth,
+        )
+        text = json.dumps(current, ensure_ascii=False, indent=2)
+        if options.output:
+            Path(options.output).write_text(text, encoding="utf-8")
+        else:
+            print(text)
+        if baseline is None:
+            return 0
+    else:
+        current = json.loads(Path(options.current).read_text(encoding="utf-8"))
+
+    regressions = compare(baseline, current, options.threshold)
+    for line in regressions:
+        print(line, file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Ограничение времени и количества итераций алгоритма расстановки."""
+
+import threading
+import time
+
+from .exceptions import BudgetExhausted
+
+# время и флаг отмены проверяются раз в столько итераций, чтобы проверка во
+# внутреннем цикле сводилась к увеличению счетчика
+CHECK_EVERY = 64
+
+
+class LayoutBudget:
+    """Бюджет одного запуска алгоритма.
+
+    Внутренние циклы вызывают `tick` на каждой итерации. Когда истекает срок,
+    заканчиваются итерации или бюджет отменен через `cancel`, `tick`
+    выбрасывает `BudgetExhausted`.
+
+    Args:
+        time_limit: ограничение времени в секундах (None - без ограничения)
+        max_iterations: ограничение количества итераций
+        cancel_event: флаг отмены с методом is_set, например
+            `threading.Event` или `multiprocessing.Event`
+        clock: часы для срока, по умолчанию `time.monotonic`; с
+            `time.process_time` срок считается по процессорному времени
+    """
+
+    __slots__ = (
+        "deadline", "max_iterations", "iterations", "cancel_event", "clock",
+    )
+
+    def __init__(
+        self,
+        time_limit: float = None,
+        max_iterations: int = None,
+        cancel_event=None,
+        clock=None,
+    ):
+        self.clock = clock
+        self.deadline = (
+            None if time_limit is None else self.now() + time_limit
+        )
+        self.max_iterations = max_iterations
+        self.iterations = 0
+        self.cancel_event = (
+            threading.Event() if cancel_event is None else cancel_event
+        )
+
+    def now(self) -> float:
+        """Текущее время по часам бюджета."""
+        return time.monotonic() if self.clock is None else self.clock()
+
+    def cancel(self):
+        """Отменяет расчет, использующий этот бюджет."""
+        self.cancel_event.set()
+
+    def tick(self, count: int = 1):
+        """Учитывает count итераций и проверяет бюджет."""
+        previous = self.iterations
+        self.iterations += count
+        if (
+            self.max_iterations is not None
+            and self.iterations > self.max_iterations
+        ):
+            raise BudgetExhausted("iterations")
+        if previous // CHECK_EVERY != self.iterations // CHECK_EVERY:
+            self.check()
+
+    def check(self):
+        """Проверяет срок и флаг отмены."""
+        if self.cancel_event.is_set():
+            raise BudgetExhausted("cancelled")
+        if self.deadline is not None and self.now() >= self.deadline:
+            raise BudgetExhausted("deadline")
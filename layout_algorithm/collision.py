@@ -0,0 +1,140 @@
+"""Векторизованная проверка пересечений объектов в комнате."""
+
+import numpy as np
+
+from .geometry import Rect
+
+
+def figure_to_box(figure: dict) -> tuple:
+    """Преобразует словарь углов объекта в ограничивающий прямоугольник.
+
+    Args:
+        figure: координаты углов объекта
+            {"north_west": {"x": 0, "y": 0}, ...}
+
+    Returns:
+        tuple: (x0, y0, x1, y1), где x0 <= x1 и y0 <= y1
+    """
+    return Rect.from_dict(figure).as_tuple()
+
+
+def figures_to_boxes(figures) -> np.ndarray:
+    """Преобразует список объектов в массив формы (K, 4)."""
+    boxes = np.empty((len(figures), 4), dtype=np.float64)
+    for index, figure in enumerate(figures):
+        boxes[index] = figure_to_box(figure)
+    return boxes
+
+
+def overlap_matrix(candidates: np.ndarray, placed: np.ndarray) -> np.ndarray:
+    """Матрица пересечений кандидатов с размещенными объектами.
+
+    Объекты пересекаются, если площадь их общей части больше нуля, то есть
+    касание сторонами пересечением не считается.
+
+    Args:
+        candidates: массив формы (K, 4) со строками (x0, y0, x1, y1)
+        placed: массив формы (N, 4) со строками (x0, y0, x1, y1)
+
+    Returns:
+        np.ndarray: булева матрица (K, N), True - объекты пересекаются
+    """
+    candidates = candidates[:, np.newaxis, :]
+    placed = placed[np.newaxis, :, :]
+    return (
+        (candidates[..., 0] < placed[..., 2])
+        & (placed[..., 0] < candidates[..., 2])
+        & (candidates[..., 1] < placed[..., 3])
+        & (placed[..., 1] < candidates[..., 3])
+    )
+
+
+def inside_room(candidates: np.ndarray, walls: dict) -> np.ndarray:
+    """Проверяет, что кандидаты не выходят за пределы комнаты.
+
+    Args:
+        candidates: массив формы (K, 4) со строками (x0, y0, x1, y1)
+        walls: стены комнаты {"first_wall": 0, "second_wall": 0, ...}
+
+    Returns:
+        np.ndarray: булев массив (K,), True - объект внутри комнаты
+    """
+    return (
+        (candidates[:, 0] >= 0)
+        & (candidates[:, 1] >= 0)
+        & (candidates[:, 2] <= walls["second_wall"])
+        & (candidates[:, 3] <= walls["first_wall"])
+    )
+
+
+class CollisionEngine:
+    """Хранилище всех размещенных в комнате прямоугольников.
+
+    Двери, окна и уже расставленная мебель хранятся одним массивом NumPy,
+    поэтому кандидат (или сразу пачка кандидатов) проверяется против всех
+    объектов комнаты за один векторизованный вызов.
+    """
+
+    def __init__(self, walls: dict, capacity: int = 16):
+        self.walls = walls
+        self._boxes = np.empty((capacity, 4), dtype=np.float64)
+        self._size = 0
+        # количество проверок пар "кандидат - объект комнаты"
+        self.checks = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def boxes(self) -> np.ndarray:
+        """Размещенные прямоугольники в виде массива формы (N, 4)."""
+        return self._boxes[:self._size]
+
+    def add(self, figure: Rect) -> int:
+        """Добавляет объект в комнату и возвращает его индекс."""
+        if self._size == len(self._boxes):
+            grown = np.empty((len(self._boxes) * 2, 4), dtype=np.float64)
+            grown[:self._size] = self.boxes
+            self._boxes = grown
+        self._boxes[self._size] = figure.as_tuple()
+        self._size += 1
+        return self._size - 1
+
+    def extend(self, boxes: np.ndarray):
+        """Добавляет объекты массивом формы (K, 4) со строками (x0, y0, x1, y1).
+
+        Объекты получают индексы по порядку, как при поочередном `add`.
+        """
+        size = self._size + len(boxes)
+        if size > len(self._boxes):
+            grown = np.empty(
+                (max(size, len(self._boxes) * 2), 4), dtype=np.float64,
+            )
+            grown[:self._size] = self.boxes
+            self._boxes = grown
+        self._boxes[self._size:size] = boxes
+        self._size = size
+
+    def truncate(self, size: int):
+        """Убирает из комнаты объекты, добавленные после первых size."""
+        self._size = min(self._size, size)
+
+    def free_mask(self, candidates: np.ndarray) -> np.ndarray:
+        """Проверяет пачку кандидатов против всех объектов комнаты.
+
+        Args:
+            candidates: массив формы (K, 4) со строками (x0, y0, x1, y1)
+
+        Returns:
+            np.ndarray: булев массив (K,), True - место для кандидата свободно
+        """
+        free = inside_room(candidates, self.walls)
+        self.checks += len(candidates) * self._size
+        if self._size:
+            free &= ~overlap_matrix(candidates, self.boxes).any(axis=1)
+        return free
+
+    def is_free(self, figure: Rect) -> bool:
+        """Проверяет, что объект можно разместить в комнате."""
+        candidate = np.array([figure.as_tuple()], dtype=np.float64)
+        return bool(self.free_mask(candidate)[0])
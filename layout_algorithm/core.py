@@ -1,80 +1,307 @@
-import bisect
+import logging
+
+from .budget import LayoutBudget
 from .corner_markings import corner_markings
+from .exceptions import BudgetExhausted, PlacementError
+from .feasibility import check_feasibility
+from .instrumentation import make_stats
 from .main_functions import FurnitureArrangement
-from .create_picture import create_rectangles
 from .offset_finder_convert import MiddlePointAndShift
+from .result import LayoutResult
+from .snapshot import load_state
+
+# поля мебели с расположением розеток относительно центра примыкающей стороны
+POWER_SOCKET_FIELDS = ("first_power_socket_width", "second_power_socket_width")
+
+# стены, к которым можно привязать мебель (None - самый большой промежуток)
+WALL_CHOICES = (None, 1, 2, 3, 4)
+# ключи сортировки мебели для порядка "сначала самая большая"
+ORDERING_KEYS = {
+    "area": lambda item: item["length"] * item["width"],
+    "width": lambda item: item["width"],
+}
+
+logger = logging.getLogger(__name__)
+
+
+def power_sockets(geometry, item: dict, final_point) -> list:
+    """Розетки мебели, примыкающей к стене в точке final_point периметра.
+
+    Args:
+        geometry: `PerimeterGeometry` комнаты
+        item: размеры мебели и расположение ее розеток
+        final_point: точка на прямой периметра, в которой центр мебели
+            примыкает к стене
+
+    Returns:
+        list: координаты розеток {"x": 0, "y": 0}
+    """
+    return [
+        geometry.to_point(final_point + item[field]).to_dict()
+        for field in POWER_SOCKET_FIELDS
+        if item.get(field, 0) != 0
+    ]
+
+
+def placement_order(furniture: list, ordering: str = "given") -> list:
+    """Индексы мебели в порядке расстановки.
+
+    Args:
+        furniture: размеры мебели
+        ordering: "given" - как во входном списке, "area" - по убыванию
+            площади, "width" - по убыванию длины примыкающей к стене стороны.
+            Мебель с одинаковым ключом остается в исходном порядке.
+
+    Returns:
+        list: индексы мебели во входном списке
+    """
+    order = list(range(len(furniture)))
+    if ordering != "given":
+        key = ORDERING_KEYS[ordering]
+        order.sort(key=lambda index: key(furniture[index]), reverse=True)
+    return order
 
 
 class Core(FurnitureArrangement, MiddlePointAndShift):
-    def algorithm_activation(
-        self, doors_and_windows: list, furniture: list, room_size: dict,
+    """Расстановка списка мебели вдоль стен комнаты.
+
+    Экземпляр хранит состояние одного расчета, поэтому его нельзя
+    использовать из нескольких потоков одновременно. Для параллельных
+    расчетов используется `engine.compute_layout`, который создает
+    отдельный экземпляр на каждый вызов.
+
+    Args:
+        ordering: порядок расстановки мебели, см. `placement_order`
+        backtrack_depth: на сколько уже размещенных единиц мебели можно
+            вернуться, если очередная не помещается. При возврате мебель
+            переставляется к другой стене, предыдущие размещения
+            откатываются через `rollback` без пересчета. 0 - ошибка при
+            первой же неудаче. В режиме "step" стена не выбирается, поэтому
+            возврат не дает других вариантов и не выполняется.
+        **kwargs: параметры `FurnitureArrangement`
+    """
+
+    ORDERINGS = ("given", *ORDERING_KEYS)
+
+    def __init__(
+        self, ordering: str = "given", backtrack_depth: int = 0, **kwargs,
     ):
+        if ordering not in self.ORDERINGS:
+            raise ValueError(f"Неизвестный порядок расстановки: {ordering}")
+        super().__init__(**kwargs)
+        self.ordering = ordering
+        self.backtrack_depth = backtrack_depth
+        # количество возвратов к уже размещенной мебели за последний расчет
+        self.backtracks = 0
+
+    def algorithm_activation(
+        self,
+        doors_and_windows: list,
+        furniture: list,
+        room_size: dict,
+        budget: LayoutBudget = None,
+        collect_stats: bool = False,
+        state: bytes = None,
+    ) -> LayoutResult:
         """Основная функция алгоритма, проходящаяся по всему заданному списку
         мебели и расставляющая каждую единицу внутри помещения
 
         Args:
-            doors_and_windows:
-            furniture:
-            room_size:
+            doors_and_windows: координаты углов дверей, окон и уже
+                расставленной мебели
+            furniture: размеры мебели и расположение ее розеток
+            room_size: длины стен комнаты
+            budget: ограничение времени и итераций расчета
+            collect_stats: собирать ли замеры этапов
+            state: снимок `snapshot.dump_state` для тех же doors_and_windows
+                и room_size. Подготовка комнаты при этом пропускается, а
+                уже размещенная в снимке мебель остается на местах.
         Returns:
+            LayoutResult: расставленная мебель и розетки в виде словарей.
+            Если бюджет исчерпан, результат содержит уже расставленную
+            мебель, а остальная перечислена в `unplaced`. Входные данные не
+            изменяются, точка на прямой периметра для каждой мебели есть в
+            `placements`.
 
+        Raises:
+            LayoutInfeasibleError: мебель заведомо не помещается в комнату
+            PlacementError: не удалось найти место для мебели
         """
 
-        print(furniture)
-        self.data_preprocessing(room_size, doors_and_windows)
-        for item, item2 in enumerate(furniture):
-            result_free_space = self.free_space_algorithm(self.coordinates)
-            result_middle_distance = self.middle_point_finder(
-                result_free_space, self.wall_perimetr, self.walls_length,
-            )
-            result_wall_definition = self.wall_definition(
-                result_middle_distance,
-            )
-            result_corner_markings = corner_markings(
-                item2, result_middle_distance, result_wall_definition,
-            )
-            final_point, figure = self.placing_in_coordinates(
-                result_middle_distance,
-                result_corner_markings,
-                room_size,
-                item2,
-            )
+        logger.debug("Мебель для расстановки: %s", furniture)
+        self.budget = LayoutBudget() if budget is None else budget
+        self.stats = make_stats(collect_stats)
+        try:
+            with self.stats.stage("feasibility"):
+                check_feasibility(doors_and_windows, furniture, room_size)
+            with self.stats.stage("data_preprocessing"):
+                if state is None:
+                    self.data_preprocessing(room_size, doors_and_windows)
+                else:
+                    load_state(self, state)
+            placed = {index for index, *_ in self.placed}
+            order = [
+                index
+                for index in placement_order(furniture, self.ordering)
+                if index not in placed
+            ]
+            stopped = None
+            try:
+                self.place_in_order(order, furniture)
+            except BudgetExhausted as error:
+                stopped = error.reason
 
-            # добавляем конечные значения в соответствии их расположением по стенам
-            furniture[item]["adjacent_center_point"] = final_point
-            bisect.insort(self.sorted_points, final_point)
-            self.coordinates.insert(
-                self.sorted_points.index(final_point), figure,
-            )
+            # изображение планировки строится отдельно по запросу клиента,
+            # см. create_picture.render_layout
+            with self.stats.stage("build_result"):
+                result = self.build_result(
+                    doors_and_windows, furniture, room_size,
+                )
+        finally:
+            self.stats.log()
+        if stopped is not None:
+            result.stopped = stopped
+            placed = {index for index, *_ in self.placed}
+            result.unplaced = [index for index in order if index not in placed]
+        result.stats = self.stats.as_dict()
+        return result
+
+    def place_in_order(self, order: list, furniture: list):
+        """Размещает мебель по порядку с ограниченным возвратом.
+
+        Для каждой позиции порядка по очереди пробуются стены
+        `WALL_CHOICES` (в режиме "step" - только None, так как пошаговый
+        поиск не привязывается к стене). Если мебель не помещается ни у одной стены, последние
+        размещения откатываются и предыдущая мебель переставляется к
+        следующей стене, но не дальше backtrack_depth позиций от самой
+        дальней неудачи.
+
+        Мебель, размещенная до вызова (например, загруженная из снимка), не
+        откатывается.
+
+        Args:
+            order: индексы мебели в порядке расстановки
+            furniture: размеры мебели
+
+        Raises:
+            PlacementError: мебель не удалось разместить
+            BudgetExhausted: исчерпан бюджет расчета
+        """
+        # пошаговый поиск не привязывается к стене, и повторная расстановка
+        # дала бы то же самое место
+        depth = self.backtrack_depth if self.placement_mode == "sweep" else 0
+        walls = WALL_CHOICES if depth > 0 else (None,)
+        # размещения до вызова не откатываются
+        base = len(self.placed)
+        # номер следующей стены для каждой позиции порядка
+        choices = [0] * len(order)
+        position = deepest_failure = 0
+        failure = None
+        self.backtracks = 0
+        while position < len(order):
+            index = order[position]
+            placed = False
+            while not placed and choices[position] < len(walls):
+                wall = walls[choices[position]]
+                choices[position] += 1
+                try:
+                    self.place_furniture(index, furniture[index], wall)
+                    placed = True
+                except PlacementError as error:
+                    if failure is None or position >= deepest_failure:
+                        failure, deepest_failure = error, position
+            if placed:
+                position += 1
+                continue
+
+            choices[position] = 0
+            position -= 1
+            if position < max(deepest_failure - depth, 0):
+                raise failure
+            self.backtracks += 1
+            self.stats.count("backtracks")
+            self.budget.tick()
+            self.rollback(base + position)
 
-        powersocets = []
-        # добавление разеток к каждой мебели
-        for item in furniture:
-            if item["first_power_socket_width"] != 0:
-                item["first_power_socket_placement"] = (
-                    item["adjacent_center_point"]
-                    + item["first_power_socket_width"]
+    def place_furniture(
+        self, index: int, furniture_item: dict, wall: int = None,
+    ) -> tuple:
+        """Размещает одну единицу мебели в самом большом свободном промежутке.
+
+        Размещение запоминается в `placed`, поэтому его можно отменить через
+        `rollback`, не пересчитывая предыдущую мебель.
+
+        Args:
+            index: индекс мебели во входном списке
+            furniture_item: размеры мебели
+            wall: стена, к которой нужно поставить мебель (None - любая)
+
+        Returns:
+            tuple: точка на прямой периметра и прямоугольник мебели
+        """
+        self.budget.check()
+        stats = self.stats
+        stats.start_item(index)
+        try:
+            with stats.stage("free_space"):
+                result_free_space = self.gaps.largest()
+            with stats.stage("middle_point"):
+                result_middle_distance = self.middle_point_finder(
+                    result_free_space, self.wall_perimetr, self.walls_length,
                 )
-                powersocets.append(
-                    self.convert_line_to_coordinates(
-                        item["first_power_socket_placement"],
-                        self.walls_length,
-                        self.wall_perimetr,
-                    ),
+                result_wall_definition = self.wall_definition(
+                    result_middle_distance,
                 )
-            if item["second_power_socket_width"] != 0:
-                item["second_power_socket_placement"] = (
-                    item["adjacent_center_point"]
-                    + item["second_power_socket_width"]
+            with stats.stage("corner_markings"):
+                result_corner_markings = corner_markings(
+                    furniture_item,
+                    result_middle_distance,
+                    result_wall_definition,
                 )
-                powersocets.append(
-                    self.convert_line_to_coordinates(
-                        item["second_power_socket_placement"],
-                        self.walls_length,
-                        self.wall_perimetr,
-                    ),
+            with stats.stage("placing"):
+                final_point, figure = self.placing_in_coordinates(
+                    result_middle_distance,
+                    result_corner_markings,
+                    furniture_item,
+                    wall,
                 )
 
-        # функции для возможности наглядного тестирования результата до
-        # отправки на фронт
-        create_rectangles(self.coordinates, self.room_coordinates, powersocets)
+            with stats.stage("insert"):
+                key = self.collision.add(figure)
+                self.gaps.insert(key, *self.figure_interval(figure))
+                self.placed.append((index, final_point, figure, key))
+        finally:
+            stats.finish_item()
+        return final_point, figure
+
+    def rollback(self, count: int):
+        """Отменяет размещение мебели, оставляя первые count единиц."""
+        while len(self.placed) > count:
+            _, _, figure, key = self.placed.pop()
+            start, _ = self.figure_interval(figure)
+            self.gaps.remove(key, start)
+        self.collision.truncate(self.openings_count + len(self.placed))
+
+    def build_result(
+        self, doors_and_windows: list, furniture: list, room_size: dict,
+    ) -> LayoutResult:
+        """Переводит размещенную мебель и ее розетки в словари API."""
+        result = LayoutResult(
+            room_size=room_size, openings=list(doors_and_windows),
+        )
+        for index, final_point, figure, _ in self.placed:
+            item = furniture[index]
+            result.placements.append(
+                {
+                    "index": index,
+                    "name": item.get("name"),
+                    "wall": figure.wall,
+                    "adjacent_center_point": final_point,
+                    **figure.to_dict(),
+                },
+            )
+            # добавление разеток к каждой мебели
+            result.power_sockets.extend(
+                power_sockets(self.geometry, item, final_point),
+            )
+        return result
@@ -1,8 +1,15 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .geometry import Point, Rect
+
+
 def corner_markings(
     length_and_width: dict,
-    center: dict,
+    center: Point,
     wall_number: int,
-) -> dict:
+) -> Rect:
     """Вычисляем координаты углов объекта.
 
     Имея центр объекта и его размеры, относительно конкретной стены
@@ -10,76 +17,85 @@ def corner_markings(
 
     Args:
         length_and_width: ширина и длина объекта {length: 1, width: 1}
-        center: центр стороны объекта, примыкающей к стене {"x": 0, "y": 0},
+        center: центр стороны объекта, примыкающей к стене
         wall_number: сторона комнаты с учетом, что левая сторона первая, а
         дальнейшие нумеруются по часовой стрелке
 
     Returns:
-        dict: словарь с координатами углов
-                {
-                "north_west": {"x": 0, "y": 0},
-                "north_east": {"x": 0, "y": 0},
-                "south_west": {"x": 0, "y": 0},
-                "south_east": {"x": 0, "y": 0},
-                }
+        Rect: прямоугольник объекта, примыкающий к стене wall_number
     """
-    corners_coordinates = {
-        "north_west": {"x": 0, "y": 0},
-        "north_east": {"x": 0, "y": 0},
-        "south_west": {"x": 0, "y": 0},
-        "south_east": {"x": 0, "y": 0},
-    }
-
-    # последующие шесть строчек нужны для визуального сокращения кода
-    north_east = corners_coordinates["north_east"]
-    north_west = corners_coordinates["north_west"]
-    south_east = corners_coordinates["south_east"]
-    south_west = corners_coordinates["south_west"]
-
-    length = length_and_width["length"]
-    width = length_and_width["width"]
+    dx0, dy0, dx1, dy1 = footprint_template(
+        length_and_width["length"], length_and_width["width"], wall_number,
+    )
+    return Rect(
+        center.x + dx0,
+        center.y + dy0,
+        center.x + dx1,
+        center.y + dy1,
+        wall_number,
+    )
+
+
+@lru_cache(maxsize=1024)
+def footprint_template(length, width, wall_number: int) -> tuple:
+    """Смещения сторон объекта относительно центра примыкающей стороны.
 
+    Шаблон зависит только от размеров объекта и стены, поэтому считается
+    один раз для каждой мебели и стены, а прямоугольник в любой точке
+    получается сложением шаблона с координатами точки.
+
+    Объект без стены (wall_number=None) размещается как у первой стены,
+    так же как его углы в `geometry.CORNER_LAYOUT`.
+
+    Returns:
+        tuple: (dx0, dy0, dx1, dy1), прямоугольник объекта с центром
+        примыкающей стороны в точке (x, y) - (x + dx0, y + dy0, x + dx1,
+        y + dy1)
+    """
+    half_width = width / 2
     # так как примыкающая сторона объекта смещает внутренние стороны света
     # углов, то относительно каждой стороны координаты вычисляются по-разному
-    if wall_number == 1:
-        north_east["x"] = center["x"]
-        north_east["y"] = center["y"] + (width / 2)
-        north_west["x"] = center["x"]
-        north_west["y"] = center["y"] - (width / 2)
-        south_east["x"] = center["x"] + length
-        south_east["y"] = center["y"] + (width / 2)
-        south_west["x"] = center["x"] + length
-        south_west["y"] = center["y"] - (width / 2)
-
-    elif wall_number == 2:
-        north_east["x"] = center["x"] + (width / 2)
-        north_east["y"] = center["y"]
-        north_west["x"] = center["x"] - (width / 2)
-        north_west["y"] = center["y"]
-        south_east["x"] = center["x"] + (width / 2)
-        south_east["y"] = center["y"] - length
-        south_west["x"] = center["x"] - (width / 2)
-        south_west["y"] = center["y"] - length
-
-    elif wall_number == 3:
-        north_east["x"] = center["x"]
-        north_east["y"] = center["y"] - (width / 2)
-        north_west["x"] = center["x"]
-        north_west["y"] = center["y"] + (width / 2)
-        south_east["x"] = center["x"] - length
-        south_east["y"] = center["y"] - (width / 2)
-        south_west["x"] = center["x"] - length
-        south_west["y"] = center["y"] + (width / 2)
-
-    elif wall_number == 4:
-        north_east["x"] = center["x"] - (width / 2)
-        north_east["y"] = center["y"]
-        north_west["x"] = center["x"] + (width / 2)
-        north_west["y"] = center["y"]
-        south_east["x"] = center["x"] - (width / 2)
-        south_east["y"] = center["y"] + length
-        south_west["x"] = center["x"] + (width / 2)
-        south_west["y"] = center["y"] + length
-    # вообще не понятно, ведь `corners_coordinates` просто инициализирован
-    # вначале!
-    return corners_coordinates
+    if wall_number in (1, None):
+        return (0, -half_width, length, half_width)
+    if wall_number == 2:
+        return (-half_width, -length, half_width, 0)
+    if wall_number == 3:
+        return (-length, -half_width, 0, half_width)
+    return (-half_width, 0, half_width, length)
+
+
+@lru_cache(maxsize=256)
+def footprint_templates(length, width) -> np.ndarray:
+    """Шаблоны объекта для всех стен, массив формы (5, 4) по номеру стены.
+
+    Массив строится один раз для каждого размера мебели и только читается,
+    поэтому пачки `footprints` одной мебели используют один и тот же массив.
+    """
+    templates = np.empty((5, 4), dtype=np.float64)
+    templates[0] = footprint_template(length, width, None)
+    for wall_number in (1, 2, 3, 4):
+        templates[wall_number] = footprint_template(length, width, wall_number)
+    templates.flags.writeable = False
+    return templates
+
+
+def footprints(
+    length_and_width: dict, xs: np.ndarray, ys: np.ndarray, walls: np.ndarray,
+) -> np.ndarray:
+    """Прямоугольники объекта сразу для многих центров примыкающей стороны.
+
+    Args:
+        length_and_width: ширина и длина объекта {length: 1, width: 1}
+        xs: координаты x центров
+        ys: координаты y центров
+        walls: номера стен (1-4) для каждого центра
+
+    Returns:
+        np.ndarray: массив формы (K, 4) со строками (x0, y0, x1, y1), его
+        можно сразу передать в `CollisionEngine.free_mask`
+    """
+    anchors = np.stack((xs, ys, xs, ys), axis=1)
+    templates = footprint_templates(
+        length_and_width["length"], length_and_width["width"],
+    )
+    return anchors + templates[walls]
@@ -1,10 +1,35 @@
+from io import BytesIO
+
 from PIL import Image, ImageDraw, ImageOps
 
+# форматы, в которых можно получить изображение планировки
+IMAGE_FORMATS = {"png": "PNG", "webp": "WEBP"}
+# наибольшая сторона изображения в пикселях по умолчанию
+MAX_IMAGE_SIDE = 2048
 
-def create_rectangles(data: list, borders: dict, powersocets: list):
-    """Cоздание картинки с визуализированными прямоугольниками."""
-    # Создаем холст с размером size (ширина, высота) и цветом фона color
-    # (код RGB)
+ROOM_BORDER_COLOR = (177, 220, 165)
+FURNITURE_COLOR = (222, 184, 200)
+POWER_SOCKET_COLOR = (0, 100, 0)
+
+
+def draw_layout(
+    data: list, borders: dict, powersocets: list, max_side: int = None,
+) -> Image.Image:
+    """Рисует комнату, мебель и розетки на холсте в памяти.
+
+    Координаты комнаты в миллиметрах, поэтому холст в масштабе 1:1 занимает
+    десятки мегапикселей. Если задан max_side, рисунок сразу строится в
+    уменьшенном масштабе так, чтобы большая сторона не превышала max_side.
+
+    Args:
+        data: углы прямоугольников мебели, дверей и окон
+        borders: углы комнаты
+        powersocets: точки розеток
+        max_side: наибольшая сторона изображения в пикселях
+
+    Returns:
+        Image.Image: готовое изображение
+    """
     if borders["north_east"]["x"] < 100:
         centering = 3
         external_border = 1.7
@@ -18,12 +43,23 @@ def create_rectangles(data: list, borders: dict, powersocets: list):
         external_border = 1.1
         border_width = 100
 
+    width = borders["north_east"]["x"] * external_border
+    height = borders["north_east"]["y"] * external_border
+    scale = 1
+    if max_side is not None and max(width, height) > max_side:
+        scale = max_side / max(width, height)
+
+    def to_canvas(point: dict) -> tuple:
+        return (
+            (point["x"] + centering) * scale,
+            (point["y"] + centering) * scale,
+        )
+
+    # Создаем холст с размером size (ширина, высота) и цветом фона color
+    # (код RGB)
     canvas = Image.new(
         "RGB",
-        size=(
-            int(borders["north_east"]["x"] * external_border),
-            int(borders["north_east"]["y"] * external_border),
-        ),
+        size=(max(int(width * scale), 1), max(int(height * scale), 1)),
         color=(255, 255, 255),
     )
 
@@ -31,77 +67,74 @@ def create_rectangles(data: list, borders: dict, powersocets: list):
     paint_brush = ImageDraw.Draw(canvas)
 
     # рисуем границы комнаты для визуального отслеживания пересечений
-    paint_brush.line(
-        (
-            borders["south_west"]["x"] + centering,
-            borders["south_west"]["y"] + centering,
-            borders["south_east"]["x"] + centering,
-            borders["south_east"]["y"] + centering,
-        ),
-        fill=(177, 220, 165),
-        width=border_width,
-    )
-    paint_brush.line(
-        (
-            borders["south_east"]["x"] + centering,
-            borders["south_east"]["y"] + centering,
-            borders["north_east"]["x"] + centering,
-            borders["north_east"]["y"] + centering,
-        ),
-        fill=(177, 220, 165),
-        width=border_width,
-    )
-    paint_brush.line(
-        (
-            borders["north_west"]["x"] + centering,
-            borders["north_west"]["y"] + centering,
-            borders["north_east"]["x"] + centering,
-            borders["north_east"]["y"] + centering,
-        ),
-        fill=(177, 220, 165),
-        width=border_width,
-    )
-    paint_brush.line(
-        (
-            borders["south_west"]["x"] + centering,
-            borders["south_west"]["y"] + centering,
-            borders["north_west"]["x"] + centering,
-            borders["north_west"]["y"] + centering,
-        ),
-        fill=(177, 220, 165),
-        width=border_width,
-    )
-
-    # проходя через данные отрисовываем каждый прямоугольник цвета fill с
-    # шириной width.
-    # для построения прямоугольника достаточно использовать только две точки
-    # по диагонали.
+    for start, end in (
+        ("south_west", "south_east"),
+        ("south_east", "north_east"),
+        ("north_west", "north_east"),
+        ("south_west", "north_west"),
+    ):
+        paint_brush.line(
+            to_canvas(borders[start]) + to_canvas(borders[end]),
+            fill=ROOM_BORDER_COLOR,
+            width=max(int(border_width * scale), 1),
+        )
 
+    # проходя через данные отрисовываем каждый прямоугольник цвета fill
     for item in data:
-        x_north_west, y_north_west = item["north_west"].values()
-        x_north_east, y_north_east = item["north_east"].values()
-        x_south_east, y_south_east = item["south_east"].values()
-        x_south_west, y_south_west = item["south_west"].values()
         paint_brush.polygon(
-            (
-                (x_north_west + centering, y_north_west + centering),
-                (x_north_east + centering, y_north_east + centering),
-                (x_south_east + centering, y_south_east + centering),
-                (x_south_west + centering, y_south_west + centering),
+            tuple(
+                to_canvas(item[corner])
+                for corner in (
+                    "north_west",
+                    "north_east",
+                    "south_east",
+                    "south_west",
+                )
             ),
-            fill=(222, 184, 200),
-            width=10,
+            fill=FURNITURE_COLOR,
+            width=max(int(10 * scale), 1),
         )
 
     for item in powersocets:
         paint_brush.regular_polygon(
-            (item["x"] + centering, item["y"] + centering, 100),
+            (*to_canvas(item), max(100 * scale, 1)),
             n_sides=4,
-            fill=(0, 100, 0),
+            fill=POWER_SOCKET_COLOR,
         )
-    canvas = canvas.rotate(180)
-    canvas = ImageOps.mirror(canvas)
-    # сохраняем готовое изображение
-    canvas.save("canvas.png")
-    # открыть результат
-    canvas.show()
+    # ось y комнаты направлена вверх, а у изображения - вниз
+    return ImageOps.flip(canvas)
+
+
+def render_layout(
+    data: list,
+    borders: dict,
+    powersocets: list,
+    image_format: str = "png",
+    max_side: int = MAX_IMAGE_SIDE,
+) -> bytes:
+    """Изображение планировки в виде байтов PNG или WebP.
+
+    Изображение кодируется в памяти и не записывается на диск.
+
+    Args:
+        data: углы прямоугольников мебели, дверей и окон
+        borders: углы комнаты
+        powersocets: точки розеток
+        image_format: "png" или "webp"
+        max_side: наибольшая сторона изображения в пикселях
+
+    Returns:
+        bytes: закодированное изображение
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Неизвестный формат изображения: {image_format}")
+    buffer = BytesIO()
+    draw_layout(data, borders, powersocets, max_side).save(
+        buffer, format=IMAGE_FORMATS[image_format],
+    )
+    return buffer.getvalue()
+
+
+def create_rectangles(data: list, borders: dict, powersocets: list):
+    """Показ планировки для наглядной отладки алгоритма вне сервера."""
+    draw_layout(data, borders, powersocets, MAX_IMAGE_SIDE).show()
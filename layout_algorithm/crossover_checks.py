@@ -1,196 +1,88 @@
-def rib_crossover_check(object, object_2):
-
-    # Проверка на пересечение ребер в левом нижнем углу
-    if (
-        object["south_east"]["y"]
-        > object_2["south_east"]["y"]
-        > object_2["south_west"]["y"]
-        > object["north_east"]["y"]
-        and object_2["south_east"]["x"]
-        > object["south_west"]["x"]
-        > object["south_east"]["x"]
-        > object_2["north_east"]["x"]
-    ):
-        return False
-    # Проверка на пересечение ребер в левом верхнем углу
-    elif (
-        object_2["north_east"]["y"]
-        > object["south_east"]["y"]
-        > object["south_west"]["y"]
-        > object_2["south_east"]["y"]
-        and object["south_east"]["x"]
-        > object_2["south_east"]["x"]
-        > object_2["south_west"]["x"]
-        > object["north_east"]["x"]
-    ):
-        return False
-    # Проверка на пересечение ребер в правом верхнем углу
-    elif (
-        object["north_east"]["y"]
-        > object_2["north_west"]["y"]
-        > object_2["north_east"]["y"]
-        > object["south_east"]["y"]
-        and object_2["north_east"]["x"]
-        > object["south_east"]["x"]
-        > object["south_west"]["x"]
-        > object_2["south_east"]["x"]
-    ):
-        return False
-    # Проверка на пересечение ребер в правом нижнем углу
-    elif (
-        object_2["south_east"]["y"]
-        > object["south_west"]["y"]
-        > object["south_east"]["y"]
-        > object_2["north_east"]["y"]
-        and object["north_east"]["x"]
-        > object_2["south_west"]["x"]
-        > object_2["south_east"]["x"]
-        > object["south_east"]["x"]
-    ):
-        return False
-    return True
-
-
-def corner_crossover_check(object, object_2):
-
-    # Проверка на вхождение углов объектов в левом нижнем углу комнаты
-    if (
-        object_2["south_west"]["x"]
-        > object["south_east"]["x"]
-        > object_2["north_west"]["x"]
-        and object_2["south_east"]["y"]
-        > object["south_east"]["y"]
-        > object_2["north_west"]["y"]
-    ):
-        return False
-    # Проверка на вхождение углов объектов в левом верхнем углу комнаты
-    elif (
-        object_2["south_east"]["x"]
-        > object["south_east"]["x"]
-        > object_2["south_west"]["x"]
-        and object_2["north_west"]["y"]
-        > object["south_east"]["y"]
-        > object_2["south_west"]["y"]
-    ):
-        return False
-    # Проверка на вхождение углов объектов в правом верхнем углу комнаты
-    elif (
-        object_2["north_east"]["x"]
-        > object["south_east"]["x"]
-        > object_2["south_east"]["x"]
-        and object_2["south_west"]["y"]
-        > object["south_east"]["y"]
-        > object_2["south_east"]["y"]
-    ):
-        return False
-    # Проверка на вхождение углов объектов в правом нижнем углу комнаты
-    elif (
-        object_2["south_west"]["x"]
-        > object["south_east"]["x"]
-        > object_2["south_east"]["x"]
-        and object_2["south_west"]["y"]
-        > object["south_east"]["y"]
-        > object_2["north_east"]["y"]
-    ):
-        return False
-    return True
-
-
-def layering_of_objects_check(object, object_2):
-
-    items = [
-        object["north_west"],
-        object["north_east"],
-        object["south_west"],
-        object["south_east"],
-    ]
-
-    for item in items:
-        # Проверяем пересечение с другими объектами в комнате
-        if (
-            object_2["north_west"]["x"]
-            <= item["x"]
-            <= object_2["north_east"]["x"]
-            and object_2["south_east"]["y"]
-            <= item["y"]
-            <= object_2["north_east"]["y"]
-        ):
-            return False
-
-        elif (
-            object_2["north_west"]["x"]
-            >= item["x"]
-            >= object_2["north_east"]["x"]
-            and object_2["south_east"]["y"]
-            >= item["y"]
-            >= object_2["north_east"]["y"]
-        ):
-            return False
-
-        elif (
-            object_2["north_west"]["x"]
-            <= item["x"]
-            <= object_2["north_east"]["x"]
-            and object_2["south_east"]["y"]
-            <= item["y"]
-            <= object_2["south_west"]["y"]
-        ):
-            return False
-
-        elif (
-            object_2["north_west"]["x"]
-            >= item["x"]
-            >= object_2["north_east"]["x"]
-            and object_2["south_east"]["y"]
-            >= item["y"]
-            >= object_2["south_west"]["y"]
-        ):
-            return False
-    return True
-
-
-def room_crossover_check(figure, walls):
-    if (
-        figure["north_east"]["x"] > walls["second_wall"]
-        or figure["south_east"]["x"] > walls["second_wall"]
-        or figure["south_west"]["x"] > walls["second_wall"]
-        or figure["north_west"]["x"] > walls["second_wall"]
-    ):
-        return False
-
-    elif (
-        figure["north_east"]["y"] > walls["first_wall"]
-        or figure["south_east"]["y"] > walls["first_wall"]
-        or figure["south_west"]["y"] > walls["first_wall"]
-        or figure["north_west"]["y"] > walls["first_wall"]
-    ):
-        return False
-
-    elif figure["south_west"]["x"] < 0 or figure["south_west"]["y"] < 0:
-        return False
-
-    return True
+from dataclasses import dataclass
+
+import numpy as np
+
+from .collision import figures_to_boxes, inside_room, overlap_matrix
 
 
 def checks(figure, figure_2, walls):
-    # Проверяем пересечение противоположных объектов
-    if not layering_of_objects_check(figure, figure_2):
-        return False
-    # Проверяем объекты на поглощение друг друга
-    if not layering_of_objects_check(figure_2, figure):
-        return False
-    # Проверка пересечения ребер, если объекты находятся с одной и с другой
-    # стороны друг от друга
-    if not rib_crossover_check(figure, figure_2):
-        return False
-    if not rib_crossover_check(figure_2, figure):
-        return False
-    # Проверяем на вхождение углов объектов внутрь друг друга
-    if not corner_crossover_check(figure, figure_2):
-        return False
-    if not corner_crossover_check(figure_2, figure):
-        return False
-    # Проверяем, что мебель не выходит за пределы комнаты
-    if not room_crossover_check(figure, walls):
-        return False
-    return True
+    """Проверка возможности размещения объекта рядом с другим объектом.
+
+    Оставлена для совместимости: вся геометрия считается в `collision`.
+    Для проверки кандидата сразу против всех объектов комнаты следует
+    использовать `CollisionEngine`, для пачки кандидатов - `collision_matrix`.
+
+    Args:
+        figure: координаты углов размещаемого объекта
+        figure_2: координаты углов уже размещенного объекта
+        walls: стены комнаты {"first_wall": 0, "second_wall": 0, ...}
+
+    Returns:
+        bool: True, если объекты не пересекаются и figure внутри комнаты
+    """
+    boxes = figures_to_boxes((figure, figure_2))
+    candidate, placed = boxes[:1], boxes[1:]
+    return bool(
+        inside_room(candidate, walls)[0]
+        and not np.any(overlap_matrix(candidate, placed)),
+    )
+
+
+@dataclass
+class CollisionMatrix:
+    """Пересечения пачки кандидатов с объектами комнаты и друг с другом.
+
+    Attributes:
+        objects: булева матрица (K, N), True - кандидат пересекает объект
+        candidates: булева матрица (K, K), True - кандидаты пересекают друг
+            друга; на диагонали False
+        inside: булев массив (K,), True - кандидат не выходит за стены
+    """
+
+    objects: np.ndarray
+    candidates: np.ndarray
+    inside: np.ndarray
+
+    @property
+    def free(self) -> np.ndarray:
+        """Кандидаты внутри комнаты, не пересекающие объекты.
+
+        Пересечения кандидатов друг с другом не учитываются: обычно это
+        разные положения одной перетаскиваемой мебели.
+        """
+        return self.inside & ~self.objects.any(axis=1)
+
+    @property
+    def free_together(self) -> np.ndarray:
+        """Свободные кандидаты, которые не пересекают и друг друга, например
+        при одновременной расстановке нескольких единиц мебели."""
+        return self.free & ~self.candidates.any(axis=1)
+
+
+def collision_matrix(candidates, objects, walls) -> CollisionMatrix:
+    """Проверка пачки кандидатов одним векторизованным вызовом.
+
+    Кандидаты сравниваются с объектами комнаты и друг с другом одной
+    матрицей пересечений (K, K + N), без попарных вызовов `checks`. Касание
+    сторонами, как и в `checks`, пересечением не считается.
+
+    Args:
+        candidates: координаты углов K кандидатов
+        objects: координаты углов N дверей, окон и мебели комнаты
+        walls: стены комнаты {"first_wall": 0, "second_wall": 0, ...}
+
+    Returns:
+        CollisionMatrix: пересечения кандидатов и признаки того, что они
+        внутри комнаты
+    """
+    candidate_boxes = figures_to_boxes(candidates)
+    boxes = np.concatenate((candidate_boxes, figures_to_boxes(objects)))
+    overlaps = overlap_matrix(candidate_boxes, boxes)
+    count = len(candidate_boxes)
+    between = overlaps[:, :count]
+    np.fill_diagonal(between, False)
+    return CollisionMatrix(
+        objects=overlaps[:, count:],
+        candidates=between,
+        inside=inside_room(candidate_boxes, walls),
+    )
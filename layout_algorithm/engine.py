@@ -0,0 +1,94 @@
+"""Функциональный интерфейс алгоритма расстановки.
+
+`compute_layout` не хранит состояние между вызовами и не изменяет входные
+данные: на каждый вызов создается отдельный `Core`, а результат
+возвращается новым объектом `LayoutResult`. Поэтому расчеты можно
+запускать из нескольких потоков (gthread, ASGI, пул потоков), а одни и те
+же входные данные - кэшировать и передавать разным вариантам без копий.
+
+Пересчет расстановки после добавления или удаления мебели выполняет
+`furniture.services.room_layout_service.relayout_room`: оставшаяся мебель
+передается в `compute_layout` как уже расставленные объекты.
+"""
+
+from .budget import LayoutBudget
+from .core import Core
+from .result import LayoutResult
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("FrozenDict нельзя изменять")
+
+
+class FrozenDict(dict):
+    """Словарь только для чтения.
+
+    В отличие от `MappingProxyType` сериализуется через pickle, поэтому
+    замороженные данные можно передавать в пул процессов вариантов и
+    сохранять в кэш вместе с `LayoutResult`.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value):
+    """Неизменяемая копия входных данных: словари становятся `FrozenDict`,
+    списки - кортежами.
+
+    Замороженные данные можно передавать в `compute_layout` из разных
+    потоков и в пул процессов; попытка изменить их вызывает TypeError.
+    """
+    if isinstance(value, dict):
+        return FrozenDict(
+            (key, freeze(item)) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def compute_layout(
+    doors_and_windows,
+    furniture,
+    room_size,
+    budget: LayoutBudget = None,
+    collect_stats: bool = False,
+    state: bytes = None,
+    **options,
+) -> LayoutResult:
+    """Рассчитывает расстановку мебели.
+
+    Args:
+        doors_and_windows: координаты углов дверей, окон и уже
+            расставленной мебели
+        furniture: размеры мебели и расположение ее розеток
+        room_size: длины стен комнаты
+        budget: ограничение времени и итераций расчета
+        collect_stats: собирать ли замеры этапов
+        state: снимок подготовленной комнаты `snapshot.prepare_state`
+        **options: параметры `Core` (ordering, backtrack_depth,
+            placement_mode)
+
+    Returns:
+        LayoutResult: расставленная мебель и розетки
+
+    Raises:
+        LayoutInfeasibleError: мебель заведомо не помещается в комнату
+        PlacementError: не удалось найти место для мебели
+    """
+    return Core(**options).algorithm_activation(
+        doors_and_windows, furniture, room_size, budget, collect_stats, state,
+    )
+
@@ -0,0 +1,33 @@
+class PlacementError(Exception):
+    """Мебель невозможно разместить в комнате."""
+
+
+class BudgetExhausted(Exception):
+    """Исчерпан бюджет времени или итераций, либо расчет отменен.
+
+    Attributes:
+        reason: "deadline", "iterations" или "cancelled"
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(f"Расчет расстановки остановлен: {reason}")
+        self.reason = reason
+
+
+class LayoutInfeasibleError(PlacementError):
+    """Мебель заведомо не помещается в комнату, поиск не запускался.
+
+    Attributes:
+        reasons: причины в виде словарей {"code": ..., "message": ...},
+            для отдельной мебели указан ее индекс "index"
+    """
+
+    def __init__(self, reasons: list):
+        super().__init__(
+            "; ".join(reason["message"] for reason in reasons),
+        )
+        self.reasons = reasons
+
+
+class SnapshotError(ValueError):
+    """Снимок состояния поврежден или записан в неизвестной версии формата."""
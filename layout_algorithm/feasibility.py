@@ -0,0 +1,147 @@
+"""Быстрая проверка, что мебель в принципе помещается в комнату.
+
+Проверяются необходимые условия, которые считаются без поиска расстановки:
+
+- каждая единица мебели помещается хотя бы у одной стены пустой комнаты;
+- у какой-нибудь стены для нее остается место между дверями и окнами;
+- суммарная ширина мебели не больше свободной от проемов длины стен:
+  мебель у одной стены не пересекается, поэтому ее проекции на стену не
+  перекрываются;
+- суммарная площадь мебели не больше площади комнаты.
+
+Если условие нарушено, расстановка невозможна при любом порядке мебели, и
+`LayoutInfeasibleError` выбрасывается до запуска поиска.
+"""
+
+import numpy as np
+
+from .collision import figures_to_boxes
+from .exceptions import LayoutInfeasibleError
+from .free_intervals import wall_free_intervals
+
+WALLS = (1, 2, 3, 4)
+
+
+def wall_free_length(boxes: np.ndarray, walls_length: tuple) -> float:
+    """Суммарная длина стен, не занятая примыкающими к ним объектами.
+
+    Args:
+        boxes: объекты комнаты, массив формы (N, 4) со строками
+            (x0, y0, x1, y1)
+        walls_length: длины стен начиная с первой
+
+    Returns:
+        float: длина свободных участков всех четырех стен
+    """
+    room_x, room_y = walls_length[1], walls_length[0]
+    # для каждой стены: индекс координаты, по которой объект примыкает к
+    # стене, ее значение у стены, индекс координаты вдоль стены и длина стены
+    sides = (
+        (0, 0, 1, room_y),
+        (3, room_y, 0, room_x),
+        (2, room_x, 1, room_y),
+        (1, 0, 0, room_x),
+    )
+    free = 0
+    for touch, value, along, extent in sides:
+        adjacent = boxes[boxes[:, touch] == value]
+        starts = np.clip(adjacent[:, along], 0, extent)
+        ends = np.clip(adjacent[:, along + 2], 0, extent)
+        order = np.argsort(starts, kind="stable")
+        occupied, current = 0, 0
+        for start, end in zip(starts[order].tolist(), ends[order].tolist()):
+            start = max(start, current)
+            if end > start:
+                occupied += end - start
+                current = end
+        free += extent - occupied
+    return free
+
+
+def infeasibility_reasons(
+    doors_and_windows: list, furniture: list, room_size: dict,
+) -> list:
+    """Причины, по которым мебель заведомо не помещается в комнату.
+
+    Args:
+        doors_and_windows: координаты углов дверей, окон и уже
+            расставленной мебели
+        furniture: размеры мебели {"length": 1, "width": 1, ...}
+        room_size: длины стен комнаты
+
+    Returns:
+        list: словари {"code": ..., "message": ..., "index": ...}, пустой
+        список - очевидных препятствий нет
+    """
+    walls_length = tuple(room_size.values())
+    boxes = figures_to_boxes(doors_and_windows)
+    empty = np.empty((0, 4), dtype=np.float64)
+    reasons = []
+    # результат проверки одинаковой по размерам мебели
+    checked = {}
+    for index, item in enumerate(furniture):
+        size = (item["length"], item["width"])
+        if size not in checked:
+            if not any(
+                wall_free_intervals(empty, wall, item, walls_length)
+                for wall in WALLS
+            ):
+                checked[size] = (
+                    "item_too_large",
+                    "не помещается ни у одной стены комнаты",
+                )
+            elif not any(
+                wall_free_intervals(boxes, wall, item, walls_length)
+                for wall in WALLS
+            ):
+                checked[size] = (
+                    "item_blocked",
+                    "не помещается ни у одной стены между дверями и окнами",
+                )
+            else:
+                checked[size] = None
+        if checked[size] is not None:
+            code, message = checked[size]
+            reasons.append(
+                {
+                    "code": code,
+                    "index": index,
+                    "message": f"{item.get('name') or index}: {message}",
+                },
+            )
+
+    total_width = sum(item["width"] for item in furniture)
+    free_length = wall_free_length(boxes, walls_length)
+    if total_width > free_length:
+        reasons.append(
+            {
+                "code": "wall_length",
+                "message": (
+                    f"Суммарная ширина мебели {total_width} больше свободной "
+                    f"длины стен {free_length:g}"
+                ),
+            },
+        )
+    total_area = sum(item["length"] * item["width"] for item in furniture)
+    room_area = walls_length[0] * walls_length[1]
+    if total_area > room_area:
+        reasons.append(
+            {
+                "code": "area",
+                "message": (
+                    f"Суммарная площадь мебели {total_area} больше площади "
+                    f"комнаты {room_area}"
+                ),
+            },
+        )
+    return reasons
+
+
+def check_feasibility(
+    doors_and_windows: list, furniture: list, room_size: dict,
+):
+    """Выбрасывает `LayoutInfeasibleError`, если мебель заведомо не
+    помещается в комнату."""
+    reasons = infeasibility_reasons(doors_and_windows, furniture, room_size)
+    if reasons:
+        raise LayoutInfeasibleError(reasons)
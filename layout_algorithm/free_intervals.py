@@ -0,0 +1,160 @@
+"""Поиск свободных интервалов вдоль развернутого периметра комнаты.
+
+Для каждой стены вычисляется, при каких положениях центра примыкающей
+стороны мебель пересекает уже размещенные объекты. Объединение этих
+положений находится одним проходом по отсортированным интервалам, а
+свободные участки переводятся в точки на прямой периметра (см.
+`MiddlePointAndShift.convert_coordinates_to_line`).
+"""
+
+import numpy as np
+
+from .perimeter import PerimeterGeometry
+
+
+def wall_free_intervals(
+    boxes: np.ndarray,
+    wall_number: int,
+    length_and_width: dict,
+    walls_length: tuple,
+) -> list:
+    """Свободные положения мебели на одной стене.
+
+    Args:
+        boxes: размещенные объекты, массив формы (N, 4) со строками
+            (x0, y0, x1, y1)
+        wall_number: сторона комнаты с учетом, что левая сторона первая, а
+            дальнейшие нумеруются по часовой стрелке
+        length_and_width: ширина и длина объекта {length: 1, width: 1}
+        walls_length: длины стен начиная с первой
+
+    Returns:
+        list: отсортированные интервалы [(start, end), ...] на прямой
+        периметра, в пределах которых можно поставить центр примыкающей
+        стороны объекта
+    """
+    free, _ = _wall_free_intervals(
+        boxes, wall_number, length_and_width, walls_length,
+    )
+    return free
+
+
+def _wall_free_intervals(
+    boxes: np.ndarray,
+    wall_number: int,
+    length_and_width: dict,
+    walls_length: tuple,
+) -> tuple:
+    """Свободные положения мебели на стене и количество сравнений.
+
+    Сравнения - это проверки объектов комнаты на попадание в полосу вдоль
+    стены и шаги прохода по попавшим в нее объектам.
+    """
+    depth = length_and_width["length"]
+    half_width = length_and_width["width"] / 2
+    room_x, room_y = walls_length[1], walls_length[0]
+
+    # вдоль первой и третьей стены объект двигается по оси y, вдоль второй
+    # и четвертой - по оси x. Поперек стены объект занимает полосу band.
+    if wall_number in (1, 3):
+        along, across, extent, cross_extent = 1, 0, room_y, room_x
+    else:
+        along, across, extent, cross_extent = 0, 1, room_x, room_y
+    if depth > cross_extent or half_width * 2 > extent:
+        return [], 0
+    if wall_number in (1, 4):
+        band = (0, depth)
+    else:
+        band = (cross_extent - depth, cross_extent)
+
+    lowest, highest = half_width, extent - half_width
+    blocking = boxes[
+        (boxes[:, across] < band[1]) & (band[0] < boxes[:, across + 2])
+    ]
+    # открытые интервалы положений центра, при которых есть пересечение
+    starts = blocking[:, along] - half_width
+    ends = blocking[:, along + 2] + half_width
+    order = np.argsort(starts, kind="stable")
+
+    free = []
+    current = lowest
+    for start, end in zip(starts[order].tolist(), ends[order].tolist()):
+        if current <= min(start, highest):
+            free.append((current, min(start, highest)))
+        current = max(current, end)
+    if current <= highest:
+        free.append((current, highest))
+
+    return (
+        [_to_line(interval, wall_number, walls_length) for interval in free],
+        len(boxes) + len(blocking),
+    )
+
+
+def _to_line(interval: tuple, wall_number: int, walls_length: tuple) -> tuple:
+    """Переводит интервал координаты вдоль стены в интервал периметра."""
+    start, end = interval
+    prefix = PerimeterGeometry.for_walls(walls_length).prefix
+    if wall_number == 1:
+        return start, end
+    if wall_number == 2:
+        return prefix[1] + start, prefix[1] + end
+    # вдоль третьей и четвертой стены координата убывает по ходу периметра
+    return prefix[wall_number] - end, prefix[wall_number] - start
+
+
+def room_free_intervals(
+    boxes: np.ndarray,
+    length_and_width: dict,
+    walls_length: tuple,
+) -> list:
+    """Свободные положения мебели на всех стенах комнаты.
+
+    Returns:
+        tuple: интервалы [(start, end, wall_number), ...] в порядке обхода
+        периметра и количество сравнений объектов комнаты при их поиске
+    """
+    intervals, comparisons = [], 0
+    for wall_number in (1, 2, 3, 4):
+        free, wall_comparisons = _wall_free_intervals(
+            boxes, wall_number, length_and_width, walls_length,
+        )
+        comparisons += wall_comparisons
+        for start, end in free:
+            intervals.append((start, end, wall_number))
+    return intervals, comparisons
+
+
+def nearest_free_position(
+    intervals: list,
+    point: float,
+    wall_perimetr: float,
+):
+    """Ближайшая к точке свободная позиция на замкнутом периметре.
+
+    При равном расстоянии предпочтение отдается смещению "plus", как и при
+    пошаговом смещении объекта.
+
+    Args:
+        intervals: [(start, end, wall_number), ...]
+        point: желаемая точка на прямой периметра
+        wall_perimetr: периметр комнаты
+
+    Returns:
+        tuple | None: (точка на прямой периметра, номер стены) или None, если
+        свободного места нет
+    """
+    if not intervals:
+        return None
+    bounds = np.array([item[:2] for item in intervals], dtype=np.float64)
+    # на замкнутом периметре ближайшей может оказаться любая из границ
+    # интервала, а не только ближайшая по прямой
+    candidates = np.concatenate(
+        (np.clip(point, bounds[:, 0], bounds[:, 1]), bounds[:, 0], bounds[:, 1]),
+    )
+    forward = (candidates - point) % wall_perimetr
+    backward = (point - candidates) % wall_perimetr
+    distance = np.minimum(forward, backward)
+    # сначала наименьшее расстояние, затем смещение вперед
+    best = np.lexsort((backward < forward, distance))[0]
+    return candidates[best].item(), intervals[best % len(intervals)][2]
@@ -0,0 +1,196 @@
+"""Индекс свободных промежутков между объектами вдоль периметра.
+
+Объекты у стен занимают отрезки на прямой из сложенных сторон комнаты.
+Промежуток - это свободная часть периметра между двумя соседними отрезками.
+При вставке объекта меняется только один промежуток, поэтому индекс
+обновляется инкрементально, а не пересчитывается по всем объектам.
+"""
+
+import heapq
+import itertools
+
+from sortedcontainers import SortedList
+
+# куча пересобирается, когда устаревших записей в ней становится больше, чем
+# живых промежутков, плюс этот запас
+HEAP_SLACK = 16
+
+
+class GapIndex:
+    """Свободные промежутки периметра с быстрым поиском по длине.
+
+    Отрезки хранятся в `SortedList` по началу, промежутки - в словаре по
+    паре ключей соседних отрезков. Для поиска самого большого промежутка
+    используется куча с ленивым удалением устаревших записей, для поиска по
+    длине - `SortedList` по длине. Вставка и удаление отрезка занимают
+    O(log n), а куча пересобирается, когда устаревших записей в ней
+    становится больше, чем живых.
+    """
+
+    def __init__(self, perimeter):
+        self.perimeter = perimeter
+        # отрезки (начало, номер вставки, конец, ключ) по порядку: номер
+        # вставки ставит новый отрезок после отрезков с тем же началом
+        self._intervals = SortedList()
+        self._counter = itertools.count()
+        # живые промежутки: (ключ левого, ключ правого) -> (левая точка,
+        # правая точка, длина)
+        self._gaps = {}
+        self._heap = []
+        self._by_length = SortedList()
+
+    def __len__(self):
+        return len(self._intervals)
+
+    @classmethod
+    def from_intervals(cls, perimeter, intervals) -> "GapIndex":
+        """Индекс по уже отсортированным по началу отрезкам.
+
+        Промежутки строятся одним проходом, без поочередной вставки.
+
+        Args:
+            perimeter: длина периметра
+            intervals: отрезки (начало, конец, ключ) в порядке `intervals`
+        """
+        index = cls(perimeter)
+        index._intervals.update(
+            (start, next(index._counter), end, key)
+            for start, end, key in intervals
+        )
+        count = len(index._intervals)
+        for position, (_, _, left_end, left_key) in enumerate(index._intervals):
+            right_start, _, _, right_key = index._intervals[
+                (position + 1) % count
+            ]
+            length = index.gap_length(left_end, right_start)
+            key = (left_key, right_key)
+            index._gaps[key] = (left_end, right_start, length)
+            index._heap.append((-length, -left_end, key))
+        heapq.heapify(index._heap)
+        index._by_length.update(
+            (length, left_point, key)
+            for key, (left_point, _, length) in index._gaps.items()
+        )
+        return index
+
+    @property
+    def intervals(self) -> list:
+        """Отрезки (начало, конец, ключ) в порядке их начал."""
+        return [(start, end, key) for start, _, end, key in self._intervals]
+
+    def gap_length(self, left_point, right_point):
+        """Длина промежутка с учетом перехода через начало периметра."""
+        if right_point >= left_point:
+            return right_point - left_point
+        return right_point + (self.perimeter - left_point)
+
+    def _add_gap(self, left, right):
+        length = self.gap_length(left[2], right[0])
+        key = (left[3], right[3])
+        self._gaps[key] = (left[2], right[0], length)
+        # при равной длине выбирается промежуток, начинающийся дальше по
+        # периметру
+        heapq.heappush(self._heap, (-length, -left[2], key))
+        self._by_length.add((length, left[2], key))
+        if len(self._heap) > 2 * len(self._gaps) + HEAP_SLACK:
+            self._rebuild_heap()
+
+    def _remove_gap(self, left, right):
+        key = (left[3], right[3])
+        left_point, _, length = self._gaps.pop(key)
+        self._by_length.remove((length, left_point, key))
+
+    def _rebuild_heap(self):
+        """Убирает из кучи записи удаленных промежутков."""
+        self._heap = [
+            (-length, -left_point, key)
+            for key, (left_point, _, length) in self._gaps.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def _neighbours(self, position):
+        count = len(self._intervals)
+        return (
+            self._intervals[(position - 1) % count],
+            self._intervals[position % count],
+        )
+
+    def insert(self, key, start, end):
+        """Добавляет отрезок объекта и делит промежуток, в который он попал.
+
+        Args:
+            key: уникальный ключ объекта
+            start: начало отрезка на прямой периметра
+            end: конец отрезка на прямой периметра
+        """
+        interval = (start, next(self._counter), end, key)
+        position = self._intervals.bisect_right(interval)
+        if self._intervals:
+            left, right = self._neighbours(position)
+            self._remove_gap(left, right)
+        else:
+            left = right = interval
+        self._intervals.add(interval)
+        self._add_gap(left, interval)
+        if right is not interval:
+            self._add_gap(interval, right)
+
+    def remove(self, key, start):
+        """Убирает отрезок объекта и объединяет соседние промежутки."""
+        position = self._intervals.bisect_left((start,))
+        while self._intervals[position][3] != key:
+            position += 1
+        interval = self._intervals[position]
+        left, _ = self._neighbours(position)
+        _, right = self._neighbours(position + 1)
+        if left is interval:
+            self._remove_gap(interval, interval)
+        else:
+            self._remove_gap(left, interval)
+            self._remove_gap(interval, right)
+        del self._intervals[position]
+        if left is not interval:
+            self._add_gap(left, right)
+
+    def largest(self) -> tuple:
+        """Самый большой промежуток (левая точка, правая точка)."""
+        if not self._gaps:
+            return 0, self.perimeter
+        while True:
+            length, _, key = self._heap[0]
+            gap = self._gaps.get(key)
+            if gap is not None and gap[2] == -length:
+                return gap[:2]
+            heapq.heappop(self._heap)
+
+    def best_fit(self, length) -> tuple:
+        """Самый короткий промежуток, длина которого не меньше length.
+
+        Returns:
+            tuple | None: (левая точка, правая точка) или None
+        """
+        if not self._gaps:
+            return (0, self.perimeter) if length <= self.perimeter else None
+        position = self._by_length.bisect_left((length,))
+        if position == len(self._by_length):
+            return None
+        return self._gaps[self._by_length[position][2]][:2]
+
+    def first_fit(self, length, point=0) -> tuple:
+        """Первый по ходу периметра от точки point подходящий промежуток.
+
+        Перебираются только промежутки, длина которых не меньше length.
+
+        Returns:
+            tuple | None: (левая точка, правая точка) или None
+        """
+        if not self._gaps:
+            return (0, self.perimeter) if length <= self.perimeter else None
+        position = self._by_length.bisect_left((length,))
+        if position == len(self._by_length):
+            return None
+        _, _, key = min(
+            self._by_length.islice(position),
+            key=lambda gap: (gap[1] - point) % self.perimeter,
+        )
+        return self._gaps[key][:2]
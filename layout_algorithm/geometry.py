@@ -0,0 +1,131 @@
+"""Компактные геометрические типы алгоритма расстановки.
+
+Внутри алгоритма точки и прямоугольники хранятся в объектах со
+`__slots__`, а словарное представление {"north_west": {"x": 0, "y": 0}, ...}
+строится только на границе API (входные данные и результат).
+"""
+
+# какие координаты прямоугольника соответствуют углам объекта в зависимости
+# от стены, к которой он примыкает: "north" углы всегда лежат на стене,
+# "west" - левый угол, если смотреть из комнаты на стену
+CORNER_LAYOUT = {
+    1: {
+        "north_west": ("x0", "y0"),
+        "north_east": ("x0", "y1"),
+        "south_west": ("x1", "y0"),
+        "south_east": ("x1", "y1"),
+    },
+    2: {
+        "north_west": ("x0", "y1"),
+        "north_east": ("x1", "y1"),
+        "south_west": ("x0", "y0"),
+        "south_east": ("x1", "y0"),
+    },
+    3: {
+        "north_west": ("x1", "y1"),
+        "north_east": ("x1", "y0"),
+        "south_west": ("x0", "y1"),
+        "south_east": ("x0", "y0"),
+    },
+    4: {
+        "north_west": ("x1", "y0"),
+        "north_east": ("x0", "y0"),
+        "south_west": ("x1", "y1"),
+        "south_east": ("x0", "y1"),
+    },
+}
+# объект, не примыкающий ни к одной стене, описывается как у первой стены
+CORNER_LAYOUT[None] = CORNER_LAYOUT[1]
+
+
+class Point:
+    """Точка в координатах комнаты."""
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def from_dict(cls, coordinates: dict) -> "Point":
+        return cls(coordinates["x"], coordinates["y"])
+
+    def to_dict(self) -> dict:
+        return {"x": self.x, "y": self.y}
+
+    def __eq__(self, other):
+        if not isinstance(other, Point):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def __repr__(self):
+        return f"Point(x={self.x}, y={self.y})"
+
+
+class Rect:
+    """Прямоугольник, стороны которого параллельны стенам комнаты.
+
+    Хранит противоположные углы (x0, y0) и (x1, y1), где x0 <= x1 и
+    y0 <= y1, и номер стены, к которой примыкает объект (None, если объект
+    стоит не у стены).
+    """
+
+    __slots__ = ("x0", "y0", "x1", "y1", "wall")
+
+    def __init__(self, x0, y0, x1, y1, wall=None):
+        self.x0 = x0
+        self.y0 = y0
+        self.x1 = x1
+        self.y1 = y1
+        self.wall = wall
+
+    @classmethod
+    def from_dict(cls, figure: dict, wall=None) -> "Rect":
+        """Создает прямоугольник из словаря углов объекта."""
+        xs = [corner["x"] for corner in _corners(figure)]
+        ys = [corner["y"] for corner in _corners(figure)]
+        return cls(min(xs), min(ys), max(xs), max(ys), wall)
+
+    def corner(self, name: str) -> Point:
+        """Угол объекта по его названию ("north_west", ...)."""
+        x_name, y_name = CORNER_LAYOUT[self.wall][name]
+        return Point(getattr(self, x_name), getattr(self, y_name))
+
+    def to_dict(self) -> dict:
+        """Словарное представление углов объекта для API."""
+        return {
+            name: {"x": getattr(self, x_name), "y": getattr(self, y_name)}
+            for name, (x_name, y_name) in CORNER_LAYOUT[self.wall].items()
+        }
+
+    def as_tuple(self) -> tuple:
+        return self.x0, self.y0, self.x1, self.y1
+
+    def __eq__(self, other):
+        if not isinstance(other, Rect):
+            return NotImplemented
+        return (
+            self.as_tuple() == other.as_tuple() and self.wall == other.wall
+        )
+
+    def __hash__(self):
+        return hash((self.as_tuple(), self.wall))
+
+    def __repr__(self):
+        return (
+            f"Rect(x0={self.x0}, y0={self.y0}, x1={self.x1}, y1={self.y1}, "
+            f"wall={self.wall})"
+        )
+
+
+def _corners(figure: dict):
+    return (
+        figure["north_west"],
+        figure["north_east"],
+        figure["south_west"],
+        figure["south_east"],
+    )
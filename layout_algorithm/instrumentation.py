@@ -0,0 +1,147 @@
+"""Замеры этапов алгоритма расстановки.
+
+`LayoutStats` копит длительности этапов и счетчики (смещения, проверки
+пересечений, отклоненные позиции) по каждой единице мебели. Если сбор
+выключен, используется `NULL_STATS` с пустыми методами, поэтому замеры
+можно оставить включаемыми в рабочем окружении. Сбор включается параметром
+`collect_stats` алгоритма, сервис передает в него настройку LAYOUT_STATS.
+"""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _Stage:
+    """Секундомер одного этапа, переиспользуемый между вызовами."""
+
+    __slots__ = ("stats", "name", "started")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        stages = self.stats.item["stages"]
+        stages[self.name] = (
+            stages.get(self.name, 0.0) + time.perf_counter() - self.started
+        )
+        return False
+
+
+class LayoutStats:
+    """Длительности этапов и счетчики одного запуска алгоритма.
+
+    Attributes:
+        items: замеры по каждой единице мебели в порядке размещения
+        item: замеры текущей единицы мебели (или общих этапов запуска)
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.items = []
+        self.item = self._new_item(None)
+        self._common = self.item
+        self._stages = {}
+
+    @staticmethod
+    def _new_item(index):
+        return {"index": index, "stages": {}, "counters": {}}
+
+    def stage(self, name: str) -> _Stage:
+        """Контекстный менеджер, замеряющий этап name."""
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _Stage(self, name)
+        return stage
+
+    def count(self, name: str, value: int = 1):
+        """Увеличивает счетчик name текущей единицы мебели."""
+        counters = self.item["counters"]
+        counters[name] = counters.get(name, 0) + value
+
+    def start_item(self, index: int):
+        """Начинает замеры единицы мебели с индексом index."""
+        self.item = self._new_item(index)
+        self.items.append(self.item)
+
+    def finish_item(self):
+        """Возвращается к замерам общих этапов запуска."""
+        self.item = self._common
+
+    def as_dict(self) -> dict:
+        """Замеры с итогами по этапам и счетчикам."""
+        stages, counters = {}, {}
+        for item in (self._common, *self.items):
+            for name, value in item["stages"].items():
+                stages[name] = stages.get(name, 0.0) + value
+            for name, value in item["counters"].items():
+                counters[name] = counters.get(name, 0) + value
+        return {
+            "stages": stages,
+            "counters": counters,
+            "items": self.items,
+        }
+
+    def log(self, level: int = logging.INFO):
+        """Отправляет итоги замеров в logging."""
+        if logger.isEnabledFor(level):
+            stats = self.as_dict()
+            logger.log(
+                level,
+                "Замеры расстановки: %s мебели, этапы %s, счетчики %s",
+                len(self.items),
+                {name: round(value, 6) for name, value in stats["stages"].items()},
+                stats["counters"],
+                extra={"layout_stats": stats},
+            )
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class NullStats:
+    """Заглушка `LayoutStats` для выключенного сбора замеров."""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name: str) -> _NullStage:
+        return self._stage
+
+    def count(self, name: str, value: int = 1):
+        pass
+
+    def start_item(self, index: int):
+        pass
+
+    def finish_item(self):
+        pass
+
+    def as_dict(self):
+        return None
+
+    def log(self, level: int = logging.INFO):
+        pass
+
+
+NULL_STATS = NullStats()
+
+
+def make_stats(enabled: bool = False):
+    """Сборщик замеров, если сбор выключен - `NULL_STATS`."""
+    return LayoutStats() if enabled else NULL_STATS
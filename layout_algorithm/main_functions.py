@@ -1,25 +1,41 @@
 """Algorithm."""
 
+import math
 import random
-from .crossover_checks import checks
-from .corner_markings import corner_markings
+
+import numpy as np
+
+from .budget import LayoutBudget
+from .collision import CollisionEngine
+from .corner_markings import corner_markings, footprints
+from .exceptions import PlacementError
+from .free_intervals import nearest_free_position, room_free_intervals
+from .gap_index import GapIndex
+from .instrumentation import NULL_STATS
+from .geometry import Point, Rect
 from .offset_finder_convert import MiddlePointAndShift
+from .perimeter import PerimeterGeometry
+
+
+# количество смещенных позиций, проверяемых одним вызовом free_mask в
+# режиме "step"
+STEP_BATCH = 64
+# на какую долю периметра режим "sweep" может сдвинуть объект, чтобы убрать
+# пересечение из-за погрешности дробных вычислений
+SNAP_TOLERANCE = 1e-9
 
 
 class FurnitureArrangement(MiddlePointAndShift):
-    def __init__(self):
-        coordinates, free_space, sorted_points = [], [], []
+    # способы поиска места для мебели: "sweep" - сразу в ближайший свободный
+    # интервал периметра, "step" - пошаговым смещением вдоль периметра
+    PLACEMENT_MODES = ("sweep", "step")
+
+    def __init__(self, placement_mode: str = "sweep"):
+        if placement_mode not in self.PLACEMENT_MODES:
+            raise ValueError(f"Неизвестный способ размещения: {placement_mode}")
         wall_perimetr = 0
         room_coordinates = {}
         room_coordinates_tuple, walls_length = (), ()
-        # хранение координат по схеме "ключ объекта:
-        # (координаты, маркеры углов, маркеры точек)
-        self.coordinates = coordinates
-        # хранение расстояний между мебелью через запятую (в виде координат)
-        self.free_space = free_space
-        # хранения точек на прямой из сложенных сторон комнаты для правильной
-        # вставки получившихся координат в список
-        self.sorted_points = sorted_points
         # хранения периметра комнаты для удобства обращения из функций
         self.wall_perimetr = wall_perimetr
         # хранение координат комнаты для удобства обращения из функций
@@ -28,177 +44,260 @@ class FurnitureArrangement(MiddlePointAndShift):
         self.room_coordinates_tuple = room_coordinates_tuple
         # хранение длин стен для удобства обращения
         self.walls_length = walls_length
-
-    def free_space_algorithm(self, objects: list) -> dict:
-        """На вход подается список с координатами углов объектов.
-
-        Координаты между друг другом минусим, находим по ближайшим
-        неприлегающим углам расстояние по модулю в виде гипотенузы
-        (вычитание по иксу -- это один катет, вычитание по игрику -- другой).
-        И записыванием самое большое расстояние в переменную. Углы разбиты по
-        сторонам света: north_west, north-east, south-west, south-east.
-        Отдельно так же идет значение и длина стены
-        "walls_length": {"first_wall": 1, "second_wall": 2, "third_wall": 1,
-        "fourth_wall": 2}
-        """
-        length = {}
-        counter = 1
-
-        def core_and_output(first_object, second_object):
-
-            first_right_corner = "north_east"
-            second_left_corner = "north_west"
-
-            if first_object["north_east"] in self.room_coordinates_tuple:
-                first_right_corner = "south_east"
-            if (
-                second_object[counter]["north_west"]
-                in self.room_coordinates_tuple
-            ):
-                second_left_corner = "south_west"
-
-            first_point = self.convert_coordinates_to_line(
-                first_object[first_right_corner], self.walls_length,
-            )
-            second_point = self.convert_coordinates_to_line(
-                second_object[counter][second_left_corner], self.walls_length,
-            )
-            distance = 0
-            if second_point >= first_point:
-                distance = second_point - first_point
-            elif second_point < first_point:
-                distance = second_point + (self.wall_perimetr - first_point)
-
-            length[distance] = {
-                "left_corner": first_object[first_right_corner],
-                "right_corner": second_object[counter][second_left_corner],
-            }
-            # расстояния могут быть одинаковые, но нам по сути неважно какой
-            # из вариантов брать, а значит мы можем просто перезаписать ключ
-            # словаря
-
-        for item in objects:
-            if counter == len(objects):
-                counter = 0
-            core_and_output(item, objects)
-            counter += 1
-        return length[max(length)]
+        # префиксные суммы длин стен и преобразования точек периметра
+        self.geometry = None
+        # хранение всех размещенных в комнате прямоугольников для проверки
+        # пересечений
+        self.collision = None
+        # свободные промежутки между объектами у стен, обновляются при каждом
+        # размещении
+        self.gaps = None
+        # прямоугольники дверей, окон и уже расставленных объектов по их
+        # ключам
+        self.openings = []
+        # способ поиска места для мебели
+        self.placement_mode = placement_mode
+        # размещенная мебель в порядке размещения:
+        # (индекс мебели, точка на прямой, прямоугольник, ключ объекта)
+        self.placed = []
+        # количество дверей, окон и уже расставленных объектов комнаты
+        self.openings_count = 0
+        # ограничение времени и итераций расчета, по умолчанию без ограничений
+        self.budget = LayoutBudget()
+        # замеры этапов расчета, по умолчанию не собираются
+        self.stats = NULL_STATS
+        # количество сравнений объектов комнаты при поиске свободных
+        # интервалов в режиме "sweep"
+        self.sweep_comparisons = 0
 
     def placing_in_coordinates(
         self,
-        data: dict,
-        figure: dict,
-        walls: dict,
+        data: Point,
+        figure: Rect,
         object_attributes: dict,
-    ) -> bool:
-        """Проверка возможности резервирования места для мебели в комнате.
+        wall: int = None,
+    ) -> tuple:
+        """Резервирование места для мебели в комнате.
+
+        Объект смещается вдоль периметра, пока `CollisionEngine` не
+        подтвердит, что он не пересекается ни с одним объектом комнаты и не
+        выходит за ее пределы.
 
         Args:
-            object_attributes:
-            data:
-            figure: координаты для мебели.
-            {"north_west": {"x": 0, "y": 0},
-            "north_east": {"x": 0, "y": 0},
-            "south_west": {"x": 0, "y": 0},
-            "south_east": {"x": 0, "y": 0}}
-            walls: стены комнаты начиная от левой
-            {"first_wall": 0,
-            "second_wall": 0,
-            "third_wall": 0,
-            "fourth_wall":0}
-            length_and_width: ширина и длина располагаемого объекта
+            data: точка на стене, к которой примыкает центр объекта
+            figure: прямоугольник мебели в начальной точке
+            object_attributes: ширина и длина располагаемого объекта
+            wall: стена, к которой нужно поставить объект (только для
+                режима "sweep", None - любая стена)
 
         Returns:
-            bool: True, если место зарезервировано, иначе False
+            tuple: точка на прямой периметра и прямоугольник объекта
         """
+        if self.placement_mode == "sweep":
+            return self.placing_by_sweep(data, object_attributes, wall)
 
-        def displacement():
-            nonlocal figure, data, objects_counter, cycle_counter, cycle_border, displacement_start
-            displacement_start += data["displacement_value"]
-
-            data["x"], data["y"] = self.offset(
-                data,
-                self.wall_perimetr,
-                self.walls_length,
-            ).values()
-            wall = self.wall_definition(data)
-            figure = corner_markings(object_attributes, data, wall)
-            objects_counter = 0
-            cycle_counter += 1
-
-        # Задаем переменные, чтобы определить случаи для выхода из цикла
-        # переменная необходимая для учета всех объектов, относительно которых
-        # делается проверка на пересечение
-        objects_counter = 0
-        # переменная для подсчета количества циклов, дабы они не были
-        # бесконечным
-        cycle_counter = 0
         # переменная, указывающая при каком значении будет критическая ошибка
         # о невозможности размещения
         cycle_border = self.wall_perimetr
-        # Переменная, выводящая из общего цикла при не пересечении объектов
-        breaker = 0
-
-        # Задаем данные для дальнейшей их отправки в функцию переноса объекта
-        # переменная необходима для обозначения стартовой точки, относительно
-        # которой будет смещение
-        displacement_start = 0
-        # указываем сторону для начального смещения
-        data["shift_method"] = "plus"
-
         # указываем значение на которое будет смещаться объект в зависимости
         # от разрядности периметра
-        if self.wall_perimetr < 100:
-            data["displacement_value"] = 1
-        elif self.wall_perimetr < 1000:
-            data["displacement_value"] = 10
-        elif self.wall_perimetr < 10000:
-            data["displacement_value"] = 100
-        elif self.wall_perimetr < 100000:
-            data["displacement_value"] = 1000
-
-        # сам цикл, в котором мы пытаемся разметить объект заданное количество
-        # циклов и проверяем пересечения со всеми объектами
-        while cycle_counter < cycle_border and objects_counter < len(
-            self.coordinates,
-        ):
-            figure_2 = self.coordinates[objects_counter]
-            if checks(figure, figure_2, walls):
-                # добавляем единицу брейкеру за каждый прошедший проверки
-                # пересечения объект, чтобы организовать выход из цикла
-                breaker += 1
-                objects_counter += 1
-            else:
-                displacement()
-            # если пересечения со всеми объектами были проверены успешно, то
-            # выходим из цикла
-            if breaker >= len(self.coordinates):
-                break
-            if cycle_counter >= cycle_border:
-                raise Exception("Превышено число попыток на размещение")
-
-            breaker = 1
-
-        # Если все проверки прошли, добавляем координаты мебели в словарь
-        # coordinates
-        final_point = self.convert_coordinates_to_line(data, self.walls_length)
-        # Тут один сплошной вопрос, должно быть bool!!!
-        return (
-            self.convert_coordinates_to_line(data, self.walls_length),
-            figure,
+        # (1 для периметра меньше 100, 10 - меньше 1000 и так далее)
+        displacement_value = 10 ** max(
+            len(str(int(self.wall_perimetr))) - 2, 0,
+        )
+        geometry = self.geometry
+        stats = self.stats
+
+        stats.count("checks")
+        if self.collision.is_free(figure):
+            return geometry.to_line(data), figure
+        stats.count("rejections")
+        stats.count("displacements")
+        self.budget.tick()
+
+        # объект смещается, пока пересекается хотя бы с одним объектом
+        # комнаты. Смещенные позиции проверяются пачками: прямоугольники всей
+        # пачки получаются сложением шаблона мебели с точками на стенах и
+        # проверяются одним вызовом free_mask
+        dot = geometry.to_line(data)
+        remaining = math.ceil(cycle_border) - 1
+        while remaining > 0:
+            count = min(STEP_BATCH, remaining)
+            remaining -= count
+            points, walls = [], []
+            for _ in range(count):
+                data = geometry.to_point(dot + displacement_value)
+                dot = geometry.to_line(data)
+                points.append(data)
+                walls.append(self.wall_definition(data))
+            free = np.flatnonzero(
+                self.collision.free_mask(
+                    footprints(
+                        object_attributes,
+                        np.array([point.x for point in points], dtype=np.float64),
+                        np.array([point.y for point in points], dtype=np.float64),
+                        np.array(walls, dtype=np.intp),
+                    ),
+                ),
+            )
+            if len(free):
+                position = int(free[0])
+                stats.count("checks", position + 1)
+                stats.count("rejections", position)
+                stats.count("displacements", position)
+                self.budget.tick(position)
+                return (
+                    geometry.to_line(points[position]),
+                    corner_markings(
+                        object_attributes, points[position], walls[position],
+                    ),
+                )
+            stats.count("checks", count)
+            stats.count("rejections", count)
+            stats.count("displacements", count)
+            self.budget.tick(count)
+        raise PlacementError("Превышено число попыток на размещение")
+
+    def placing_by_sweep(
+        self, data: Point, object_attributes: dict, wall: int = None,
+    ) -> tuple:
+        """Размещение мебели в ближайшем к точке свободном месте.
+
+        Свободные интервалы периметра вычисляются одним проходом по
+        отсортированным объектам комнаты, поэтому объект сразу переносится в
+        ближайшую позицию, где он помещается, без пошагового смещения.
+
+        Args:
+            data: точка на стене, к которой примыкает центр объекта
+            object_attributes: ширина и длина располагаемого объекта
+            wall: стена, к которой нужно поставить объект (None - любая)
+
+        Returns:
+            tuple: точка на прямой периметра и прямоугольник объекта
+        """
+        self.budget.tick()
+        intervals, comparisons = room_free_intervals(
+            self.collision.boxes, object_attributes, self.walls_length,
+        )
+        self.sweep_comparisons += comparisons
+        self.stats.count("sweep_comparisons", comparisons)
+        if wall is not None:
+            intervals = [item for item in intervals if item[2] == wall]
+        position = nearest_free_position(
+            intervals,
+            self.geometry.to_line(data),
+            self.wall_perimetr,
+        )
+        if position is None:
+            self.stats.count("rejections")
+            raise PlacementError("Превышено число попыток на размещение")
+        final_point, wall = position
+        center = self.geometry.to_point(final_point)
+        figure = corner_markings(object_attributes, center, wall)
+        # интервалы считаются на прямой периметра, и при переводе в
+        # координаты комнаты дробные размеры могут дать пересечение порядка
+        # 1e-12, поэтому итоговое место один раз проверяется CollisionEngine
+        self.stats.count("checks")
+        if self.collision.is_free(figure):
+            return final_point, figure
+        self.stats.count("rejections")
+        figure = self.snap_figure(figure)
+        if figure is None:
+            raise PlacementError("Превышено число попыток на размещение")
+        north_west = figure.corner("north_west")
+        north_east = figure.corner("north_east")
+        center = Point(
+            (north_west.x + north_east.x) / 2, (north_west.y + north_east.y) / 2,
         )
+        return self.geometry.to_line(center), figure
+
+    def snap_figure(self, figure: Rect):
+        """Сдвигает объект вдоль стены к стороне соседнего объекта.
+
+        Исправляет пересечения с объектами комнаты и ее стенами, вызванные
+        погрешностью дробных вычислений: объект ставится вплотную к стороне,
+        которую он задевает не больше чем на `SNAP_TOLERANCE` периметра.
+
+        Returns:
+            Rect | None: ближайшее свободное положение объекта или None, если
+            такого нет
+        """
+        tolerance = SNAP_TOLERANCE * self.wall_perimetr
+        # индекс координаты вдоль стены в (x0, y0, x1, y1)
+        axis = 1 if figure.wall in (1, 3) else 0
+        box = figure.as_tuple()
+        low, high = box[axis], box[axis + 2]
+        size = high - low
+        limit = self.walls_length[0] if axis else self.walls_length[1]
+        # (новая нижняя граница, новая верхняя граница)
+        bounds = [(0, size), (limit - size, limit)]
+        for other in self.collision.boxes:
+            bounds.append((other[axis + 2], other[axis + 2] + size))
+            bounds.append((other[axis] - size, other[axis]))
+        candidates = sorted(
+            (abs(new_low - low), new_low, new_high)
+            for new_low, new_high in bounds
+            if abs(new_low - low) <= tolerance
+        )
+        for _, new_low, new_high in candidates:
+            coordinates = list(box)
+            coordinates[axis], coordinates[axis + 2] = new_low, new_high
+            snapped = Rect(*map(float, coordinates), figure.wall)
+            self.stats.count("checks")
+            if self.collision.is_free(snapped):
+                return snapped
+            self.stats.count("rejections")
+        return None
 
     def data_preprocessing(self, room_size, doors_and_windows):
         """Функция необходима для размещения данных в глобальных координатах
         и подготовки их к дальнейшей обработке в функциях
 
+        Двери, окна и уже расставленные объекты переводятся из словарей API в
+        прямоугольники. Объекты у стен упорядочиваются по положению на
+        периметре, объекты посреди комнаты учитываются только при проверке
+        пересечений.
+
         Args:
+            room_size: длины стен комнаты
+            doors_and_windows: координаты углов дверей, окон и мебели
+        """
+        self.prepare_room(room_size)
+        self.add_openings(doors_and_windows)
 
-        Returns:
+    def add_openings(self, doors_and_windows):
+        """Добавляет в подготовленную комнату двери, окна и уже
+        расставленные объекты.
+
+        Добавлять их можно только до размещения мебели: ключи объектов
+        комнаты должны идти перед ключами размещенной мебели.
 
+        Args:
+            doors_and_windows: координаты углов дверей, окон и мебели
+        """
+        # Функция определения стены по координатам для отправки ее в
+        # дальнейшем в corner_markings
+        for item in doors_and_windows:
+            middle_point = Point(
+                (item["north_east"]["x"] + item["north_west"]["x"]) / 2,
+                (item["north_east"]["y"] + item["north_west"]["y"]) / 2,
+            )
+            figure = Rect.from_dict(item, self.wall_definition(middle_point))
+            key = self.collision.add(figure)
+            self.openings.append(figure)
+            if figure.wall is not None:
+                self.gaps.insert(key, *self.figure_interval(figure))
+        self.openings_count = len(self.collision)
+
+    def prepare_room(self, room_size: dict):
+        """Геометрия пустой комнаты и пустые хранилища объектов.
+
+        Args:
+            room_size: длины стен комнаты
         """
         self.walls_length = tuple(room_size.values())
         self.wall_perimetr = sum(self.walls_length)
+        self.geometry = PerimeterGeometry.for_walls(self.walls_length)
 
         self.room_coordinates = {
             "south_west": {"x": 0, "y": 0},
@@ -210,55 +309,61 @@ class FurnitureArrangement(MiddlePointAndShift):
             "south_east": {"x": room_size["second_wall"], "y": 0},
         }
 
-        self.room_coordinates_tuple = tuple(self.room_coordinates.values())
-
-        # Функция определения стены по координатам для отправки ее в
-        # дальнейшем в corner_markings
-        for item in doors_and_windows:
-            middle_point = {
-                "x": (item["north_east"]["x"] + item["north_west"]["x"]) / 2,
-                "y": (item["north_east"]["y"] + item["north_west"]["y"]) / 2,
-            }
-            self.coordinates.append(item)
-            self.sorted_points.append(
-                self.convert_coordinates_to_line(
-                    middle_point,
-                    self.walls_length,
-                ),
-            )
-        self.sorted_points.sort()
+        self.room_coordinates_tuple = tuple(
+            Point.from_dict(corner)
+            for corner in self.room_coordinates.values()
+        )
+        self.collision = CollisionEngine(room_size)
+        self.gaps = GapIndex(self.wall_perimetr)
+        self.openings = []
+        self.placed = []
+        self.openings_count = 0
+        self.sweep_comparisons = 0
+
+    def figure_interval(self, figure: Rect) -> tuple:
+        """Отрезок периметра, который занимает объект у стены."""
+        return self.convert_rect_to_line(
+            figure, self.walls_length, self.room_coordinates_tuple,
+        )
 
-    def wall_definition(self, dot: dict):
-        """
+    def wall_definition(self, dot: Point):
+        """Функция определяет номер стены, на которой лежит точка.
 
         Args:
+            dot: точка на периметре комнаты
 
         Returns:
-
+            int | None: номер стены или None, если точка не лежит на стене
         """
 
-        if dot["y"] == 0:
+        if dot.y == 0:
             return 4
-        elif dot["x"] == 0:
+        elif dot.x == 0:
             return 1
-        elif dot["y"] == self.room_coordinates["north_east"]["y"]:
+        elif dot.y == self.walls_length[0]:
             return 2
-        elif dot["x"] == self.room_coordinates["north_east"]["x"]:
+        elif dot.x == self.walls_length[1]:
             return 3
-        self.room_coordinates = 0
+        return None
 
-    def shuffle_furniture(self, furniture: list, mode: str) -> list:
+    def shuffle_furniture(
+        self, furniture: list, mode: str, seed: int = None,
+    ) -> list:
         """Функция меняет позиции внутри списка мебели местами для
         предоставления пользователю других результатов при повторной генерации
 
         Args:
             furniture: список мебели, необходимой для перестановки
             mode: степень серьезности перестановки
+            seed: зерно генератора случайных чисел для режима "hard", чтобы
+                вариант можно было воспроизвести
 
         Returns:
-            list: список мебели с перемещенными позициями
+            list: новый список мебели с перемещенными позициями, исходный
+            список не изменяется
 
         """
+        furniture = list(furniture)
 
         def light_or_medium_shuffle(mode: str) -> list:
             """Light mode shuffle have swap position with one step.
@@ -278,7 +383,7 @@ class FurnitureArrangement(MiddlePointAndShift):
 
         def hard_shuffle():
             """Hard mode shuffle have random swap position."""
-            random.shuffle(furniture)
+            random.Random(seed).shuffle(furniture)
 
         # Key for selection mode
         if mode == "hard":
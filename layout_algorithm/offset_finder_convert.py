@@ -1,5 +1,8 @@
 from typing import Union
 
+from .geometry import Point, Rect
+from .perimeter import PerimeterGeometry
+
 
 class MiddlePointAndShift:
     """Функция для нахождения средней точки.
@@ -11,78 +14,77 @@ class MiddlePointAndShift:
     """
 
     def convert_coordinates_to_line(
-        self, coordinates: dict, walls_length,
+        self, coordinates: Point, walls_length,
     ) -> Union[float, int]:
         """Функция преобразует координаты в точку на прямой.
 
         Args:
+            coordinates: точка на одной из стен комнаты
+            walls_length: длины стен начиная с первой
         Returns:
-
+            float | int: точка на прямой из сложенных сторон комнаты
         """
-        if coordinates["x"] == 0:
-            return coordinates["y"]
-        elif coordinates["y"] == walls_length[0]:
-            return walls_length[0] + coordinates["x"]
-        elif coordinates["x"] == walls_length[1]:
-            return sum(walls_length[:3]) - coordinates["y"]
-        return sum(walls_length) - coordinates["x"]
+        return PerimeterGeometry.for_walls(walls_length).to_line(coordinates)
 
     def convert_line_to_coordinates(
         self, dot: Union[float, int], walls_length, wall_perimetr,
-    ) -> dict:
-        """Функция преобразует точку на прямой в координаты."""
-        if 0 <= dot <= walls_length[0]:
-            return {"x": 0, "y": dot}
-        elif walls_length[0] < dot <= sum(walls_length[:2]):
-            return {"x": dot - walls_length[0], "y": walls_length[0]}
-        elif sum(walls_length[:2]) < dot <= sum(walls_length[:3]):
-            return {"x": walls_length[1], "y": sum(walls_length[:3]) - dot}
-        elif sum(walls_length[:3]) < dot <= wall_perimetr:
-            return {"x": wall_perimetr - dot, "y": 0}
-        raise Exception(
-            "Ошибка данных, нет возможности разместить среднюю точку на одной "
-            "из стен комнаты.", "Входящие данные:",
-            dot,
-            walls_length,
-            wall_perimetr,
-        )
+    ) -> Point:
+        """Функция преобразует точку на прямой в координаты.
+
+        Точка за пределами периметра переносится на него по модулю.
+        """
+        return PerimeterGeometry.for_walls(walls_length).to_point(dot)
 
-    def middle_point_finder(self, points: dict, wall_perimetr, walls_length):
+    def convert_rect_to_line(
+        self, rect: Rect, walls_length, room_corners: tuple,
+    ) -> tuple:
+        """Функция преобразует объект у стены в отрезок на прямой.
 
-        point_1 = self.convert_coordinates_to_line(
-            points["left_corner"], walls_length,
-        )
-        point_2 = self.convert_coordinates_to_line(
-            points["right_corner"], walls_length,
+        Если угол объекта совпадает с углом комнаты, то отрезок продлевается
+        на глубину объекта вдоль соседней стены.
+        """
+        left_corner = rect.corner("north_west")
+        if left_corner in room_corners:
+            left_corner = rect.corner("south_west")
+        right_corner = rect.corner("north_east")
+        if right_corner in room_corners:
+            right_corner = rect.corner("south_east")
+        return (
+            self.convert_coordinates_to_line(left_corner, walls_length),
+            self.convert_coordinates_to_line(right_corner, walls_length),
         )
+
+    def middle_point_finder(self, points: tuple, wall_perimetr, walls_length):
+        """Функция находит середину промежутка между двумя точками на прямой.
+
+        Args:
+            points: левая и правая границы промежутка на прямой периметра
+        """
+        point_1, point_2 = points
         middle_point = (
             (point_2 + point_1) / 2
             if point_1 < point_2
             else (point_2 + point_1 + wall_perimetr) / 2
         )
-        if middle_point > wall_perimetr:
-            middle_point = middle_point - wall_perimetr
         return self.convert_line_to_coordinates(
             middle_point, walls_length, wall_perimetr,
         )
 
-    def offset(self, data, wall_perimetr, walls_length):
-
-        point = self.convert_coordinates_to_line(
-            {"x": data["x"], "y": data["y"]}, walls_length,
-        )  # отправить дотс целиком
-        if data["shift_method"] == "plus":
-            shifted_point = point + data["displacement_value"]
-        elif data["shift_method"] == "minus":
-            shifted_point = point - data["displacement_value"]
+    def offset(
+        self,
+        point: Point,
+        displacement_value,
+        wall_perimetr,
+        walls_length,
+        shift_method: str = "plus",
+    ) -> Point:
+        """Функция смещает точку вдоль периметра комнаты."""
+        geometry = PerimeterGeometry.for_walls(walls_length)
+        dot = geometry.to_line(point)
+        if shift_method == "plus":
+            shifted_point = dot + displacement_value
+        elif shift_method == "minus":
+            shifted_point = dot - displacement_value
         else:
             raise Exception("Неправильно введенный метод")
-
-        if shifted_point < 0:
-            shifted_point = wall_perimetr - abs(shifted_point)
-        elif shifted_point > wall_perimetr:
-            shifted_point = abs(shifted_point) - wall_perimetr
-
-        return self.convert_line_to_coordinates(
-            shifted_point, walls_length, wall_perimetr,
-        )
+        return geometry.to_point(shifted_point)
@@ -0,0 +1,204 @@
+"""Поиск лучшей расстановки перебором порядка мебели и стен.
+
+Результат `Core.algorithm_activation` полностью зависит от порядка мебели.
+Оптимизатор методом имитации отжига перебирает порядки и привязку мебели к
+стенам в пределах отведенного процессорного времени. Каждый кандидат
+оценивается инкрементально: общий с предыдущим кандидатом префикс уже
+размещенной мебели не пересчитывается, а откатывается только хвост.
+Оценки кандидатов запоминаются, поэтому повторно встреченный кандидат не
+расставляется заново.
+"""
+
+import math
+import random
+import time
+
+from .budget import LayoutBudget
+from .core import WALL_CHOICES, Core
+from .exceptions import BudgetExhausted, PlacementError
+from .result import LayoutResult
+from .snapshot import load_state
+
+# начальная температура отжига в долях периметра комнаты
+INITIAL_TEMPERATURE = 0.1
+
+
+class LayoutOptimizer:
+    """Имитация отжига над порядком мебели и выбором стен.
+
+    Кандидат - это список пар (индекс мебели, стена). Оценка кандидата:
+    сначала количество размещенной мебели, затем длина самого большого
+    оставшегося свободного промежутка вдоль стен.
+
+    Комната готовится один раз, а если передан снимок
+    `snapshot.prepare_state`, загружается из него.
+    """
+
+    def __init__(
+        self,
+        doors_and_windows: list,
+        furniture: list,
+        room_size: dict,
+        seed: int = 0,
+        state: bytes = None,
+    ):
+        self.doors_and_windows = doors_and_windows
+        self.furniture = furniture
+        self.room_size = room_size
+        self.random = random.Random(seed)
+        self.arrangement = Core()
+        if state is None:
+            self.arrangement.data_preprocessing(room_size, doors_and_windows)
+        else:
+            load_state(self.arrangement, state)
+        # примененная к arrangement последовательность:
+        # (индекс мебели, стена, удалось ли разместить)
+        self.applied = []
+        # оценки уже расставленных кандидатов
+        self.scores = {}
+        # количество оценок кандидатов
+        self.evaluations = 0
+
+    def score(self) -> float:
+        """Оценка текущей расстановки в arrangement."""
+        arrangement = self.arrangement
+        gap = arrangement.gaps.gap_length(*arrangement.gaps.largest())
+        # промежуток не длиннее периметра, поэтому каждая размещенная единица
+        # мебели важнее любого промежутка
+        return len(arrangement.placed) * arrangement.wall_perimetr + gap
+
+    def evaluate(self, candidate: list) -> float:
+        """Оценка кандидата.
+
+        Оценка запоминается только для того же самого кандидата: отраженный
+        при симметрии комнаты кандидат расставляется отдельно, так как
+        правила размещения не симметричны.
+        """
+        key = tuple(candidate)
+        score = self.scores.get(key)
+        if score is None:
+            score = self.scores[key] = self.apply(candidate)
+        return score
+
+    def apply(self, candidate: list) -> float:
+        """Расставляет мебель кандидата, переиспользуя общий префикс."""
+        prefix = 0
+        for applied, step in zip(self.applied, candidate):
+            if applied[:2] != step:
+                break
+            prefix += 1
+        self.applied = self.applied[:prefix]
+        self.arrangement.rollback(
+            sum(placed for *_, placed in self.applied),
+        )
+        for index, wall in candidate[prefix:]:
+            try:
+                self.arrangement.place_furniture(
+                    index, self.furniture[index], wall,
+                )
+                placed = True
+            except PlacementError:
+                placed = False
+            self.applied.append((index, wall, placed))
+        self.evaluations += 1
+        return self.score()
+
+    def neighbour(self, candidate: list) -> list:
+        """Случайный соседний кандидат: обмен двух позиций или смена стены."""
+        candidate = list(candidate)
+        if len(candidate) > 1 and self.random.random() < 0.5:
+            first, second = self.random.sample(range(len(candidate)), 2)
+            candidate[first], candidate[second] = (
+                candidate[second],
+                candidate[first],
+            )
+        else:
+            position = self.random.randrange(len(candidate))
+            index, _ = candidate[position]
+            candidate[position] = (index, self.random.choice(WALL_CHOICES))
+        return candidate
+
+    def run(
+        self, time_budget: float, max_iterations: int = None,
+    ) -> LayoutResult:
+        """Ищет лучшую расстановку в пределах процессорного времени.
+
+        Начальный кандидат расставляется всегда, даже при нулевом бюджете.
+
+        Args:
+            time_budget: процессорное время на поиск в секундах
+            max_iterations: ограничение количества кандидатов
+
+        Returns:
+            LayoutResult: лучшая найденная расстановка
+        """
+        current = [(index, None) for index in range(len(self.furniture))]
+        current_score = self.evaluate(current)
+        best, best_score = current, current_score
+        initial_temperature = (
+            INITIAL_TEMPERATURE * self.arrangement.wall_perimetr
+        )
+
+        # срок проверяется и внутри размещения кандидата, поэтому долгая
+        # расстановка одного кандидата не выходит за time_budget
+        budget = LayoutBudget(time_budget, clock=time.process_time)
+        started = budget.now()
+        self.arrangement.budget = budget
+        iteration = 0
+        while current and (
+            max_iterations is None or iteration < max_iterations
+        ):
+            elapsed = budget.now() - started
+            if elapsed >= time_budget:
+                break
+            iteration += 1
+            temperature = initial_temperature * (1 - elapsed / time_budget)
+            candidate = self.neighbour(current)
+            try:
+                candidate_score = self.evaluate(candidate)
+            except BudgetExhausted:
+                break
+            difference = candidate_score - current_score
+            if difference >= 0 or self.random.random() < math.exp(
+                difference / max(temperature, 1e-9),
+            ):
+                current, current_score = candidate, candidate_score
+                if current_score > best_score:
+                    best, best_score = current, current_score
+
+        self.arrangement.budget = LayoutBudget()
+        self.apply(best)
+        return self.arrangement.build_result(
+            self.doors_and_windows, self.furniture, self.room_size,
+        )
+
+
+def optimize_layout(
+    doors_and_windows: list,
+    furniture: list,
+    room_size: dict,
+    time_budget: float = 1.0,
+    max_iterations: int = None,
+    seed: int = 0,
+    state: bytes = None,
+) -> LayoutResult:
+    """Лучшая расстановка мебели, найденная за time_budget секунд.
+
+    Args:
+        doors_and_windows: координаты углов дверей, окон и мебели
+        furniture: размеры мебели и расположение ее розеток
+        room_size: длины стен комнаты
+        time_budget: процессорное время на поиск в секундах
+        max_iterations: ограничение количества кандидатов
+        seed: зерно генератора случайных чисел
+        state: снимок `snapshot.prepare_state` для doors_and_windows и
+            room_size
+
+    Returns:
+        LayoutResult: лучшая найденная расстановка, часть мебели может
+        остаться неразмещенной
+    """
+    optimizer = LayoutOptimizer(
+        doors_and_windows, furniture, room_size, seed, state,
+    )
+    return optimizer.run(time_budget, max_iterations)
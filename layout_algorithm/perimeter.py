@@ -0,0 +1,107 @@
+"""Геометрия развернутого периметра комнаты.
+
+Стены комнаты складываются в одну прямую: первая стена идет от точки (0, 0)
+вверх, вторая - вправо, третья - вниз, четвертая - влево. Префиксные суммы
+длин стен считаются один раз, а стена для точки на прямой находится через
+`bisect`.
+"""
+
+import bisect
+from functools import lru_cache
+from itertools import accumulate
+
+import numpy as np
+
+from .geometry import Point
+
+
+class PerimeterGeometry:
+    """Преобразования между координатами комнаты и точками на периметре."""
+
+    __slots__ = ("walls_length", "prefix", "perimeter")
+
+    def __init__(self, walls_length: tuple):
+        self.walls_length = tuple(walls_length)
+        # (0, L1, L1 + L2, L1 + L2 + L3, периметр)
+        self.prefix = tuple(accumulate(self.walls_length, initial=0))
+        self.perimeter = self.prefix[-1]
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def for_walls(walls_length: tuple) -> "PerimeterGeometry":
+        """Общий для одинаковых комнат экземпляр геометрии."""
+        return PerimeterGeometry(walls_length)
+
+    def wrap(self, dot):
+        """Возвращает точку, вышедшую за пределы периметра, на прямую."""
+        if dot < 0 or dot > self.perimeter:
+            return dot % self.perimeter
+        return dot
+
+    def to_line(self, point: Point):
+        """Переводит точку на стене в точку на прямой периметра."""
+        if point.x == 0:
+            return point.y
+        if point.y == self.walls_length[0]:
+            return self.prefix[1] + point.x
+        if point.x == self.walls_length[1]:
+            return self.prefix[3] - point.y
+        return self.perimeter - point.x
+
+    def to_point(self, dot) -> Point:
+        """Переводит точку на прямой периметра в координаты комнаты."""
+        dot = self.wrap(dot)
+        wall_index = bisect.bisect_left(self.prefix, dot, 1, 4)
+        if wall_index == 1:
+            return Point(0, dot)
+        if wall_index == 2:
+            return Point(dot - self.prefix[1], self.walls_length[0])
+        if wall_index == 3:
+            return Point(self.walls_length[1], self.prefix[3] - dot)
+        return Point(self.perimeter - dot, 0)
+
+    def wall_of(self, dot) -> int:
+        """Номер стены, на которой лежит точка на прямой периметра."""
+        return bisect.bisect_left(self.prefix, self.wrap(dot), 1, 4)
+
+    def to_line_many(self, xs, ys) -> np.ndarray:
+        """Переводит массивы координат x и y в точки на прямой периметра."""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        return np.select(
+            (
+                xs == 0,
+                ys == self.walls_length[0],
+                xs == self.walls_length[1],
+            ),
+            (
+                ys,
+                self.prefix[1] + xs,
+                self.prefix[3] - ys,
+            ),
+            self.perimeter - xs,
+        )
+
+    def to_points_many(self, dots) -> tuple:
+        """Переводит массив точек на прямой в координаты комнаты.
+
+        Точки за пределами периметра переносятся на него по модулю.
+
+        Returns:
+            tuple: массивы x, y и номеров стен
+        """
+        dots = np.asarray(dots, dtype=np.float64)
+        outside = (dots < 0) | (dots > self.perimeter)
+        dots = np.where(outside, np.mod(dots, self.perimeter), dots)
+        walls = np.searchsorted(self.prefix[1:4], dots, side="left") + 1
+        xs = np.select(
+            (walls == 1, walls == 2, walls == 3),
+            (0, dots - self.prefix[1], self.walls_length[1]),
+            self.perimeter - dots,
+        )
+        ys = np.select(
+            (walls == 1, walls == 2, walls == 3),
+            (dots, self.walls_length[0], self.prefix[3] - dots),
+            0,
+        )
+        return xs, ys, walls
@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class LayoutResult:
+    """Результат работы алгоритма в словарном представлении API.
+
+    Attributes:
+        room_size: длины стен комнаты
+        openings: двери, окна и уже расставленные объекты
+        placements: расставленная мебель, для каждой единицы указан ее индекс
+            во входном списке, стена, точка на прямой периметра и углы
+        power_sockets: координаты розеток {"x": 0, "y": 0}
+        unplaced: индексы мебели, которую не успели разместить до
+            исчерпания бюджета
+        stopped: причина остановки расчета ("deadline", "iterations",
+            "cancelled") или None, если расчет завершен
+        stats: замеры этапов и счетчики по мебели или None, если сбор
+            замеров выключен
+    """
+
+    room_size: dict
+    openings: list = field(default_factory=list)
+    placements: list = field(default_factory=list)
+    power_sockets: list = field(default_factory=list)
+    unplaced: list = field(default_factory=list)
+    stopped: str = None
+    stats: dict = None
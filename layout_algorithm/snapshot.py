@@ -0,0 +1,177 @@
+"""Компактные снимки состояния расчета расстановки.
+
+Снимок хранит то, что строит `data_preprocessing` и каждое размещение:
+длины стен, прямоугольники дверей, окон и мебели со стенами, отрезки
+индекса промежутков `GapIndex` и размещенную мебель.
+Все данные лежат плоскими массивами фиксированного типа после заголовка,
+поэтому снимок читается через `np.frombuffer`, без разбора вложенных
+словарей и без пересчета геометрии:
+
+    state = dump_state(arrangement)
+    load_state(Core(), state)
+
+Формат версионируется: снимок неизвестной версии не загружается, а
+вызывает `SnapshotError`. Способ проверки пересечений в снимок не
+входит, он берется у экземпляра, в который загружается снимок.
+"""
+
+import struct
+
+import numpy as np
+
+from .exceptions import SnapshotError
+from .gap_index import GapIndex
+from .geometry import Rect
+from .main_functions import FurnitureArrangement
+
+MAGIC = b"LAYS"
+# версия 2: симметрии комнаты больше не хранятся
+VERSION = 2
+# сигнатура, версия, длины стен, количество объектов, из них дверей и окон,
+# количество отрезков периметра
+HEADER = struct.Struct("<4sH4dIII")
+WALL_NAMES = ("first_wall", "second_wall", "third_wall", "fourth_wall")
+# стена объекта в снимке: 0 - объект не примыкает к стене
+NO_WALL = 0
+
+
+def dump_state(arrangement: FurnitureArrangement) -> bytes:
+    """Снимок подготовленной комнаты и размещенной мебели.
+
+    Args:
+        arrangement: экземпляр после `data_preprocessing` (и, возможно,
+            размещения части мебели)
+
+    Returns:
+        bytes: снимок в формате версии VERSION
+    """
+    boxes = np.ascontiguousarray(arrangement.collision.boxes, dtype="<f8")
+    walls = np.zeros(len(boxes), dtype=np.int8)
+    for key, figure in enumerate(arrangement.openings):
+        walls[key] = figure.wall or NO_WALL
+    for _, _, figure, key in arrangement.placed:
+        walls[key] = figure.wall or NO_WALL
+    intervals = arrangement.gaps.intervals
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        *arrangement.walls_length,
+        len(boxes),
+        arrangement.openings_count,
+        len(intervals),
+    )
+    return b"".join(
+        (
+            header,
+            boxes.tobytes(),
+            walls.tobytes(),
+            np.array(
+                [interval[:2] for interval in intervals], dtype="<f8",
+            ).tobytes(),
+            np.array(
+                [interval[2] for interval in intervals], dtype="<u4",
+            ).tobytes(),
+            np.array(
+                [index for index, *_ in arrangement.placed], dtype="<u4",
+            ).tobytes(),
+            np.array(
+                [point for _, point, *_ in arrangement.placed], dtype="<f8",
+            ).tobytes(),
+        ),
+    )
+
+
+def _read(data: bytes, offset: int, dtype: str, count: int) -> tuple:
+    array = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+    return array, offset + array.nbytes
+
+
+def load_state(arrangement: FurnitureArrangement, data: bytes):
+    """Восстанавливает состояние расчета из снимка `dump_state`.
+
+    После загрузки можно продолжать размещать мебель так же, как после
+    `data_preprocessing`: индексы размещенной мебели указывают на тот же
+    список мебели, для которого был сделан снимок.
+
+    Raises:
+        SnapshotError: данные не являются снимком поддерживаемой версии
+    """
+    if len(data) < HEADER.size:
+        raise SnapshotError("Снимок состояния слишком короткий")
+    (
+        magic, version, *walls_length, count, openings_count,
+        interval_count,
+    ) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("Данные не являются снимком состояния")
+    if version != VERSION:
+        raise SnapshotError(f"Неподдерживаемая версия снимка: {version}")
+    placed_count = count - openings_count
+    # объект - 4 координаты и стена, отрезок - 2 точки и ключ, мебель -
+    # индекс и точка на прямой периметра
+    expected = (
+        HEADER.size
+        + count * 33
+        + interval_count * 20
+        + placed_count * 12
+    )
+    if placed_count < 0 or len(data) != expected:
+        raise SnapshotError("Размер снимка не совпадает с заголовком")
+
+    offset = HEADER.size
+    boxes, offset = _read(data, offset, "<f8", count * 4)
+    walls, offset = _read(data, offset, "i1", count)
+    ends, offset = _read(data, offset, "<f8", interval_count * 2)
+    keys, offset = _read(data, offset, "<u4", interval_count)
+    indexes, offset = _read(data, offset, "<u4", placed_count)
+    points, offset = _read(data, offset, "<f8", placed_count)
+
+    arrangement.prepare_room(dict(zip(WALL_NAMES, walls_length)))
+    boxes = boxes.reshape(count, 4)
+    arrangement.collision.extend(boxes)
+    arrangement.gaps = GapIndex.from_intervals(
+        arrangement.wall_perimetr,
+        zip(ends[0::2].tolist(), ends[1::2].tolist(), keys.tolist()),
+    )
+    figures = [
+        Rect(*box, wall or None)
+        for box, wall in zip(boxes.tolist(), walls.tolist())
+    ]
+    arrangement.openings = figures[:openings_count]
+    arrangement.openings_count = openings_count
+    arrangement.placed = [
+        (index, point, figures[key], key)
+        for key, index, point in zip(
+            range(openings_count, count), indexes.tolist(), points.tolist(),
+        )
+    ]
+
+
+def prepare_state(doors_and_windows, room_size, state: bytes = None) -> bytes:
+    """Снимок подготовленной комнаты без мебели.
+
+    Если передан снимок state, комната не готовится заново: в нее из
+    снимка добавляются только doors_and_windows. Так к сохраненному снимку
+    комнаты с дверями и окнами добавляется уже расставленная мебель.
+
+    Args:
+        doors_and_windows: координаты углов дверей, окон и мебели
+        room_size: длины стен комнаты
+        state: снимок `prepare_state` той же комнаты
+
+    Raises:
+        SnapshotError: state не является снимком поддерживаемой версии,
+            сделан для комнаты другого размера или содержит
+            расставленную алгоритмом мебель
+    """
+    arrangement = FurnitureArrangement()
+    if state is None:
+        arrangement.data_preprocessing(room_size, doors_and_windows)
+        return dump_state(arrangement)
+    load_state(arrangement, state)
+    if arrangement.walls_length != tuple(room_size.values()):
+        raise SnapshotError("Снимок сделан для комнаты другого размера")
+    if arrangement.placed:
+        raise SnapshotError("В снимке уже есть расставленная мебель")
+    arrangement.add_openings(doors_and_windows)
+    return dump_state(arrangement)
@@ -0,0 +1,123 @@
+"""Симметрии прямоугольной комнаты вместе с ее дверями и окнами.
+
+Прямоугольная комната переходит в себя при отражениях относительно
+вертикальной и горизонтальной осей и повороте на 180 градусов, квадратная -
+еще и при поворотах на 90 градусов и отражениях относительно диагоналей.
+Симметрией расстановки считаются только те из них, при которых двери, окна
+и уже расставленные объекты переходят друг в друга.
+
+Симметрии используются только для удаления повторов среди готовых
+расстановок: расстановки, которые переходят друг в друга при симметрии,
+эквивалентны, поэтому из них достаточно вернуть одну (см.
+`variants.generate_variants`). Поиск места для мебели ими не сокращается:
+правила размещения - выбор самого большого промежутка и направление
+смещения вдоль периметра - не симметричны, и отраженный кандидат (порядок
+мебели и стены) может дать другую расстановку или разместить другое
+количество мебели.
+"""
+
+import numpy as np
+
+# точность в мм, с которой сравниваются координаты объектов
+PRECISION = 0
+
+
+class Symmetry:
+    """Преобразование комнаты ширины width (ось x) и высоты height (ось y).
+
+    Attributes:
+        name: название преобразования
+    """
+
+    __slots__ = ("name", "width", "height")
+
+    def __init__(self, name: str, width, height):
+        self.name = name
+        self.width = width
+        self.height = height
+
+    def __repr__(self):
+        return f"Symmetry({self.name})"
+
+    def apply(self, boxes: np.ndarray) -> np.ndarray:
+        """Образы прямоугольников (x0, y0, x1, y1) при преобразовании."""
+        x0, y0, x1, y1 = boxes.T
+        width, height = self.width, self.height
+        corners = {
+            "identity": (x0, y0, x1, y1),
+            "mirror_x": (width - x1, y0, width - x0, y1),
+            "mirror_y": (x0, height - y1, x1, height - y0),
+            "rotate_180": (width - x1, height - y1, width - x0, height - y0),
+            "transpose": (y0, x0, y1, x1),
+            "anti_transpose": (
+                width - y1, height - x1, width - y0, height - x0,
+            ),
+            "rotate_90": (width - y1, x0, width - y0, x1),
+            "rotate_270": (y0, height - x1, y1, height - x0),
+        }[self.name]
+        return np.stack(corners, axis=1)
+
+
+# названия всех преобразований квадрата
+TRANSFORMS = (
+    "identity",
+    "mirror_x",
+    "mirror_y",
+    "rotate_180",
+    "transpose",
+    "anti_transpose",
+    "rotate_90",
+    "rotate_270",
+)
+# преобразования, которые сохраняют любой прямоугольник
+RECTANGLE_TRANSFORMS = 4
+
+
+def _box_set(boxes: np.ndarray) -> np.ndarray:
+    """Округленные прямоугольники в лексикографическом порядке."""
+    rounded = np.round(boxes, PRECISION)
+    return rounded[np.lexsort(rounded.T[::-1])]
+
+
+def room_symmetries(walls_length: tuple, boxes: np.ndarray) -> tuple:
+    """Симметрии комнаты с объектами boxes.
+
+    Args:
+        walls_length: длины стен начиная с первой
+        boxes: двери, окна и объекты комнаты, массив формы (N, 4)
+
+    Returns:
+        tuple: симметрии `Symmetry`, первая из них - тождественная. Для
+        непрямоугольной комнаты - только тождественная.
+    """
+    height, width = walls_length[0], walls_length[1]
+    transforms = TRANSFORMS[:1]
+    if walls_length[0] == walls_length[2] and walls_length[1] == walls_length[3]:
+        transforms = TRANSFORMS if width == height else (
+            TRANSFORMS[:RECTANGLE_TRANSFORMS]
+        )
+    original = _box_set(boxes)
+    symmetries = []
+    for name in transforms:
+        symmetry = Symmetry(name, width, height)
+        if np.array_equal(_box_set(symmetry.apply(boxes)), original):
+            symmetries.append(symmetry)
+    return tuple(symmetries)
+
+
+def layout_key(placements: list, boxes: np.ndarray, symmetries: tuple) -> tuple:
+    """Ключ расстановки, одинаковый для расстановок, переходящих друг в
+    друга при симметрии комнаты.
+
+    Args:
+        placements: названия расставленной мебели
+        boxes: прямоугольники мебели, массив формы (N, 4)
+        symmetries: симметрии комнаты
+    """
+    keys = []
+    for symmetry in symmetries:
+        rounded = np.round(symmetry.apply(boxes), PRECISION).tolist()
+        keys.append(
+            tuple(sorted(zip(placements, map(tuple, rounded)))),
+        )
+    return min(keys)
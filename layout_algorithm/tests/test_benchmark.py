@@ -0,0 +1,62 @@
+import copy
+import unittest
+
+from layout_algorithm import benchmark
+from layout_algorithm.collision import figures_to_boxes, overlap_matrix
+
+
+class BenchmarkTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.catalog = benchmark.load_catalog()
+
+    def test_cases_are_reproducible(self):
+        """Случаи с одним зерном совпадают."""
+        self.assertEqual(
+            benchmark.generate_cases(3, self.catalog),
+            benchmark.generate_cases(3, self.catalog),
+        )
+
+    def test_openings_do_not_overlap(self):
+        """Сгенерированные двери и окна не пересекаются."""
+        case = benchmark.generate_case(1, 10000, 20, 1, self.catalog)
+        self.assertTrue(case["doors_and_windows"])
+        boxes = figures_to_boxes(case["doors_and_windows"])
+        overlaps = overlap_matrix(boxes, boxes)
+        self.assertEqual(overlaps.sum(), len(boxes))
+
+    def test_measure_and_compare(self):
+        """Ухудшение показателей больше порога считается регрессией."""
+        case = benchmark.generate_case(0, 10000, 5, 5, self.catalog)
+        baseline = benchmark.run_benchmark(repeats=1, cases=[case])
+        measured = baseline["cases"][0]
+        self.assertGreater(measured["collision_checks"], 0)
+        self.assertGreater(measured["sweep_comparisons"], 0)
+        self.assertGreater(measured["peak_memory"], 0)
+        self.assertEqual(benchmark.compare(baseline, baseline), [])
+
+        current = copy.deepcopy(baseline)
+        current["cases"][0]["collision_checks"] *= 2
+        regressions = benchmark.compare(baseline, current, threshold=0.5)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("collision_checks", regressions[0])
+
+    def test_infeasible_case(self):
+        """Отклоненный проверкой выполнимости случай замеряется без поиска."""
+        case = benchmark.generate_case(0, 2000, 0, 1, self.catalog)
+        case["furniture"] = [{"name": "wide", "length": 500, "width": 5000}]
+        measured = benchmark.run_benchmark(repeats=1, cases=[case])["cases"][0]
+        self.assertTrue(measured["infeasible"])
+        self.assertEqual(measured["placed"], 0)
+        self.assertEqual(measured["collision_checks"], 0)
+        self.assertIsNotNone(measured["error"])
+
+    def test_ordering_options(self):
+        """Порядок мебели и глубина возврата записываются в замеры."""
+        case = benchmark.generate_case(0, 10000, 5, 5, self.catalog)
+        measured = benchmark.run_benchmark(
+            repeats=1, cases=[case], ordering="area", backtrack_depth=2,
+        )
+        self.assertEqual(measured["meta"]["ordering"], "area")
+        self.assertEqual(measured["meta"]["backtrack_depth"], 2)
+        self.assertEqual(measured["cases"][0]["placed"], 5)
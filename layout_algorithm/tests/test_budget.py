@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+
+from layout_algorithm.budget import LayoutBudget
+from layout_algorithm.core import Core
+from layout_algorithm.exceptions import BudgetExhausted, PlacementError
+
+ROOM_SIZE = {
+    "first_wall": 3000,
+    "second_wall": 4000,
+    "third_wall": 3000,
+    "fourth_wall": 4000,
+}
+FURNITURE = [
+    {"name": "кровать", "length": 2000, "width": 1600},
+    {"name": "шкаф", "length": 600, "width": 1200},
+    {"name": "тумба", "length": 400, "width": 400},
+]
+
+
+class LayoutBudgetTest(unittest.TestCase):
+    def test_max_iterations(self):
+        """После max_iterations итераций расчет останавливается."""
+        budget = LayoutBudget(max_iterations=3)
+        budget.tick(3)
+        with self.assertRaises(BudgetExhausted) as context:
+            budget.tick()
+        self.assertEqual(context.exception.reason, "iterations")
+
+    def test_cancel(self):
+        """Отмена проверяется не на каждой итерации, а раз в CHECK_EVERY."""
+        budget = LayoutBudget()
+        budget.cancel()
+        budget.tick()
+        with self.assertRaises(BudgetExhausted) as context:
+            budget.tick(100)
+        self.assertEqual(context.exception.reason, "cancelled")
+
+    def test_deadline(self):
+        """Истекший срок останавливает расчет."""
+        with mock.patch("layout_algorithm.budget.time.monotonic", return_value=0):
+            budget = LayoutBudget(time_limit=1)
+        with mock.patch("layout_algorithm.budget.time.monotonic", return_value=2):
+            with self.assertRaises(BudgetExhausted) as context:
+                budget.check()
+        self.assertEqual(context.exception.reason, "deadline")
+
+
+class PartialResultTest(unittest.TestCase):
+    def test_partial_result(self):
+        """При исчерпании бюджета возвращается уже расставленная мебель."""
+        result = Core().algorithm_activation(
+            [],
+            [dict(item) for item in FURNITURE],
+            ROOM_SIZE,
+            LayoutBudget(max_iterations=1),
+        )
+        self.assertEqual(result.stopped, "iterations")
+        self.assertEqual([item["index"] for item in result.placements], [0])
+        self.assertEqual(result.unplaced, [1, 2])
+
+    def test_complete_result(self):
+        """Без ограничений вся мебель размещается."""
+        result = Core().algorithm_activation(
+            [], [dict(item) for item in FURNITURE], ROOM_SIZE,
+        )
+        self.assertIsNone(result.stopped)
+        self.assertEqual(result.unplaced, [])
+
+    def test_step_mode_budget(self):
+        """Бюджет ограничивает и пошаговое смещение мебели."""
+        door = {
+            "north_west": {"x": 3000, "y": 3000},
+            "north_east": {"x": 4000, "y": 3000},
+            "south_west": {"x": 3000, "y": 2500},
+            "south_east": {"x": 4000, "y": 2500},
+        }
+        result = Core(placement_mode="step").algorithm_activation(
+            [door], [dict(item) for item in FURNITURE[:2]], ROOM_SIZE, LayoutBudget(max_iterations=1),
+        )
+        self.assertEqual(result.stopped, "iterations")
+        self.assertEqual(result.placements, [])
+        self.assertEqual(result.unplaced, [0, 1])
+
+    def test_placement_error(self):
+        """Мебель больше комнаты вызывает PlacementError."""
+        with self.assertRaises(PlacementError):
+            Core().algorithm_activation(
+                [], [{"name": "стол", "length": 9000, "width": 600}], ROOM_SIZE,
+            )
@@ -0,0 +1,114 @@
+import unittest
+
+import numpy as np
+
+from layout_algorithm.collision import CollisionEngine, figures_to_boxes
+from layout_algorithm.crossover_checks import checks, collision_matrix
+from layout_algorithm.geometry import Rect
+
+WALLS = {
+    "first_wall": 10,
+    "second_wall": 14,
+    "third_wall": 10,
+    "fourth_wall": 14,
+}
+
+
+def figure(x0, y0, x1, y1):
+    return {
+        "north_west": {"x": x0, "y": y0},
+        "north_east": {"x": x1, "y": y0},
+        "south_west": {"x": x0, "y": y1},
+        "south_east": {"x": x1, "y": y1},
+    }
+
+
+class CollisionEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = CollisionEngine(WALLS, capacity=1)
+        self.engine.add(Rect(4, 9, 7, 10, 2))
+        self.engine.add(Rect(12, 0, 14, 4, 4))
+
+    def test_single_candidate(self):
+        """Кандидат проверяется сразу против всех объектов комнаты."""
+        self.assertTrue(self.engine.is_free(Rect(0, 0, 3, 2)))
+        self.assertFalse(self.engine.is_free(Rect(5, 8, 6, 10)))
+        self.assertFalse(self.engine.is_free(Rect(11, 3, 13, 5)))
+
+    def test_touching_is_not_collision(self):
+        """Касание сторонами не считается пересечением."""
+        self.assertTrue(self.engine.is_free(Rect(7, 8, 9, 10)))
+
+    def test_outside_room(self):
+        """Объект за пределами комнаты не размещается."""
+        self.assertFalse(self.engine.is_free(Rect(-1, 0, 2, 2)))
+        self.assertFalse(self.engine.is_free(Rect(13, 8, 15, 10)))
+
+    def test_batch_candidates(self):
+        """Пачка кандидатов проверяется одним вызовом."""
+        candidates = figures_to_boxes(
+            [figure(0, 0, 3, 2), figure(5, 8, 6, 10), figure(7, 8, 9, 10)],
+        )
+        np.testing.assert_array_equal(
+            self.engine.free_mask(candidates), [True, False, True],
+        )
+
+    def test_checks_shim(self):
+        """Старая попарная проверка работает через новый движок."""
+        self.assertTrue(checks(figure(0, 0, 3, 2), figure(4, 9, 7, 10), WALLS))
+        self.assertFalse(checks(figure(5, 8, 6, 10), figure(4, 9, 7, 10), WALLS))
+        self.assertFalse(checks(figure(3, 3, 6, 6), figure(4, 4, 5, 5), WALLS))
+
+
+class CollisionMatrixTest(unittest.TestCase):
+    def setUp(self):
+        self.objects = [figure(4, 9, 7, 10), figure(12, 0, 14, 4)]
+        self.candidates = [
+            figure(0, 0, 3, 2),
+            figure(5, 8, 6, 10),
+            figure(2, 1, 4, 3),
+            figure(13, 8, 15, 10),
+        ]
+
+    def test_matches_pairwise_checks(self):
+        """Матрица совпадает с попарными вызовами `checks`."""
+        matrix = collision_matrix(self.candidates, self.objects, WALLS)
+        self.assertEqual(matrix.objects.shape, (4, 2))
+        np.testing.assert_array_equal(matrix.inside, [True, True, True, False])
+        for row, candidate in enumerate(self.candidates):
+            for column, other in enumerate(self.objects):
+                self.assertEqual(
+                    bool(matrix.objects[row, column]),
+                    matrix.inside[row] and not checks(candidate, other, WALLS),
+                )
+
+    def test_candidates_against_each_other(self):
+        """Кандидаты проверяются и друг с другом, но не сами с собой;
+        на `free` это влияет только в `free_together`."""
+        matrix = collision_matrix(self.candidates, self.objects, WALLS)
+        np.testing.assert_array_equal(
+            matrix.candidates,
+            [
+                [False, False, True, False],
+                [False, False, False, False],
+                [True, False, False, False],
+                [False, False, False, False],
+            ],
+        )
+        np.testing.assert_array_equal(
+            matrix.free, [True, False, True, False],
+        )
+        np.testing.assert_array_equal(
+            matrix.free_together, [False, False, False, False],
+        )
+        np.testing.assert_array_equal(
+            collision_matrix(
+                self.candidates[:1], self.objects, WALLS,
+            ).free_together,
+            [True],
+        )
+
+    def test_empty_room(self):
+        """Без объектов матрица пересечений имеет ноль столбцов."""
+        matrix = collision_matrix(self.candidates, [], WALLS)
+        self.assertEqual(matrix.objects.shape, (4, 0))
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+from PIL import Image
+
+from layout_algorithm.create_picture import render_layout
+
+BORDERS = {
+    "south_west": {"x": 0, "y": 0},
+    "north_west": {"x": 0, "y": 10000},
+    "north_east": {"x": 12000, "y": 10000},
+    "south_east": {"x": 12000, "y": 0},
+}
+FURNITURE = [
+    {
+        "north_west": {"x": 0, "y": 2000},
+        "north_east": {"x": 0, "y": 1000},
+        "south_west": {"x": 600, "y": 2000},
+        "south_east": {"x": 600, "y": 1000},
+    },
+]
+
+
+class RenderLayoutTest(unittest.TestCase):
+    def test_png_is_scaled_down(self):
+        """Изображение уменьшается до заданной наибольшей стороны."""
+        content = render_layout(FURNITURE, BORDERS, [{"x": 0, "y": 1500}], max_side=600)
+        image = Image.open(BytesIO(content))
+        self.assertEqual(image.format, "PNG")
+        self.assertEqual(max(image.size), 600)
+
+    def test_webp(self):
+        """Изображение кодируется в WebP."""
+        content = render_layout(FURNITURE, BORDERS, [], image_format="webp", max_side=300)
+        self.assertEqual(Image.open(BytesIO(content)).format, "WEBP")
+
+    def test_unknown_format(self):
+        """Неизвестный формат изображения отклоняется."""
+        with self.assertRaises(ValueError):
+            render_layout(FURNITURE, BORDERS, [], image_format="gif")
+
+    def test_nothing_is_written_to_disk(self):
+        """Рендер не создает файлов в рабочей директории."""
+        current = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                render_layout(FURNITURE, BORDERS, [], max_side=200)
+                self.assertEqual(os.listdir(directory), [])
+            finally:
+                os.chdir(current)
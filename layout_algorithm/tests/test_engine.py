@@ -0,0 +1,89 @@
+import copy
+import pickle
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from layout_algorithm import benchmark
+from layout_algorithm.collision import overlap_matrix
+from layout_algorithm.core import Core
+from layout_algorithm.engine import compute_layout, freeze
+from layout_algorithm.exceptions import PlacementError
+
+
+class ComputeLayoutTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        catalog = benchmark.load_catalog()
+        cls.cases = [
+            benchmark.generate_case(seed, 20000, 5, 10, catalog)
+            for seed in range(4)
+        ]
+
+    def layout(self, case, **options):
+        result = compute_layout(
+            case["doors_and_windows"],
+            case["furniture"],
+            case["room_size"],
+            collect_stats=False,
+            ordering="area",
+            **options,
+        )
+        return [
+            (placement["index"], placement["adjacent_center_point"])
+            for placement in result.placements
+        ]
+
+    def test_input_is_not_mutated(self):
+        """Замороженные входные данные принимаются без изменений."""
+        case = self.cases[0]
+        original = copy.deepcopy(case)
+        frozen = freeze(case)
+        with self.assertRaises(TypeError):
+            frozen["furniture"][0]["length"] = 0
+        self.assertEqual(self.layout(frozen), self.layout(case))
+        self.assertEqual(case, original)
+
+    def test_frozen_result_is_picklable(self):
+        """Результат по замороженным данным сериализуется для кэша."""
+        case = freeze(self.cases[0])
+        result = compute_layout(
+            case["doors_and_windows"], case["furniture"], case["room_size"],
+        )
+        restored = pickle.loads(pickle.dumps(result))
+        self.assertEqual(restored.placements, result.placements)
+        self.assertEqual(restored.room_size, result.room_size)
+        with self.assertRaises(TypeError):
+            restored.room_size["first_wall"] = 0
+
+    def test_threads(self):
+        """Параллельные расчеты в потоках совпадают с последовательными."""
+        expected = [self.layout(case) for case in self.cases]
+        shared = [freeze(case) for case in self.cases]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(self.layout, shared * 4))
+        self.assertEqual(results, expected * 4)
+
+    def test_fractional_sizes_do_not_overlap(self):
+        """Мебель дробных размеров не пересекается с объектами комнаты."""
+        catalog = benchmark.load_catalog()
+        for seed in range(20):
+            case = benchmark.generate_case(seed, 5000, 5, 5, catalog)
+            for number, item in enumerate(case["furniture"]):
+                item["length"] *= 0.7 + number / 31
+                item["width"] *= 0.6 + number / 37
+            core = Core()
+            try:
+                core.algorithm_activation(
+                    case["doors_and_windows"],
+                    case["furniture"],
+                    case["room_size"],
+                )
+            except PlacementError:
+                pass
+            if core.collision is None:
+                continue
+            overlaps = overlap_matrix(core.collision.boxes, core.collision.boxes)
+            np.fill_diagonal(overlaps, False)
+            self.assertFalse(overlaps.any(), seed)
@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+
+from layout_algorithm.core import Core
+from layout_algorithm.exceptions import LayoutInfeasibleError
+from layout_algorithm.feasibility import (check_feasibility,
+                                          infeasibility_reasons,
+                                          wall_free_length)
+from layout_algorithm.geometry import Rect
+
+ROOM_SIZE = {
+    "first_wall": 3000,
+    "second_wall": 4000,
+    "third_wall": 3000,
+    "fourth_wall": 4000,
+}
+# дверь шириной 1000 у второй стены
+DOOR_BOX = (1000, 2500, 2000, 3000)
+DOOR = Rect(*DOOR_BOX, 2).to_dict()
+
+
+def item(length, width, name=None):
+    return {"name": name, "length": length, "width": width}
+
+
+class FeasibilityTest(unittest.TestCase):
+    def test_feasible(self):
+        furniture = [item(600, 1200), item(500, 800)]
+        self.assertEqual(infeasibility_reasons([DOOR], furniture, ROOM_SIZE), [])
+
+    def test_item_too_large(self):
+        """Мебель глубже комнаты не помещается ни у одной стены."""
+        furniture = [item(500, 500), item(4500, 500, "шкаф")]
+        reasons = infeasibility_reasons([], furniture, ROOM_SIZE)
+        self.assertEqual([reason["code"] for reason in reasons], ["item_too_large"])
+        self.assertEqual(reasons[0]["index"], 1)
+        self.assertIn("шкаф", reasons[0]["message"])
+
+    def test_item_blocked_by_openings(self):
+        """Двери на всех стенах не оставляют места для широкой мебели."""
+        openings = [
+            Rect(0, 1000, 500, 2000, 1).to_dict(),
+            Rect(1500, 2500, 2500, 3000, 2).to_dict(),
+            Rect(3500, 1000, 4000, 2000, 3).to_dict(),
+            Rect(1500, 0, 2500, 500, 4).to_dict(),
+        ]
+        reasons = infeasibility_reasons(openings, [item(400, 1700)], ROOM_SIZE)
+        self.assertEqual([reason["code"] for reason in reasons], ["item_blocked"])
+
+    def test_total_width_and_area(self):
+        """Суммарная ширина и площадь мебели ограничены стенами и комнатой."""
+        reasons = infeasibility_reasons([DOOR], [item(1400, 2900)] * 5, ROOM_SIZE)
+        self.assertEqual(
+            [reason["code"] for reason in reasons], ["wall_length", "area"],
+        )
+
+    def test_wall_free_length(self):
+        boxes = np.array([DOOR_BOX, (0, 0, 500, 500)], dtype=np.float64)
+        # дверь занимает 1000 второй стены, угловой объект - по 500 первой
+        # и четвертой стены
+        self.assertEqual(
+            wall_free_length(boxes, tuple(ROOM_SIZE.values())), 12000,
+        )
+
+    def test_core_rejects_before_search(self):
+        with self.assertRaises(LayoutInfeasibleError) as context:
+            Core().algorithm_activation([], [item(4500, 500)], ROOM_SIZE)
+        self.assertEqual(context.exception.reasons[0]["code"], "item_too_large")
+        with self.assertRaises(LayoutInfeasibleError):
+            check_feasibility([], [item(4500, 500)], ROOM_SIZE)
@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from layout_algorithm.free_intervals import (nearest_free_position,
+                                             room_free_intervals,
+                                             wall_free_intervals)
+
+WALLS_LENGTH = (10, 14, 10, 14)
+
+
+class FreeIntervalsTest(unittest.TestCase):
+    def setUp(self):
+        # окно на второй стене и дверь на четвертой
+        self.boxes = np.array(
+            [[4, 9, 7, 10], [12, 0, 14, 4]], dtype=np.float64,
+        )
+
+    def test_wall_without_objects(self):
+        """На пустой стене центр объекта ограничен только углами."""
+        self.assertEqual(
+            wall_free_intervals(
+                self.boxes, 1, {"length": 1, "width": 2}, WALLS_LENGTH,
+            ),
+            [(1, 9)],
+        )
+
+    def test_wall_with_object(self):
+        """Объект на стене разбивает свободное место на два интервала."""
+        self.assertEqual(
+            wall_free_intervals(
+                self.boxes, 2, {"length": 1, "width": 2}, WALLS_LENGTH,
+            ),
+            [(11, 13), (18, 23)],
+        )
+
+    def test_reversed_wall(self):
+        """Для четвертой стены интервалы переводятся в обратном порядке."""
+        self.assertEqual(
+            wall_free_intervals(
+                self.boxes, 4, {"length": 1, "width": 2}, WALLS_LENGTH,
+            ),
+            [(37, 47)],
+        )
+
+    def test_too_deep_object(self):
+        """Слишком глубокий объект не помещается у стены."""
+        self.assertEqual(
+            wall_free_intervals(
+                self.boxes, 2, {"length": 11, "width": 2}, WALLS_LENGTH,
+            ),
+            [],
+        )
+
+    def test_nearest_position(self):
+        """Выбирается ближайшая свободная точка, в том числе через начало."""
+        intervals, _ = room_free_intervals(
+            self.boxes, {"length": 1, "width": 2}, WALLS_LENGTH,
+        )
+        self.assertEqual(nearest_free_position(intervals, 5, 48), (5, 1))
+        self.assertEqual(nearest_free_position(intervals, 15, 48), (13, 2))
+        self.assertEqual(nearest_free_position(intervals, 0.5, 48), (1, 1))
+        self.assertIsNone(nearest_free_position([], 5, 48))
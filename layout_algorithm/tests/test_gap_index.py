@@ -0,0 +1,96 @@
+import random
+import unittest
+
+from layout_algorithm.gap_index import HEAP_SLACK, GapIndex
+
+
+def rescan(intervals, perimeter):
+    """Самый длинный промежуток полным перебором отсортированных отрезков."""
+    intervals = sorted(intervals)
+    gaps = []
+    for counter, (_, left_point) in enumerate(intervals):
+        right_point = intervals[(counter + 1) % len(intervals)][0]
+        gaps.append((right_point - left_point) % perimeter)
+    return max(gaps)
+
+
+class GapIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = GapIndex(100)
+
+    def test_empty_room(self):
+        """Без объектов свободен весь периметр."""
+        self.assertEqual(self.index.largest(), (0, 100))
+        self.assertEqual(self.index.best_fit(30), (0, 100))
+        self.assertIsNone(self.index.first_fit(101))
+
+    def test_insert_splits_gap(self):
+        """Новый объект делит промежуток, в который попал."""
+        self.index.insert(0, 10, 20)
+        self.assertEqual(self.index.largest(), (20, 10))
+        self.index.insert(1, 50, 60)
+        self.assertEqual(self.index.largest(), (60, 10))
+        self.assertEqual(self.index.best_fit(25), (20, 50))
+        self.assertIsNone(self.index.best_fit(51))
+
+    def test_equal_gaps(self):
+        """Из равных промежутков берется тот, что дальше по периметру."""
+        self.index.insert(0, 0, 10)
+        self.index.insert(1, 50, 60)
+        self.assertEqual(self.index.largest(), (60, 0))
+
+    def test_first_fit(self):
+        """Поиск идет по ходу периметра от заданной точки."""
+        self.index.insert(0, 0, 10)
+        self.index.insert(1, 30, 40)
+        self.index.insert(2, 80, 90)
+        self.assertEqual(self.index.first_fit(15), (10, 30))
+        self.assertEqual(self.index.first_fit(25), (40, 80))
+        self.assertEqual(self.index.first_fit(5, point=50), (90, 0))
+
+    def test_remove_merges_gaps(self):
+        """Удаление объекта объединяет соседние промежутки."""
+        self.index.insert(0, 10, 20)
+        self.index.insert(1, 50, 60)
+        self.index.remove(1, 50)
+        self.assertEqual(self.index.largest(), (20, 10))
+        self.index.remove(0, 10)
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.largest(), (0, 100))
+
+    def test_matches_full_rescan(self):
+        """Инкрементальный индекс совпадает с полным пересчетом."""
+        generator = random.Random(7)
+        index = GapIndex(1000)
+        intervals = []
+        for key, start in enumerate(generator.sample(range(0, 1000, 10), 40)):
+            intervals.append((start, start + generator.randrange(1, 10)))
+            index.insert(key, *intervals[-1])
+            self.assertEqual(
+                index.gap_length(*index.largest()), rescan(intervals, 1000),
+            )
+        for key in reversed(range(20, 40)):
+            index.remove(key, intervals.pop()[0])
+            self.assertEqual(
+                index.gap_length(*index.largest()), rescan(intervals, 1000),
+            )
+
+    def test_heap_is_compacted(self):
+        """Куча не растет от повторных вставок и удалений одного отрезка."""
+        self.index.insert(0, 10, 20)
+        for _ in range(1000):
+            self.index.insert(1, 50, 60)
+            self.index.remove(1, 50)
+        self.assertLessEqual(
+            len(self.index._heap), 2 * len(self.index._gaps) + HEAP_SLACK,
+        )
+        self.assertEqual(self.index.largest(), (20, 10))
+
+    def test_equal_starts_keep_insertion_order(self):
+        """Отрезок с тем же началом встает после уже вставленных."""
+        self.index.insert(5, 10, 20)
+        self.index.insert(3, 10, 15)
+        self.assertEqual(self.index.intervals, [(10, 20, 5), (10, 15, 3)])
+        restored = GapIndex.from_intervals(100, self.index.intervals)
+        self.assertEqual(restored.intervals, self.index.intervals)
+        self.assertEqual(restored.largest(), self.index.largest())
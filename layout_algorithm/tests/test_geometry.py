@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+from layout_algorithm.corner_markings import (corner_markings,
+                                              footprint_template,
+                                              footprint_templates, footprints)
+from layout_algorithm.geometry import Point, Rect
+
+
+class RectTest(unittest.TestCase):
+    def test_slots(self):
+        """Точки и прямоугольники не создают словарь атрибутов."""
+        self.assertFalse(hasattr(Point(0, 0), "__dict__"))
+        self.assertFalse(hasattr(Rect(0, 0, 1, 1), "__dict__"))
+
+    def test_from_dict(self):
+        """Из словаря API строится ограничивающий прямоугольник."""
+        rect = Rect.from_dict(
+            {
+                "north_west": {"x": 14, "y": 0},
+                "north_east": {"x": 12, "y": 0},
+                "south_west": {"x": 14, "y": 4},
+                "south_east": {"x": 12, "y": 4},
+            },
+            4,
+        )
+        self.assertEqual(rect, Rect(12, 0, 14, 4, 4))
+
+    def test_round_trip(self):
+        """Углы объекта сохраняют названия для каждой стены."""
+        for wall_number in (1, 2, 3, 4):
+            rect = corner_markings(
+                {"length": 3, "width": 2}, Point(5, 5), wall_number,
+            )
+            self.assertEqual(Rect.from_dict(rect.to_dict(), wall_number), rect)
+
+    def test_corner_markings(self):
+        """Примыкающие углы объекта лежат на стене."""
+        rect = corner_markings({"length": 3, "width": 2}, Point(0, 5), 1)
+        self.assertEqual(rect.corner("north_west"), Point(0, 4))
+        self.assertEqual(rect.corner("north_east"), Point(0, 6))
+        self.assertEqual(rect.corner("south_east"), Point(3, 6))
+
+    def test_footprints(self):
+        """Пачка прямоугольников совпадает с поштучным расчетом."""
+        size = {"length": 3, "width": 2.5}
+        centers = [Point(0, 5), Point(4, 10), Point(14, 7.5), Point(6, 0)]
+        walls = [1, 2, 3, 4]
+        boxes = footprints(
+            size,
+            np.array([center.x for center in centers]),
+            np.array([center.y for center in centers]),
+            np.array(walls),
+        )
+        self.assertEqual(
+            boxes.tolist(),
+            [
+                list(corner_markings(size, center, wall).as_tuple())
+                for center, wall in zip(centers, walls)
+            ],
+        )
+
+    def test_template_is_cached(self):
+        footprint_template(3, 2, 1)
+        hits = footprint_template.cache_info().hits
+        corner_markings({"length": 3, "width": 2}, Point(0, 7), 1)
+        self.assertEqual(footprint_template.cache_info().hits, hits + 1)
+
+    def test_templates_are_built_once(self):
+        """Шаблоны всех стен строятся один раз для размера мебели."""
+        templates = footprint_templates(3, 2)
+        self.assertIs(footprint_templates(3, 2), templates)
+        self.assertFalse(templates.flags.writeable)
+
+    def test_template_without_wall(self):
+        """Объект без стены описывается как у первой стены."""
+        self.assertEqual(
+            footprint_template(3, 2, None), footprint_template(3, 2, 1),
+        )
+        rect = corner_markings({"length": 3, "width": 2}, Point(0, 5), None)
+        self.assertEqual(rect.corner("north_west"), Point(0, 4))
+        self.assertEqual(rect.corner("south_east"), Point(3, 6))
@@ -0,0 +1,47 @@
+import unittest
+
+from layout_algorithm.core import Core
+from layout_algorithm.instrumentation import NULL_STATS, make_stats
+
+DOOR = {
+    "north_west": {"x": 3000, "y": 3000},
+    "north_east": {"x": 4000, "y": 3000},
+    "south_west": {"x": 3000, "y": 2500},
+    "south_east": {"x": 4000, "y": 2500},
+}
+FURNITURE = [
+    {"name": "кровать", "length": 2000, "width": 1600},
+    {"name": "шкаф", "length": 600, "width": 1200},
+]
+ROOM_SIZE = {
+    "first_wall": 3000,
+    "second_wall": 4000,
+    "third_wall": 3000,
+    "fourth_wall": 4000,
+}
+
+
+class InstrumentationTest(unittest.TestCase):
+    def test_disabled_by_default(self):
+        """Без включения замеров результат их не содержит."""
+        self.assertIs(make_stats(False), NULL_STATS)
+        result = Core().algorithm_activation(
+            [DOOR], [dict(item) for item in FURNITURE], ROOM_SIZE, collect_stats=False,
+        )
+        self.assertIsNone(result.stats)
+
+    def test_stages_and_counters(self):
+        """Замеры собираются по этапам и по каждой единице мебели."""
+        with self.assertLogs("layout_algorithm.instrumentation", "INFO") as logs:
+            result = Core(placement_mode="step").algorithm_activation(
+                [DOOR], [dict(item) for item in FURNITURE], ROOM_SIZE, collect_stats=True,
+            )
+        stats = result.stats
+        self.assertEqual([item["index"] for item in stats["items"]], [0, 1])
+        for stage in ("free_space", "middle_point", "corner_markings", "placing", "build_result"):
+            self.assertIn(stage, stats["stages"])
+        counters = stats["counters"]
+        self.assertEqual(counters["checks"], counters["displacements"] + len(FURNITURE))
+        self.assertEqual(counters["rejections"], counters["displacements"])
+        self.assertGreater(counters["displacements"], 0)
+        self.assertEqual(logs.records[0].layout_stats, stats)
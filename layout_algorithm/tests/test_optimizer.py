@@ -0,0 +1,109 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from layout_algorithm.collision import figures_to_boxes, overlap_matrix
+from layout_algorithm.core import Core
+from layout_algorithm.optimizer import LayoutOptimizer, optimize_layout
+
+DOORS_AND_WINDOWS = [
+    {
+        "north_west": {"x": 0, "y": 1000},
+        "north_east": {"x": 0, "y": 1900},
+        "south_west": {"x": 900, "y": 1000},
+        "south_east": {"x": 900, "y": 1900},
+    },
+]
+FURNITURE = [
+    {"name": "0", "length": 2000, "width": 600},
+    {"name": "1", "length": 1000, "width": 600},
+    {"name": "2", "length": 1000, "width": 2000},
+    {"name": "3", "length": 1000, "width": 2000},
+]
+ROOM_SIZE = {
+    "first_wall": 3000,
+    "second_wall": 3000,
+    "third_wall": 3000,
+    "fourth_wall": 3000,
+}
+
+
+class LayoutOptimizerTest(unittest.TestCase):
+    def test_finds_layout_for_all_furniture(self):
+        """Оптимизатор находит порядок, при котором помещается вся мебель."""
+        with self.assertRaises(Exception):
+            Core().algorithm_activation(
+                DOORS_AND_WINDOWS, [dict(item) for item in FURNITURE], ROOM_SIZE,
+            )
+        result = optimize_layout(
+            DOORS_AND_WINDOWS,
+            FURNITURE,
+            ROOM_SIZE,
+            time_budget=60,
+            max_iterations=400,
+        )
+        self.assertEqual(
+            sorted(item["index"] for item in result.placements), [0, 1, 2, 3],
+        )
+        boxes = figures_to_boxes(result.placements + DOORS_AND_WINDOWS)
+        overlaps = overlap_matrix(boxes, boxes)
+        np.fill_diagonal(overlaps, False)
+        self.assertFalse(overlaps.any())
+
+    def test_prefix_is_reused(self):
+        """Общий префикс кандидатов не расставляется заново."""
+        optimizer = LayoutOptimizer(DOORS_AND_WINDOWS, FURNITURE, ROOM_SIZE)
+        candidate = [(2, None), (3, None), (0, None), (1, None)]
+        optimizer.evaluate(candidate)
+        first_placed = list(optimizer.arrangement.placed[:2])
+        with mock.patch.object(
+            optimizer.arrangement,
+            "place_furniture",
+            wraps=optimizer.arrangement.place_furniture,
+        ) as place_furniture:
+            optimizer.evaluate(candidate[:2] + [(1, None), (0, None)])
+        self.assertEqual(place_furniture.call_count, 2)
+        self.assertEqual(optimizer.arrangement.placed[:2], first_placed)
+
+    def test_time_budget(self):
+        """Без процессорного времени возвращается исходный порядок."""
+        result = optimize_layout(
+            DOORS_AND_WINDOWS, FURNITURE[:2], ROOM_SIZE, time_budget=0,
+        )
+        self.assertEqual([item["index"] for item in result.placements], [0, 1])
+
+    def test_budget_is_checked_while_placing(self):
+        """Время проверяется и внутри размещения кандидата."""
+        optimizer = LayoutOptimizer(DOORS_AND_WINDOWS, FURNITURE, ROOM_SIZE)
+        place_furniture = optimizer.arrangement.place_furniture
+        now = [0.0]
+        # размещения во время поиска, когда действует бюджет
+        calls = []
+
+        def place(*args):
+            if optimizer.arrangement.budget.deadline is not None:
+                # время кончается на первом размещении кандидата поиска
+                calls.append(args)
+                now[0] = 10.0
+            return place_furniture(*args)
+
+        with mock.patch(
+            "layout_algorithm.optimizer.time.process_time",
+            side_effect=lambda: now[0],
+        ), mock.patch.object(
+            optimizer.arrangement, "place_furniture", side_effect=place,
+        ):
+            optimizer.run(time_budget=1)
+        self.assertEqual(len(calls), 1)
+
+    def test_unexpected_error_is_raised(self):
+        """Оптимизатор не скрывает ошибки, не связанные с размещением."""
+        optimizer = LayoutOptimizer(DOORS_AND_WINDOWS, FURNITURE, ROOM_SIZE)
+        with mock.patch.object(
+            optimizer.arrangement,
+            "place_furniture",
+            side_effect=KeyError("length"),
+        ):
+            with self.assertRaises(KeyError):
+                optimizer.evaluate([(0, None)])
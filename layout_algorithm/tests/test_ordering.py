@@ -0,0 +1,91 @@
+import unittest
+from unittest import mock
+
+from layout_algorithm import benchmark
+from layout_algorithm.core import Core, placement_order
+from layout_algorithm.exceptions import PlacementError
+
+FURNITURE = [
+    {"length": 400, "width": 400},
+    {"length": 2000, "width": 1600},
+    {"length": 600, "width": 2000},
+    {"length": 400, "width": 400},
+]
+
+
+def benchmark_case(seed, name):
+    cases = benchmark.generate_cases(seed, benchmark.load_catalog())
+    return next(case for case in cases if case["name"] == name)
+
+
+def activate(case, **options):
+    arrangement = Core(**options)
+    result = arrangement.algorithm_activation(
+        case["doors_and_windows"],
+        [dict(item) for item in case["furniture"]],
+        case["room_size"],
+        collect_stats=False,
+    )
+    return arrangement, result
+
+
+class PlacementOrderTest(unittest.TestCase):
+    def test_orderings(self):
+        self.assertEqual(placement_order(FURNITURE), [0, 1, 2, 3])
+        self.assertEqual(placement_order(FURNITURE, "area"), [1, 2, 0, 3])
+        self.assertEqual(placement_order(FURNITURE, "width"), [2, 1, 0, 3])
+
+    def test_unknown_ordering(self):
+        with self.assertRaises(ValueError):
+            Core(ordering="random")
+
+
+class BacktrackingTest(unittest.TestCase):
+    def test_largest_first(self):
+        """Сначала самая большая мебель: помещается то, что не помещалось."""
+        case = benchmark_case(1000, "room10000_openings0_items10")
+        with self.assertRaises(PlacementError):
+            activate(case)
+        _, result = activate(case, ordering="area")
+        self.assertEqual(
+            sorted(placement["index"] for placement in result.placements),
+            list(range(len(case["furniture"]))),
+        )
+        # индексы в результате указывают на позиции во входном списке
+        for placement in result.placements:
+            self.assertEqual(
+                placement["name"], case["furniture"][placement["index"]]["name"],
+            )
+
+    def test_backtracking(self):
+        """Возврат к предыдущей мебели исправляет неудачный порядок."""
+        case = benchmark_case(0, "room30000_openings0_items40")
+        with self.assertRaises(PlacementError):
+            activate(case, ordering="area")
+        arrangement, result = activate(case, ordering="area", backtrack_depth=2)
+        self.assertGreater(arrangement.backtracks, 0)
+        self.assertEqual(len(result.placements), len(case["furniture"]))
+        self.assertEqual(
+            len(arrangement.collision),
+            arrangement.openings_count + len(case["furniture"]),
+        )
+
+    def test_no_backtracking_in_step_mode(self):
+        """Пошаговый поиск не зависит от стены, поэтому возврата нет."""
+        case = benchmark_case(0, "room10000_openings20_items10")
+        arrangement = Core(
+            ordering="area", backtrack_depth=2, placement_mode="step",
+        )
+        with mock.patch.object(
+            arrangement, "place_furniture", wraps=arrangement.place_furniture,
+        ) as place_furniture:
+            with self.assertRaises(PlacementError):
+                arrangement.algorithm_activation(
+                    case["doors_and_windows"],
+                    case["furniture"],
+                    case["room_size"],
+                )
+        self.assertEqual(arrangement.backtracks, 0)
+        self.assertEqual(
+            place_furniture.call_count, len(arrangement.placed) + 1,
+        )
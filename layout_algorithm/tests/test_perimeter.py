@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from layout_algorithm.geometry import Point
+from layout_algorithm.perimeter import PerimeterGeometry
+
+
+class PerimeterGeometryTest(unittest.TestCase):
+    def setUp(self):
+        self.geometry = PerimeterGeometry.for_walls((10, 14, 10, 14))
+
+    def test_prefix_sums(self):
+        """Префиксные суммы считаются один раз на комнату."""
+        self.assertEqual(self.geometry.prefix, (0, 10, 24, 34, 48))
+        self.assertIs(PerimeterGeometry.for_walls((10, 14, 10, 14)), self.geometry)
+
+    def test_round_trip(self):
+        """Точка на каждой из стен переводится на прямую и обратно."""
+        for dot, point in (
+            (5, Point(0, 5)),
+            (13, Point(3, 10)),
+            (30, Point(14, 4)),
+            (40, Point(8, 0)),
+        ):
+            self.assertEqual(self.geometry.to_point(dot), point)
+            self.assertEqual(self.geometry.to_line(point), dot)
+
+    def test_wrap_around(self):
+        """Точки за пределами периметра переносятся на него."""
+        self.assertEqual(self.geometry.to_point(-8), Point(8, 0))
+        self.assertEqual(self.geometry.to_point(53), Point(0, 5))
+        self.assertEqual(self.geometry.wall_of(-8), 4)
+
+    def test_batched_conversion(self):
+        """Массивы точек переводятся одним вызовом."""
+        dots = np.array([5, 13, 30, 40, -8, 53])
+        xs, ys, walls = self.geometry.to_points_many(dots)
+        np.testing.assert_array_equal(xs, [0, 3, 14, 8, 8, 0])
+        np.testing.assert_array_equal(ys, [5, 10, 4, 0, 0, 5])
+        np.testing.assert_array_equal(walls, [1, 2, 3, 4, 4, 1])
+        np.testing.assert_array_equal(
+            self.geometry.to_line_many(xs, ys), [5, 13, 30, 40, 40, 5],
+        )
@@ -0,0 +1,119 @@
+import struct
+import unittest
+
+from layout_algorithm import benchmark
+from layout_algorithm.core import Core
+from layout_algorithm.exceptions import SnapshotError
+from layout_algorithm.snapshot import (HEADER, dump_state, load_state,
+                                       prepare_state)
+
+
+class SnapshotTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        catalog = benchmark.load_catalog()
+        cls.cases = [
+            benchmark.generate_case(seed, 20000, openings, 10, catalog)
+            for seed, openings in enumerate((0, 5, 20))
+        ]
+
+    @staticmethod
+    def layout(case, furniture=None, state=None, **options):
+        result = Core(**options).algorithm_activation(
+            case["doors_and_windows"],
+            case["furniture"] if furniture is None else furniture,
+            case["room_size"],
+            collect_stats=False,
+            state=state,
+        )
+        return result.placements, result.power_sockets
+
+    def test_prepared_state(self):
+        """Расчет из снимка подготовленной комнаты совпадает с обычным."""
+        for case in self.cases:
+            state = prepare_state(case["doors_and_windows"], case["room_size"])
+            for mode in Core.PLACEMENT_MODES:
+                options = {"placement_mode": mode}
+                with self.subTest(case=case["name"], **options):
+                    self.assertEqual(
+                        self.layout(case, state=state, **options),
+                        self.layout(case, **options),
+                    )
+
+    def test_round_trip(self):
+        """Загруженное состояние снова сохраняется в тот же снимок."""
+        for case in self.cases:
+            arrangement = Core()
+            arrangement.algorithm_activation(
+                case["doors_and_windows"],
+                case["furniture"],
+                case["room_size"],
+                collect_stats=False,
+            )
+            state = dump_state(arrangement)
+            restored = Core()
+            load_state(restored, state)
+            self.assertEqual(dump_state(restored), state)
+            self.assertEqual(
+                [placement[:3] for placement in restored.placed],
+                [placement[:3] for placement in arrangement.placed],
+            )
+            self.assertEqual(
+                restored.gaps.largest(), arrangement.gaps.largest(),
+            )
+
+    def test_resume(self):
+        """Расчет продолжается из снимка с частью размещенной мебели."""
+        case = self.cases[1]
+        arrangement = Core()
+        arrangement.algorithm_activation(
+            case["doors_and_windows"],
+            case["furniture"][:4],
+            case["room_size"],
+            collect_stats=False,
+        )
+        self.assertEqual(
+            self.layout(case, state=dump_state(arrangement)),
+            self.layout(case),
+        )
+
+    def test_extended_state(self):
+        """Добавление объектов к снимку совпадает с подготовкой всех сразу."""
+        case = self.cases[2]
+        openings = case["doors_and_windows"]
+        room_size = case["room_size"]
+        state = prepare_state(openings[:12], room_size)
+        self.assertEqual(
+            prepare_state(openings[12:], room_size, state),
+            prepare_state(openings, room_size),
+        )
+        with self.assertRaises(SnapshotError):
+            prepare_state([], {**room_size, "first_wall": 1}, state)
+
+        arrangement = Core()
+        arrangement.algorithm_activation(
+            openings, case["furniture"][:2], room_size, collect_stats=False,
+        )
+        with self.assertRaises(SnapshotError):
+            prepare_state([], room_size, dump_state(arrangement))
+
+    def test_invalid(self):
+        """Поврежденный снимок или снимок другой версии не загружается."""
+        case = self.cases[1]
+        state = prepare_state(case["doors_and_windows"], case["room_size"])
+        other_version = bytearray(state)
+        struct.pack_into("<H", other_version, 4, 99)
+        for data in (
+            b"",
+            b"NOPE" + state[4:],
+            bytes(other_version),
+            state[:-1],
+            state[:HEADER.size],
+        ):
+            with self.subTest(data=data[:8]):
+                with self.assertRaises(SnapshotError):
+                    load_state(Core(), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
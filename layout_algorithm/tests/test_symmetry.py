@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from layout_algorithm.optimizer import LayoutOptimizer
+from layout_algorithm.symmetry import layout_key, room_symmetries
+from layout_algorithm.variants import generate_variants, unique_specs
+
+RECTANGLE = (3000, 4000, 3000, 4000)
+SQUARE = (3000, 3000, 3000, 3000)
+FURNITURE = [
+    {"name": "шкаф", "length": 600, "width": 1200},
+    {"name": "тумба", "length": 400, "width": 400},
+]
+
+
+def names(symmetries):
+    return [symmetry.name for symmetry in symmetries]
+
+
+class RoomSymmetriesTest(unittest.TestCase):
+    def test_empty_rooms(self):
+        empty = np.empty((0, 4))
+        self.assertEqual(
+            names(room_symmetries(RECTANGLE, empty)),
+            ["identity", "mirror_x", "mirror_y", "rotate_180"],
+        )
+        self.assertEqual(len(room_symmetries(SQUARE, empty)), 8)
+        self.assertEqual(
+            names(room_symmetries((3000, 4000, 3500, 4000), empty)),
+            ["identity"],
+        )
+
+    def test_openings(self):
+        """Симметрия сохраняется, только если двери переходят друг в друга."""
+        # двери посередине первой и третьей стены
+        doors = np.array(
+            [(0, 1000, 500, 2000), (3500, 1000, 4000, 2000)], dtype=np.float64,
+        )
+        self.assertEqual(
+            names(room_symmetries(RECTANGLE, doors)),
+            ["identity", "mirror_x", "mirror_y", "rotate_180"],
+        )
+        self.assertEqual(
+            names(room_symmetries(RECTANGLE, doors[:1])),
+            ["identity", "mirror_y"],
+        )
+
+    def test_layout_key(self):
+        """Отраженная расстановка получает тот же ключ."""
+        symmetries = room_symmetries(RECTANGLE, np.empty((0, 4)))
+        boxes = np.array([(0, 100, 600, 1300)], dtype=np.float64)
+        mirrored = np.array([(3400, 100, 4000, 1300)], dtype=np.float64)
+        self.assertEqual(
+            layout_key(["шкаф"], boxes, symmetries),
+            layout_key(["шкаф"], mirrored, symmetries),
+        )
+        self.assertNotEqual(
+            layout_key(["шкаф"], boxes, symmetries),
+            layout_key(["тумба"], mirrored, symmetries),
+        )
+
+
+class SymmetricDuplicatesTest(unittest.TestCase):
+    room_size = dict(
+        zip(("first_wall", "second_wall", "third_wall", "fourth_wall"), SQUARE),
+    )
+
+    def test_optimizer_caches_exact_candidates(self):
+        """Повторный кандидат не расставляется заново, а отраженный -
+        расставляется: правила размещения не симметричны."""
+        optimizer = LayoutOptimizer([], FURNITURE, self.room_size)
+        optimizer.evaluate([(0, 1), (1, None)])
+        optimizer.evaluate([(0, 1), (1, None)])
+        self.assertEqual(optimizer.evaluations, 1)
+        for wall in (2, 3, 4):
+            optimizer.evaluate([(0, wall), (1, None)])
+        self.assertEqual(optimizer.evaluations, 4)
+
+    def test_variants_with_same_order(self):
+        """Перемешивание одной единицы мебели не дает новых вариантов."""
+        specs = [(None, 0), ("light", 1), ("hard", 2)]
+        self.assertEqual(unique_specs(specs, FURNITURE[:1]), [(None, 0)])
+        variants = list(
+            generate_variants(
+                [], FURNITURE[:1], self.room_size, count=4, max_workers=1,
+            ),
+        )
+        self.assertEqual(len(variants), 1)
@@ -0,0 +1,132 @@
+import pickle
+import unittest
+from unittest import mock
+
+from layout_algorithm.engine import freeze
+from layout_algorithm.variants import (build_variant, generate_variants,
+                                       variant_specs)
+
+DOORS_AND_WINDOWS = [
+    {
+        "north_west": {"x": 0, "y": 250},
+        "north_east": {"x": 0, "y": 750},
+        "south_west": {"x": 500, "y": 250},
+        "south_east": {"x": 500, "y": 750},
+    },
+]
+FURNITURE = [
+    {
+        "name": name,
+        "length": length,
+        "width": width,
+        "first_power_socket_width": 0,
+        "second_power_socket_width": 0,
+    }
+    for name, length, width in (
+        ("кровать", 2000, 1800),
+        ("шкаф", 600, 1200),
+        ("тумба", 400, 400),
+    )
+]
+ROOM_SIZE = {
+    "first_wall": 4000,
+    "second_wall": 5000,
+    "third_wall": 4000,
+    "fourth_wall": 5000,
+}
+
+
+class GenerateVariantsTest(unittest.TestCase):
+    def test_variant_specs(self):
+        """Первый вариант использует исходный порядок мебели."""
+        self.assertEqual(
+            variant_specs(5, seed=10),
+            [
+                (None, 10),
+                ("light", 11),
+                ("medium", 12),
+                ("hard", 13),
+                ("hard", 14),
+            ],
+        )
+
+    def check_variants(self, variants, count):
+        self.assertEqual(len(variants), count)
+        for variant in variants:
+            self.assertIsNone(variant.error)
+            self.assertEqual(
+                sorted(item["index"] for item in variant.result.placements),
+                [0, 1, 2],
+            )
+            for placement in variant.result.placements:
+                self.assertEqual(
+                    placement["name"], FURNITURE[placement["index"]]["name"],
+                )
+
+    def test_in_process(self):
+        """Без пула варианты считаются последовательно."""
+        variants = list(
+            generate_variants(
+                DOORS_AND_WINDOWS, FURNITURE, ROOM_SIZE, count=3, max_workers=1,
+            ),
+        )
+        self.check_variants(variants, 3)
+
+    def test_process_pool(self):
+        """В пуле процессов возвращаются все успевшие варианты."""
+        variants = list(
+            generate_variants(
+                DOORS_AND_WINDOWS,
+                FURNITURE,
+                ROOM_SIZE,
+                count=4,
+                deadline=30,
+                max_workers=2,
+            ),
+        )
+        self.check_variants(variants, 4)
+
+    def test_frozen_input_process_pool(self):
+        """Замороженные входные данные передаются в пул процессов."""
+        variants = list(
+            generate_variants(
+                *freeze((DOORS_AND_WINDOWS, FURNITURE, ROOM_SIZE)),
+                count=4,
+                deadline=30,
+                max_workers=2,
+            ),
+        )
+        self.check_variants(variants, 4)
+        for variant in variants:
+            self.assertEqual(
+                pickle.loads(pickle.dumps(variant.result)).placements,
+                variant.result.placements,
+            )
+
+    def test_input_is_not_mutated(self):
+        """Входной список мебели не изменяется."""
+        list(
+            generate_variants(
+                DOORS_AND_WINDOWS, FURNITURE, ROOM_SIZE, count=2, max_workers=1,
+            ),
+        )
+        self.assertNotIn("adjacent_center_point", FURNITURE[0])
+
+    def test_placement_error(self):
+        """Неудачная расстановка возвращается в поле error."""
+        variant = build_variant(
+            DOORS_AND_WINDOWS,
+            [{"name": "диван", "length": 600, "width": 6000}],
+            ROOM_SIZE,
+        )
+        self.assertIsNone(variant.result)
+        self.assertTrue(variant.error)
+
+    def test_unexpected_error_is_raised(self):
+        """Ошибки, не связанные с расстановкой, не скрываются."""
+        with mock.patch(
+            "layout_algorithm.variants.compute_layout",
+            side_effect=KeyError("length"),
+        ):
+            with self.assertRaises(KeyError):
+                build_variant(DOORS_AND_WINDOWS, FURNITURE, ROOM_SIZE)
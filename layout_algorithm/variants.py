@@ -0,0 +1,304 @@
+"""Параллельная генерация нескольких вариантов расстановки.
+
+Каждый вариант - это отдельный запуск `engine.compute_layout` с
+перемешанным списком мебели. Варианты считаются в ограниченном пуле
+процессов и возвращаются по мере готовности, пока не истечет отведенное на
+запрос время. Варианты с одинаковым порядком мебели не считаются, а
+расстановки, переходящие друг в друга при симметрии комнаты, возвращаются
+один раз.
+
+Комната подготавливается один раз в основном процессе, воркерам передается
+ее компактный снимок (см. `snapshot`).
+"""
+
+import atexit
+import threading
+import time
+from concurrent.futures import (ProcessPoolExecutor, TimeoutError,
+                                as_completed)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from .budget import LayoutBudget
+from .collision import figures_to_boxes
+from .core import Core, placement_order
+from .engine import compute_layout
+from .exceptions import PlacementError
+from .result import LayoutResult
+from .snapshot import prepare_state
+from .symmetry import layout_key, room_symmetries
+
+# порядок, в котором варианты перебирают режимы перемешивания мебели:
+# первый вариант всегда использует мебель в исходном порядке
+SHUFFLE_MODES = (None, "light", "medium", "hard")
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+@dataclass
+class LayoutVariant:
+    """Один вариант расстановки.
+
+    Attributes:
+        mode: режим перемешивания мебели (None - исходный порядок)
+        seed: зерно генератора случайных чисел для режима "hard"
+        result: результат алгоритма или None, если мебель не поместилась
+        error: текст ошибки алгоритма
+    """
+
+    mode: str = None
+    seed: int = None
+    result: LayoutResult = None
+    error: str = None
+
+
+def variant_specs(count: int, seed: int = 0) -> list:
+    """Режимы перемешивания и зерна для count вариантов."""
+    specs = []
+    for number in range(count):
+        mode = SHUFFLE_MODES[min(number, len(SHUFFLE_MODES) - 1)]
+        specs.append((mode, seed + number))
+    return specs
+
+
+def variant_order(
+    furniture: list, mode: str = None, seed: int = None, ordering: str = "given",
+) -> list:
+    """Индексы мебели в порядке расстановки варианта."""
+    if mode is None:
+        return placement_order(furniture, ordering)
+    return Core().shuffle_furniture(list(range(len(furniture))), mode, seed)
+
+
+def unique_specs(
+    specs: list, furniture: list, ordering: str = "given",
+) -> list:
+    """Режимы перемешивания без тех, что дают уже встречавшийся порядок.
+
+    Одинаковая по размерам и названию мебель считается неразличимой.
+    """
+    seen, unique = set(), []
+    for mode, seed in specs:
+        signature = tuple(
+            (furniture[index].get("name"), furniture[index]["length"],
+             furniture[index]["width"])
+            for index in variant_order(furniture, mode, seed, ordering)
+        )
+        if signature not in seen:
+            seen.add(signature)
+            unique.append((mode, seed))
+    return unique
+
+
+def build_variant(
+    doors_and_windows: list,
+    furniture: list,
+    room_size: dict,
+    mode: str = None,
+    seed: int = None,
+    time_limit: float = None,
+    ordering: str = "given",
+    backtrack_depth: int = 0,
+    state: bytes = None,
+    collect_stats: bool = False,
+) -> LayoutVariant:
+    """Рассчитывает один вариант расстановки.
+
+    Функция выполняется в дочернем процессе, поэтому неудачная расстановка
+    (`PlacementError`) возвращается в поле error, а не пробрасывается через
+    пул. Остальные исключения - ошибки кода, они пробрасываются. Индексы мебели
+    в результате указывают на позиции во входном списке furniture.
+
+    Уже запущенную в пуле задачу нельзя отменить, поэтому вариант сам
+    останавливается через time_limit секунд и возвращает частичный результат.
+
+    Порядок ordering применяется только к варианту без перемешивания, иначе
+    сортировка отменила бы перемешивание. Снимок state подготовленной
+    комнаты избавляет вариант от повторной подготовки. С collect_stats
+    замеры этапов варианта пишутся в лог и попадают в `result.stats`.
+    """
+    order = variant_order(furniture, mode, seed)
+    try:
+        result = compute_layout(
+            doors_and_windows,
+            [furniture[index] for index in order],
+            room_size,
+            LayoutBudget(time_limit=time_limit),
+            collect_stats,
+            ordering=ordering if mode is None else "given",
+            backtrack_depth=backtrack_depth,
+            state=state,
+        )
+    except PlacementError as error:
+        return LayoutVariant(mode=mode, seed=seed, error=str(error))
+    for placement in result.placements:
+        placement["index"] = order[placement["index"]]
+    result.unplaced = [order[index] for index in result.unplaced]
+    return LayoutVariant(mode=mode, seed=seed, result=result)
+
+
+def get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Общий для процесса пул с ограниченным числом воркеров."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=max_workers)
+            _pool_workers = max_workers
+        return _pool
+
+
+def shutdown_pool(wait: bool = False):
+    """Останавливает общий пул процессов.
+
+    Процесс, запущенный через multiprocessing, при выходе ждет свои дочерние
+    процессы, поэтому в нем пул нужно останавливать с wait=True.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown_pool)
+
+
+def generate_variants(
+    doors_and_windows: list,
+    furniture: list,
+    room_size: dict,
+    count: int = 4,
+    deadline: float = None,
+    max_workers: int = 2,
+    seed: int = 0,
+    ordering: str = "given",
+    backtrack_depth: int = 0,
+    state: bytes = None,
+    collect_stats: bool = False,
+    unique: bool = True,
+):
+    """Генерирует варианты расстановки параллельно.
+
+    Args:
+        doors_and_windows: координаты углов дверей, окон и мебели
+        furniture: размеры мебели и расположение ее розеток
+        room_size: длины стен комнаты
+        count: наибольшее количество вариантов
+        deadline: сколько секунд ждать варианты (None - без ограничения)
+        max_workers: размер пула процессов
+        seed: начальное зерно для режима "hard"
+        ordering: порядок расстановки мебели, см. `core.placement_order`
+        backtrack_depth: глубина возврата при неудаче, см. `Core`
+        state: снимок `snapshot.prepare_state` для doors_and_windows и
+            room_size. Без него комната готовится здесь один раз для всех
+            вариантов
+        collect_stats: собирать ли замеры этапов каждого варианта
+        unique: пропускать ли варианты, совпадающие с уже возвращенными с
+            точностью до симметрии комнаты
+
+    Yields:
+        LayoutVariant: варианты в порядке их готовности. Варианты, не
+        успевшие к сроку, отменяются. Варианты пронумерованы зерном seed
+        по порядку `variant_specs`. С unique вариант, расстановка которого
+        совпадает с уже возвращенной с точностью до симметрии комнаты,
+        пропускается.
+    """
+    specs = unique_specs(variant_specs(count, seed), furniture, ordering)
+    symmetries = room_symmetries(
+        tuple(room_size.values()), figures_to_boxes(doors_and_windows),
+    )
+    if state is None:
+        state = prepare_state(doors_and_windows, room_size)
+    seen = set()
+    for variant in _compute_variants(
+        doors_and_windows,
+        furniture,
+        room_size,
+        specs,
+        deadline,
+        max_workers,
+        ordering,
+        backtrack_depth,
+        state,
+        collect_stats,
+    ):
+        if unique and variant.result is not None:
+            placements = variant.result.placements
+            key = layout_key(
+                [placement.get("name") or "" for placement in placements],
+                figures_to_boxes(placements),
+                symmetries,
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+        yield variant
+
+
+def _compute_variants(
+    doors_and_windows: list,
+    furniture: list,
+    room_size: dict,
+    specs: list,
+    deadline: float,
+    max_workers: int,
+    ordering: str,
+    backtrack_depth: int,
+    state: bytes,
+    collect_stats: bool,
+):
+    if max_workers <= 1:
+        # без пула варианты считаются последовательно в текущем процессе
+        finish = None if deadline is None else time.monotonic() + deadline
+        for mode, variant_seed in specs:
+            remaining = None
+            if finish is not None:
+                remaining = finish - time.monotonic()
+                if remaining <= 0:
+                    return
+            yield build_variant(
+                doors_and_windows,
+                furniture,
+                room_size,
+                mode,
+                variant_seed,
+                remaining,
+                ordering,
+                backtrack_depth,
+                state,
+                collect_stats,
+            )
+        return
+
+    pool = get_pool(max_workers)
+    futures = [
+        pool.submit(
+            build_variant,
+            doors_and_windows,
+            furniture,
+            room_size,
+            mode,
+            variant_seed,
+            deadline,
+            ordering,
+            backtrack_depth,
+            state,
+            collect_stats,
+        )
+        for mode, variant_seed in specs
+    ]
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            yield future.result()
+    except TimeoutError:
+        pass
+    except BrokenProcessPool:
+        shutdown_pool()
+        raise
+    finally:
+        for future in futures:
+            future.cancel()